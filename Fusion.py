@@ -1,12 +1,349 @@
-import streamlit as st
-from dataclasses import dataclass, field
-import pandas as pd
+from dataclasses import fields
+
 import numpy as np
+import streamlit as st
+
+from lexyo_core.comparaison import comparer_regimes
+from lexyo_core.foyer import Foyer
+from lexyo_core.identifiants import Identifiants
+from lexyo_core.monte_carlo import HypothesesMonteCarlo, Loi, simuler_monte_carlo
+from lexyo_core.objectif import resoudre_objectif
+from lexyo_core.regimes import REGIMES, rendement_simulation
+from lexyo_core.revente import matrice_revente
+from lexyo_core.sensibilite import INDICATEURS, axes_possibles, grille_sensibilite
+
+
+# ⚡ Résultats mis en cache : une simulation n'est calculée qu'une fois par jeu d'entrées
+@st.cache_data(max_entries=256, show_spinner=False)
+def simuler(regime, *args, **options):
+    simulation = REGIMES[regime](*args, **options)
+    # Les tableaux sont calculés ici pour être stockés avec l'instance en cache
+    for methode in ("resultat_fiscal_annuel", "tableau_amortissement",
+                    "tableau_amortissement_emprunt", "amortissements"):
+        if hasattr(simulation, methode):
+            getattr(simulation, methode)()
+    return simulation
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def comparer(**communs):
+    return comparer_regimes(communs)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def grille(regime, parametres, axe_x, valeurs_x, axe_y, valeurs_y, indicateur, annee):
+    return grille_sensibilite(
+        REGIMES[regime], parametres, axe_x, valeurs_x, axe_y, valeurs_y, indicateur, annee
+    )
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def objectif(regime, parametres, variable, borne_basse, borne_haute, cible, indicateur, annee):
+    return resoudre_objectif(
+        REGIMES[regime], parametres, variable, borne_basse, borne_haute, cible, indicateur, annee
+    )
+
+
+@st.cache_data(max_entries=16, show_spinner="Simulation Monte Carlo…")
+def monte_carlo(regime, parametres, hypotheses, chemins, graine):
+    return simuler_monte_carlo(REGIMES[regime], parametres, hypotheses, chemins=chemins, graine=graine)
+
+
+def simulation_lancee(libelle, regime):
+    # Après le premier clic, les résultats suivent chaque saisie (rerun limité au fragment)
+    cle = f"simulation_lancee_{regime}"
+    if st.button(libelle):
+        st.session_state[cle] = True
+    return st.session_state.get(cle, False)
+
+
+# 💶 Rendement des capitaux investis : TRI, VAN, cash-on-cash et multiple
+def afficher_rendement(regime, simulation):
+    if not hasattr(simulation, "apport"):
+        return
+    st.subheader("💶 Rendement de l'apport")
+    col1, col2 = st.columns(2)
+    with col1:
+        taux = st.number_input("Taux d'actualisation (%)", value=5.0, key=f"rendement_taux_{regime}")
+    with col2:
+        revente = st.number_input("Prix de revente à l'horizon (€)", value=float(simulation.prix_bien),
+                                  key=f"rendement_revente_{regime}")
+    resultat = rendement_simulation(simulation, taux / 100, revente)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("TRI", f"{resultat.tri:.2%}" if np.isfinite(resultat.tri) else "—")
+    col2.metric("VAN", f"{resultat.van:,.0f} €")
+    col3.metric("Cash-on-cash", f"{resultat.cash_on_cash:.2%}" if np.isfinite(resultat.cash_on_cash) else "—")
+    col4.metric("Multiple", f"{resultat.multiple:.2f}x" if np.isfinite(resultat.multiple) else "—")
+    st.caption("Apport en année 0, cashflows annuels, revente diminuée du capital restant dû à l'horizon.")
+
+
+# 🏷️ Plus-value à la revente : imposition pour chaque année de cession, en un calcul
+def afficher_plus_value(regime, simulation):
+    if not hasattr(simulation, "plus_value") or not st.toggle("🏷️ Plus-value à la revente", key=f"plus_value_{regime}"):
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        prix = st.number_input("Prix de revente aujourd'hui (€)", value=float(simulation.prix_bien),
+                               key=f"plus_value_prix_{regime}")
+    with col2:
+        revalorisation = st.number_input("Revalorisation annuelle (%)", value=1.0, key=f"plus_value_croissance_{regime}")
+
+    annees = np.arange(1, simulation.horizon + 1)
+    resultat = simulation.plus_value(prix * (1 + revalorisation / 100) ** annees, annees)
+    st.dataframe({
+        "Année de cession": annees,
+        "Prix de cession (€)": np.round(resultat.prix_cession, 2),
+        "Plus-value brute (€)": np.round(resultat.plus_value, 2),
+        "Impôt (€)": np.round(resultat.impot, 2),
+        "Prélèvements sociaux (€)": np.round(resultat.prelevements_sociaux, 2),
+        "Surtaxe (€)": np.round(resultat.surtaxe, 2),
+        "Imposition totale (€)": np.round(resultat.imposition, 2),
+    }, hide_index=True)
+
+
+# 🔁 Vendre ou conserver : TRI d'une revente à chaque année, pour plusieurs croissances du prix
+def afficher_revente(regime, simulation):
+    if not hasattr(simulation, "plus_value") or not st.toggle("🔁 Vendre ou conserver", key=f"revente_{regime}"):
+        return
+    import altair as alt
+
+    col1, col2 = st.columns(2)
+    with col1:
+        croissance_min, croissance_max = st.slider("Croissance annuelle du prix (%)", -5.0, 8.0, (-1.0, 4.0), step=0.5,
+                                                   key=f"revente_croissance_{regime}")
+    with col2:
+        frais_cession = st.number_input("Frais de cession (% du prix)", value=5.0, key=f"revente_frais_{regime}")
+    croissances = np.arange(croissance_min, croissance_max + 0.25, 0.5)
+    matrice = matrice_revente(simulation, croissances, frais_cession)
+
+    points = [
+        {"Année de cession": int(annee), "Croissance (%)": float(g), "TRI (%)": float(t * 100)}
+        for g, ligne in zip(croissances, matrice.tri) for annee, t in zip(matrice.annees, ligne) if np.isfinite(t)
+    ]
+    meilleurs = [
+        {"Année de cession": int(annee), "Croissance (%)": float(g)}
+        for g, annee in zip(croissances, matrice.annee_optimale) if annee
+    ]
+    carte = alt.Chart(alt.Data(values=points)).mark_rect().encode(
+        x="Année de cession:O",
+        y=alt.Y("Croissance (%):O", sort="descending"),
+        color=alt.Color("TRI (%):Q", scale=alt.Scale(scheme="redyellowgreen")),
+        tooltip=["Année de cession:O", "Croissance (%):Q", alt.Tooltip("TRI (%):Q", format=".2f")],
+    )
+    optimum = alt.Chart(alt.Data(values=meilleurs)).mark_point(shape="diamond", filled=True, color="black").encode(
+        x="Année de cession:O", y=alt.Y("Croissance (%):O", sort="descending"),
+    )
+    st.altair_chart(carte + optimum, use_container_width=True)
+    st.caption("◆ : année de cession qui maximise le TRI. Produit net après capital restant dû, "
+               "indemnités de remboursement anticipé et impôt sur la plus-value.")
+
+
+# 🎯 Grille de sensibilité : deux paramètres balayés, toute la grille en un calcul
+def bornes_axe(libelle, valeur, cle):
+    ecart = abs(valeur) * 0.2 or 1
+    col_min, col_max = st.columns(2)
+    with col_min:
+        minimum = st.number_input(f"{libelle} : minimum", value=float(valeur - ecart), key=f"{cle}_min")
+    with col_max:
+        maximum = st.number_input(f"{libelle} : maximum", value=float(valeur + ecart), key=f"{cle}_max")
+    return minimum, maximum
+
+
+def afficher_sensibilite(regime, simulation):
+    if not st.toggle("🎯 Grille de sensibilité", key=f"sensibilite_{regime}"):
+        return
+    import altair as alt
+
+    parametres = {champ.name: getattr(simulation, champ.name) for champ in fields(simulation) if champ.init}
+    axes = axes_possibles(type(simulation))
+    indicateurs = [i for i in INDICATEURS if i != "tri" or "apport" in parametres]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        axe_x = st.selectbox("Paramètre en abscisse", axes,
+                             index=axes.index("prix_bien") if "prix_bien" in axes else 0,
+                             key=f"sensibilite_x_{regime}")
+        x_min, x_max = bornes_axe(axe_x, parametres[axe_x], f"sensibilite_x_{regime}_{axe_x}")
+    with col2:
+        axes_y = [a for a in axes if a != axe_x]
+        axe_y = st.selectbox("Paramètre en ordonnée", axes_y,
+                             index=axes_y.index("taux_interet") if "taux_interet" in axes_y else 0,
+                             key=f"sensibilite_y_{regime}")
+        y_min, y_max = bornes_axe(axe_y, parametres[axe_y], f"sensibilite_y_{regime}_{axe_y}")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        indicateur = st.selectbox("Indicateur", indicateurs, format_func=INDICATEURS.get,
+                                  key=f"sensibilite_indicateur_{regime}")
+    with col2:
+        annee = st.slider("Année", 1, simulation.horizon, 1 if indicateur == "cashflow_mensuel" else simulation.horizon,
+                          key=f"sensibilite_annee_{regime}_{indicateur}", disabled=indicateur == "tri")
+    with col3:
+        points = st.slider("Points par axe", 5, 50, 25, key=f"sensibilite_points_{regime}")
+
+    try:
+        resultat = grille(
+            regime, parametres,
+            axe_x, np.linspace(x_min, x_max, points), axe_y, np.linspace(y_min, y_max, points),
+            indicateur, annee
+        )
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    carte = alt.Chart(alt.Data(values=resultat.en_lignes())).mark_rect().encode(
+        x=alt.X(f"{axe_x}:O", axis=alt.Axis(format=",.2f")),
+        y=alt.Y(f"{axe_y}:O", axis=alt.Axis(format=",.2f"), sort="descending"),
+        color=alt.Color("valeur:Q", title=INDICATEURS[indicateur], scale=alt.Scale(scheme="redyellowgreen")),
+        tooltip=[f"{axe_x}:Q", f"{axe_y}:Q", alt.Tooltip("valeur:Q", format=",.2f")],
+    )
+    st.altair_chart(carte, use_container_width=True)
+
+
+# 🎯 Recherche d'objectif : prix maximal, loyer minimal… pour une cible donnée
+VARIABLES_OBJECTIF = ("prix_bien", "loyer_mensuel_hc", "apport", "duree_annees", "montant_emprunt")
+CIBLES_PAR_DEFAUT = {"cashflow_mensuel": 0.0, "impots": 0.0, "tri": 5.0}
+
+
+def afficher_objectif(regime, simulation):
+    if not st.toggle("🎯 Recherche d'objectif", key=f"objectif_{regime}"):
+        return
+
+    parametres = {champ.name: getattr(simulation, champ.name) for champ in fields(simulation) if champ.init}
+    variables = [v for v in VARIABLES_OBJECTIF if v in parametres] + [
+        a for a in axes_possibles(type(simulation)) if a not in VARIABLES_OBJECTIF
+    ]
+    indicateurs = [i for i in INDICATEURS if i != "tri" or "apport" in parametres]
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        indicateur = st.selectbox("Indicateur visé", indicateurs, format_func=INDICATEURS.get,
+                                  key=f"objectif_indicateur_{regime}")
+    with col2:
+        cible = st.number_input("Valeur cible", value=CIBLES_PAR_DEFAUT[indicateur],
+                                key=f"objectif_cible_{regime}_{indicateur}")
+    with col3:
+        annee = st.slider("Année", 1, simulation.horizon, 1 if indicateur == "cashflow_mensuel" else simulation.horizon,
+                          key=f"objectif_annee_{regime}_{indicateur}", disabled=indicateur == "tri")
+
+    variable = st.selectbox("Paramètre à ajuster", variables, key=f"objectif_variable_{regime}")
+    valeur = parametres[variable]
+    col_min, col_max = st.columns(2)
+    with col_min:
+        borne_basse = st.number_input("Borne basse", value=float(valeur * 0.5),
+                                      key=f"objectif_bas_{regime}_{variable}")
+    with col_max:
+        borne_haute = st.number_input("Borne haute", value=float(valeur * 1.5 or 1),
+                                      key=f"objectif_haut_{regime}_{variable}")
+
+    try:
+        solution = objectif(regime, parametres, variable, borne_basse, borne_haute, cible, indicateur, annee)
+    except ValueError as e:
+        st.warning(str(e))
+        return
+    st.success(
+        f"{variable} = {solution.valeur:,.2f} → {INDICATEURS[indicateur]} : {solution.valeur_atteinte:,.2f}"
+    )
+    st.caption(f"{solution.evaluations} calculs vectorisés, {solution.points_evalues} points évalués.")
+
+
+# 🎲 Monte Carlo : loyer, vacance, taux, indexation et inflation des charges incertains
+def afficher_monte_carlo(regime, simulation):
+    if not st.toggle("🎲 Analyse de risque (Monte Carlo)", key=f"monte_carlo_{regime}"):
+        return
+
+    parametres = {champ.name: getattr(simulation, champ.name) for champ in fields(simulation) if champ.init}
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        chemins = st.select_slider("Nombre de trajectoires", [10_000, 50_000, 100_000, 500_000, 1_000_000],
+                                   key=f"monte_carlo_chemins_{regime}")
+        graine = st.number_input("Graine", value=42, step=1, key=f"monte_carlo_graine_{regime}")
+        ecart_loyer = st.number_input("Incertitude sur le loyer (écart-type, %)", value=5.0,
+                                      key=f"monte_carlo_loyer_{regime}")
+    with col2:
+        vacance_max = st.slider("Vacance la pire année (mois)", 0, 12,
+                                min(12, int(parametres["vacance_locative_mois"]) + 2),
+                                key=f"monte_carlo_vacance_{regime}")
+        taux_min, taux_max = st.slider("Taux d'intérêt obtenu (%)", 0.0, 10.0,
+                                       (max(0.0, parametres["taux_interet"] - 0.5), parametres["taux_interet"] + 1.0),
+                                       step=0.05, key=f"monte_carlo_taux_{regime}")
+    with col3:
+        indexation = st.number_input("Indexation des loyers (%/an)", value=1.5, key=f"monte_carlo_indexation_{regime}")
+        inflation = st.number_input("Inflation des charges (%/an)", value=2.0, key=f"monte_carlo_inflation_{regime}")
+        volatilite = st.number_input("Volatilité annuelle (écart-type, %)", value=1.0,
+                                     key=f"monte_carlo_volatilite_{regime}")
+
+    vacance = parametres["vacance_locative_mois"]
+    hypotheses = HypothesesMonteCarlo(
+        ecart_loyer=Loi("normale", 0.0, ecart_loyer / 100, minimum=-0.9),
+        vacance_mois=Loi("triangulaire", 0, min(vacance, vacance_max), max(vacance_max, vacance, 1e-9)),
+        taux_interet=Loi("triangulaire", taux_min, min(max(parametres["taux_interet"], taux_min), taux_max),
+                         max(taux_max, taux_min + 1e-9)),
+        indexation_loyer=Loi("normale", indexation, volatilite),
+        inflation_charges=Loi("normale", inflation, volatilite),
+    )
+    resultat = monte_carlo(regime, parametres, hypotheses, chemins, int(graine))
+
+    p5, p50, p95 = resultat.cashflow_quantiles[:, 0]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Cashflow mensuel an 1 — P5", f"{p5:,.0f} €")
+    col2.metric("P50", f"{p50:,.0f} €")
+    col3.metric("P95", f"{p95:,.0f} €")
+    col4.metric("Probabilité de cashflow cumulé négatif", f"{resultat.proba_cumul_negatif:.0%}")
+
+    st.line_chart({
+        "Année": resultat.annees,
+        "P5": resultat.cashflow_quantiles[0],
+        "P50": resultat.cashflow_quantiles[1],
+        "P95": resultat.cashflow_quantiles[2],
+        "Moyenne": resultat.cashflow_moyen,
+    }, x="Année", y_label="Cashflow mensuel (€)")
+    st.caption("Probabilité de cashflow négatif par année : " + ", ".join(
+        f"an {annee} : {p:.0%}" for annee, p in zip(resultat.annees, resultat.proba_cashflow_negatif)
+    ))
+
+    st.subheader("Impôts cumulés sur l'horizon")
+    i5, i50, i95 = resultat.impots_quantiles
+    st.write(f"P5 : {i5:,.0f} € — P50 : {i50:,.0f} € — P95 : {i95:,.0f} €")
+    bornes, comptes = resultat.impots_cumules.histogramme()
+    st.bar_chart({"Impôts cumulés (€)": np.round((bornes[:-1] + bornes[1:]) / 2), "Trajectoires": comptes},
+                 x="Impôts cumulés (€)")
+
+
+# 🏠 Foyer fiscal de la session : les biens ajoutés depuis les pages des régimes
+def foyer():
+    if "foyer" not in st.session_state:
+        st.session_state["foyer"] = Foyer(revenu_annuel_global=0.0, nombre_parts=1.0)
+    return st.session_state["foyer"]
+
+
+def afficher_ajout_foyer(regime, simulation):
+    st.subheader("🏠 Mon foyer")
+    col1, col2 = st.columns([3, 1], vertical_alignment="bottom")
+    with col1:
+        nom = st.text_input("Nom du bien", value=regime, key=f"foyer_nom_{regime}")
+    with col2:
+        ajouter = st.button("➕ Ajouter au foyer", key=f"foyer_ajouter_{regime}")
+    if ajouter:
+        try:
+            foyer().ajouter(nom, simulation)
+        except ValueError as erreur:
+            st.error(str(erreur))
+        else:
+            st.success(f"{nom} ajouté : {len(foyer().biens)} bien(s) dans le foyer.")
+
+
+# 🔑 Identifiants chargés une fois par processus, rechargés si le fichier change
+@st.cache_resource
+def identifiants():
+    return Identifiants("credentials.csv")
+
 
 # 🔐 Interface de connexion stylisée
 def login():
     try:
-        credentials = pd.read_csv("credentials.csv")
+        identifiants().actualiser()
     except FileNotFoundError:
         st.error("Fichier des identifiants manquant.")
         st.stop()
@@ -25,7 +362,7 @@ def login():
     login_btn = st.button("Se connecter", use_container_width=True)
 
     if login_btn:
-        if ((credentials['username'] == username) & (credentials['password'] == password)).any():
+        if identifiants().verifier(username, password):
             st.session_state['logged_in'] = True
             st.session_state['username'] = username
             st.rerun()  # Force le rafraîchissement
@@ -91,163 +428,13 @@ st.markdown("""
 
 
 # Menu à gauche
-regime = st.sidebar.selectbox("Choisissez le régime fiscal :", ["LMNP réel", "LMNP Micro-Bic", "LMP réel", "SCI à l'IS", "SCI à l'IR", "SARL de famille", "Holding à l'IS", "Location nue", "Micro foncier", "Réel foncier"])
+regime = st.sidebar.selectbox("Choisissez le régime fiscal :", ["LMNP réel", "LMNP Micro-Bic", "LMP réel", "SCI à l'IS", "SCI à l'IR", "SARL de famille", "Holding à l'IS", "Location nue", "Micro foncier", "Réel foncier", "Comparer tous les régimes", "Mon foyer"])
 
 # --------------------------------------------------------------------------------
-# CLASSE LMNP RÉEL
+# RÉGIME LMNP RÉEL
 # --------------------------------------------------------------------------------
-if regime == "LMNP réel":
-
-    @dataclass
-    class LMNPReel:
-        prix_bien: float
-        part_terrain: float
-        apport: float
-        frais_dossier: float
-        frais_agence: float
-        montant_travaux: float
-        frais_garantie: float
-        frais_tiers: float
-        mobilier: float
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-        charges_copro: float
-        assurance_habitation: float
-        assurance_gli: float
-        taxe_fonciere: float
-        frais_entretien: float
-        frais_compta: float
-        frais_bancaires: float
-        gestion_locative: float
-        taxe_habitation: float
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-        tmi: float
-        frais_notaire_pct: float = 8.0
-        duree_amort_bati: int = 30
-        duree_amort_mobilier: int = 7
-        montant_emprunt: float = field(init=False)
-        deficits_reportables: list = field(default_factory=lambda: [0] * 10)
-
-        def __post_init__(self):
-            frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
-            total_frais = (self.prix_bien + frais_notaire + self.frais_agence +
-                           self.frais_dossier + self.montant_travaux +
-                           self.frais_garantie + self.frais_tiers)
-            self.montant_emprunt = max(0, total_frais - self.apport)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            capital_differe = capital
-            for _ in range(self.differe_mois):
-                capital_differe += capital_differe * tm
-            n = self.duree_annees * 12 - self.differe_mois
-            mensualite_hors_assurance = capital_differe * tm / (1 - (1 + tm) ** -n)
-            assurance = capital * ta
-            return mensualite_hors_assurance + assurance
-
-        def tableau_amortissement(self):
-            tm = self.taux_interet / 100 / 12
-            capital = self.montant_emprunt
-            capital_rest = capital
-            mensualite = None
-            rows = []
-
-            for mois in range(1, self.duree_annees * 12 + 1):
-                if mois <= self.differe_mois:
-                    interets = capital_rest * tm
-                    principal = 0
-                    capital_rest += interets
-                else:
-                    if mensualite is None:
-                        mensualite = self.mensualite_emprunt() - (capital * self.taux_assurance / 100 / 12)
-                    interets = capital_rest * tm
-                    principal = mensualite - interets
-                    capital_rest -= principal
-                    if capital_rest < 0:
-                        principal += capital_rest
-                        capital_rest = 0
-                rows.append({
-                    'Mois': mois,
-                    'Année': (mois - 1) // 12 + 1,
-                    'Capital restant dû': capital_rest,
-                    'Intérêts': interets,
-                    'Principal remboursé': principal,
-                    'Assurance': capital * self.taux_assurance / 100 / 12
-                })
-            return pd.DataFrame(rows)
-
-        def amortissements(self):
-            valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
-            bati = valeur_bati / self.duree_amort_bati
-            mobilier = self.mobilier / self.duree_amort_mobilier
-            rows = []
-            for annee in range(1, 11):
-                if annee <= self.differe_mois // 12:
-                    amort_bati = 0
-                    amort_mobilier = 0
-                else:
-                    amort_bati = bati if annee <= self.duree_amort_bati else 0
-                    amort_mobilier = mobilier if annee <= self.duree_amort_mobilier else 0
-                total = amort_bati + amort_mobilier
-                rows.append({
-                    'Année': annee,
-                    'Amortissement Bâti': amort_bati,
-                    'Amortissement Mobilier': amort_mobilier,
-                    'Total Amortissement': total
-                })
-            return pd.DataFrame(rows)
-
-        def resultat_fiscal_annuel(self):
-            amort = self.amortissements().set_index('Année')['Total Amortissement'].to_dict()
-            interets = self.tableau_amortissement().groupby('Année')['Intérêts'].sum().to_dict()
-            mensualite = self.mensualite_emprunt()
-            resultats = []
-
-            for annee in range(1, 11):
-                revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-                charges = (self.charges_copro + self.assurance_habitation + self.assurance_gli +
-                           self.taxe_fonciere + self.frais_entretien + self.frais_compta +
-                           self.frais_bancaires + self.gestion_locative + self.taxe_habitation)
-                charges_recup = self.charges_copro * 0.8
-                interet = interets.get(annee, 0)
-                amorti = amort.get(annee, 0)
-                resultat = revenus - charges - interet - amorti
-
-                if resultat < 0:
-                    self.deficits_reportables[annee - 1] = -resultat
-                    resultat_fiscal = 0
-                else:
-                    resultat_fiscal = resultat
-                    for i in range(annee):
-                        if self.deficits_reportables[i] > 0:
-                            if resultat_fiscal >= self.deficits_reportables[i]:
-                                resultat_fiscal -= self.deficits_reportables[i]
-                                self.deficits_reportables[i] = 0
-                            else:
-                                self.deficits_reportables[i] -= resultat_fiscal
-                                resultat_fiscal = 0
-                                break
-
-                impot = resultat_fiscal * self.tmi / 100
-                cashflow_mensuel = (revenus - charges - impot - mensualite * 12 + charges_recup) / 12
-
-                resultats.append({
-                    'Année': annee,
-                    'Revenus nets': revenus,
-                    'Charges': charges,
-                    'Charges récupérables': charges_recup,
-                    'Intérêts': interet,
-                    'Amortissements': amorti,
-                    'Résultat fiscal': resultat_fiscal,
-                    'Impôt': impot,
-                    'Cashflow mensuel': round(cashflow_mensuel, 2)
-                })
-            return pd.DataFrame(resultats)
+@st.fragment
+def page_lmnp_reel():
 
     # Interface utilisateur LMNP
     st.title("LMNP Réel")
@@ -266,6 +453,7 @@ if regime == "LMNP réel":
     taux_interet = st.number_input("Taux d'intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux assurance emprunteur (%)", value=0.3)
     differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     charges_copro = st.number_input("Charges copropriété (€)", value=0)
     assurance_habitation = st.number_input("Assurance habitation (€)", value=0)
@@ -281,200 +469,38 @@ if regime == "LMNP réel":
     vacance_locative_mois = st.slider("Vacance locative (mois)", 0, 12, 0)
     tmi = st.slider("TMI (%)", 0, 45, 30)
 
-    if st.button("Lancer la simulation"):
-        lmnp = LMNPReel(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation", "LMNP réel"):
+        lmnp = simuler(
+            "LMNP réel",
             prix_bien, part_terrain, apport, frais_dossier, frais_agence,
             montant_travaux, frais_garantie, frais_tiers, mobilier,
             duree_annees, taux_interet, taux_assurance, differe_mois,
             charges_copro, assurance_habitation, assurance_gli, taxe_fonciere,
             frais_entretien, frais_compta, frais_bancaires, gestion_locative,
-            taxe_habitation, loyer_mensuel_hc, vacance_locative_mois, tmi
+            taxe_habitation, loyer_mensuel_hc, vacance_locative_mois, tmi,
+            horizon=horizon, differe_partiel=differe_partiel
         )
-        st.subheader("📆 Résultats sur 10 ans")
+        st.subheader(f"📆 Résultats sur {horizon} ans")
         st.dataframe(lmnp.resultat_fiscal_annuel())
         st.subheader("📉 Tableau d’amortissement de l’emprunt")
         st.dataframe(lmnp.tableau_amortissement())
         st.subheader("📑 Amortissements comptables")
         st.dataframe(lmnp.amortissements())
+        afficher_rendement("LMNP réel", lmnp)
+        afficher_plus_value("LMNP réel", lmnp)
+        afficher_revente("LMNP réel", lmnp)
+        afficher_sensibilite("LMNP réel", lmnp)
+        afficher_objectif("LMNP réel", lmnp)
+        afficher_monte_carlo("LMNP réel", lmnp)
+        afficher_ajout_foyer("LMNP réel", lmnp)
 # Tu veux aussi la partie SCI à l'IS complète ?
 # --------------------------------------------------------------------------------
-# CLASSE SCI À L'IS
-# --------------------------------------------------------------------------------
-elif regime == "SCI à l'IS":
-
-    # --------------------------------------------------------------------------------
-# CLASSE SCI À L'IS
+# RÉGIME SCI À L'IS
 # --------------------------------------------------------------------------------
-    @dataclass
-    class SCIaIS:
-        prix_bien: float
-        part_terrain: float
-        apport: float
-        frais_dossier: float
-        frais_agence: float
-        montant_travaux: float
-        frais_garantie: float
-        frais_tiers: float
-        mobilier: float
-
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-
-        charges_copro: float
-        assurance: float
-        assurance_gli: float
-        taxe_fonciere: float
-        frais_entretien: float
-        frais_compta: float
-        frais_bancaires: float
-        gestion_locative: float
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-
-        duree_amort_bati: int
-        duree_amort_travaux: int
-        duree_amort_mobilier: int
-        duree_amort_frais: int
-
-        frais_notaire_pct: float = 8.0
-        montant_emprunt: float = field(init=False)
-        frais_notaire: float = field(init=False)
-
-        def __post_init__(self):
-            self.frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
-            total_a_financer = (
-                self.prix_bien + self.frais_notaire + self.frais_agence +
-                self.frais_dossier + self.frais_garantie + self.frais_tiers + self.montant_travaux
-            )
-            self.montant_emprunt = max(0, total_a_financer - self.apport)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-
-            for _ in range(self.differe_mois):
-                capital += capital * tm
-
-            n = self.duree_annees * 12 - self.differe_mois
-            if n <= 0:
-                raise ValueError("Durée ou différé incohérents")
-
-            m_hors_assurance = capital * tm / (1 - (1 + tm) ** -n)
-            m_assurance = self.montant_emprunt * ta
-            return m_hors_assurance + m_assurance
-
-        def tableau_amortissement_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            capital_rest = capital
-            mensualite_hors_assurance = None
-            rows = []
-
-            for mois in range(1, self.duree_annees * 12 + 1):
-                if mois <= self.differe_mois:
-                    interets = capital_rest * tm
-                    principal = 0
-                    capital_rest += interets
-                else:
-                    if mensualite_hors_assurance is None:
-                        mensualite_hors_assurance = self.mensualite_emprunt() - capital * ta
-                    interets = capital_rest * tm
-                    principal = mensualite_hors_assurance - interets
-                    capital_rest -= principal
-                    if capital_rest < 0:
-                        principal += capital_rest
-                        capital_rest = 0
-
-                rows.append({
-                    'Mois': mois,
-                    'Année': (mois - 1) // 12 + 1,
-                    'Intérêts': interets,
-                    'Principal': principal,
-                    'Assurance': capital * ta,
-                    'Capital restant dû': capital_rest
-                })
-
-            return pd.DataFrame(rows)
-
-        def amortissements(self):
-            valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
-            rows = []
-            for annee in range(1, 11):
-                bati = valeur_bati / self.duree_amort_bati if annee <= self.duree_amort_bati else 0
-                mobilier = self.mobilier / self.duree_amort_mobilier if annee <= self.duree_amort_mobilier else 0
-                travaux = self.montant_travaux / self.duree_amort_travaux if annee <= self.duree_amort_travaux else 0
-                frais = (self.frais_dossier + self.frais_agence + self.frais_garantie + self.frais_tiers) / self.duree_amort_frais if annee <= self.duree_amort_frais else 0
-                total = bati + mobilier + travaux + frais
-                rows.append({
-                    'Année': annee,
-                    'Amortissement Bâti': bati,
-                    'Amortissement Mobilier': mobilier,
-                    'Amortissement Travaux': travaux,
-                    'Amortissement Frais': frais,
-                    'Total Amortissement': total
-                })
-            return pd.DataFrame(rows)
-
-        def resultat_fiscal_annuel(self):
-            amort = self.amortissements().set_index('Année')['Total Amortissement'].to_dict()
-            amort_table = self.tableau_amortissement_emprunt()
-            interets = amort_table.groupby('Année')['Intérêts'].sum().to_dict()
-            assurances = amort_table.groupby('Année')['Assurance'].sum().to_dict()
-
-            mensualite = self.mensualite_emprunt()
-            results = []
-            deficit_reportable = 0.0
-
-            for annee in range(1, 11):
-                revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-
-                charges_reelles = (
-                    self.charges_copro + self.assurance + self.assurance_gli +
-                    self.taxe_fonciere + self.frais_entretien + self.frais_compta +
-                    self.frais_bancaires + self.gestion_locative
-                )
-                charges_recup = self.charges_copro * 0.8
-                charges_fiscales = charges_reelles - charges_recup
-
-                interet = interets.get(annee, 0.0)
-                assurance = assurances.get(annee, 0.0)
-                dotation = amort.get(annee, 0.0)
-
-                resultat_brut = revenus - charges_fiscales - interet - assurance - dotation
-                resultat_net = resultat_brut + deficit_reportable
-
-                if resultat_net < 0:
-                    is_impot = 0.0
-                    deficit_reportable = resultat_net
-                else:
-                    if resultat_net <= 42500:
-                        is_impot = resultat_net * 0.15
-                    else:
-                        is_impot = 42500 * 0.15 + (resultat_net - 42500) * 0.25
-                    deficit_reportable = 0.0
-
-                cashflow_mensuel = (revenus - charges_reelles - is_impot - mensualite * 12 + charges_recup) / 12
-
-                results.append({
-                    'Année': annee,
-                    'Revenus': revenus,
-                    'Charges réelles': charges_reelles,
-                    'Charges récupérables': charges_recup,
-                    'Intérêts': interet,
-                    'Assurance': assurance,
-                    'Amortissements': dotation,
-                    'Résultat fiscal brut': resultat_brut,
-                    'Résultat fiscal net': resultat_net,
-                    'Déficit reportable': deficit_reportable if deficit_reportable < 0 else 0.0,
-                    'IS': is_impot,
-                    'Cashflow mensuel (€)': round(cashflow_mensuel, 2)
-                })
-
-            return pd.DataFrame(results)
+@st.fragment
+def page_sci_is():
 
     # Interface utilisateur SCI à l'IS
     st.title("Simulateur SCI à l’IS")
@@ -493,6 +519,7 @@ elif regime == "SCI à l'IS":
     taux_interet = st.number_input("Taux d’intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux assurance emprunteur (%)", value=0.3)
     differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     charges_copro = st.number_input("Charges de copropriété (€)", value=0)
     assurance = st.number_input("Assurance PNO (€)", value=0)
@@ -511,127 +538,40 @@ elif regime == "SCI à l'IS":
     duree_amort_mobilier = st.slider("Amortissement mobilier", 5, 15, 7)
     duree_amort_frais = st.slider("Amortissement frais annexes", 3, 10, 5)
 
-    if st.button("Lancer la simulation SCI à l'IS"):
-        sci = SCIaIS(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation SCI à l'IS", "SCI à l'IS"):
+        sci = simuler(
+            "SCI à l'IS",
             prix_bien, part_terrain, apport, frais_dossier, frais_agence, montant_travaux,
             frais_garantie, frais_tiers, mobilier,
             duree_annees, taux_interet, taux_assurance, differe_mois,
             charges_copro, assurance, assurance_gli, taxe_fonciere,
             frais_entretien, frais_compta, frais_bancaires, gestion_locative,
             loyer_mensuel_hc, vacance_locative_mois,
-            duree_amort_bati, duree_amort_travaux, duree_amort_mobilier, duree_amort_frais
+            duree_amort_bati, duree_amort_travaux, duree_amort_mobilier, duree_amort_frais,
+            horizon=horizon, differe_partiel=differe_partiel
         )
-        st.subheader("📊 Résultats sur 10 ans")
+        st.subheader(f"📊 Résultats sur {horizon} ans")
         st.dataframe(sci.resultat_fiscal_annuel())
         st.subheader("📉 Tableau d’amortissement de l’emprunt")
         st.dataframe(sci.tableau_amortissement_emprunt())
         st.subheader("📑 Amortissements comptables")
         st.dataframe(sci.amortissements())
+        afficher_rendement("SCI à l'IS", sci)
+        afficher_plus_value("SCI à l'IS", sci)
+        afficher_revente("SCI à l'IS", sci)
+        afficher_sensibilite("SCI à l'IS", sci)
+        afficher_objectif("SCI à l'IS", sci)
+        afficher_monte_carlo("SCI à l'IS", sci)
+        afficher_ajout_foyer("SCI à l'IS", sci)
 
 
 # --------------------------------------------------------------------------------
-# CLASSE MICRO BIC
+# RÉGIME MICRO BIC
 # --------------------------------------------------------------------------------
-elif regime == "LMNP Micro-Bic":
-
-    @dataclass
-    class MicroBIC:
-        # Revenus
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-
-        # Charges réelles non déductibles
-        charges_copro: float
-        taxe_fonciere: float
-        frais_gestion: float
-        assurance_pno: float
-        assurance_gli: float
-
-        # Emprunt
-        montant_emprunt: float
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-
-        # Fiscalité
-        tmi: float
-        csg_crds: float = 17.2
-        abattement: float = 0.5
-        plafond_microbic: float = 77700
-
-        def revenus_annuels(self):
-            return self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-
-        def revenu_imposable(self):
-            return self.revenus_annuels() * (1 - self.abattement)
-
-        def impot_ir(self):
-            return self.revenu_imposable() * (self.tmi / 100)
-
-        def prelevements_sociaux(self):
-            return self.revenu_imposable() * (self.csg_crds / 100)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-
-            # différé : capital augmente des intérêts intercalaires
-            for _ in range(self.differe_mois):
-                capital += capital * tm
-
-            n = self.duree_annees * 12 - self.differe_mois
-            if n <= 0:
-                return 0
-
-            m_hors_assurance = capital * tm / (1 - (1 + tm) ** -n)
-            m_assurance = self.montant_emprunt * ta
-            return m_hors_assurance + m_assurance
-
-        def charges_non_recup(self):
-            return (
-                self.taxe_fonciere +
-                self.frais_gestion +
-                self.assurance_pno +
-                self.assurance_gli +
-                self.charges_copro * 0.2
-            )
-
-        def cashflow_annuel(self):
-            mensualite = self.mensualite_emprunt()
-            return (
-                self.revenus_annuels()
-                - self.impot_ir()
-                - self.prelevements_sociaux()
-                - self.charges_non_recup()
-                - mensualite * 12
-            )
-
-        def resultat_fiscal_annuel(self):
-            revenu_brut = self.revenus_annuels()
-            revenu_net = self.revenu_imposable()
-            ir = self.impot_ir()
-            ps = self.prelevements_sociaux()
-            mensualite = self.mensualite_emprunt()
-            charges_non_recup = self.charges_non_recup()
-            cashflow = self.cashflow_annuel()
-
-            rows = []
-            for annee in range(1, 11):
-                rows.append({
-                    "Année": annee,
-                    "Revenus bruts": round(revenu_brut, 2),
-                    "Abattement 50%": round(revenu_brut * self.abattement, 2),
-                    "Revenu imposable": round(revenu_net, 2),
-                    "IR (TMI)": round(ir, 2),
-                    "Prélèvements sociaux (17.2%)": round(ps, 2),
-                    "Charges non récupérables": round(charges_non_recup, 2),
-                    "Mensualité de prêt (avec assurance)": round(mensualite, 2),
-                    "💡 Remarque": "Aucune charge déductible fiscalement",
-                    "Cashflow mensuel (€)": round(cashflow / 12, 2)
-                })
-            return pd.DataFrame(rows)
+@st.fragment
+def page_micro_bic():
 
     # Interface utilisateur Micro BIC
     st.title("Simulation LMNP Micro BIC")
@@ -653,157 +593,40 @@ elif regime == "LMNP Micro-Bic":
     taux_interet = st.number_input("Taux d’intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux assurance (%)", value=0.3)
     differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     st.subheader("Fiscalité")
     tmi = st.slider("TMI (%)", 11, 45, 30)
 
-    if st.button("Lancer la simulation LMNP Micro BIC"):
-        microbic = MicroBIC(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation LMNP Micro BIC", "LMNP Micro-Bic"):
+        microbic = simuler(
+            "LMNP Micro-Bic",
             loyer_mensuel_hc, vacance_locative_mois,
             charges_copro, taxe_fonciere, frais_gestion,
             assurance_pno, assurance_gli,
             montant_emprunt, duree_annees, taux_interet, taux_assurance, differe_mois,
-            tmi
+            tmi,
+            horizon=horizon, differe_partiel=differe_partiel
         )
 
         if microbic.revenus_annuels() > microbic.plafond_microbic:
             st.warning(f"⚠️ Revenus bruts annuels ({microbic.revenus_annuels():,.0f} €) dépassent le plafond micro-BIC ({microbic.plafond_microbic:,.0f} €). Basculer vers le régime réel.")
 
-        st.subheader("📊 Résultats sur 10 ans")
+        st.subheader(f"📊 Résultats sur {horizon} ans")
         st.dataframe(microbic.resultat_fiscal_annuel()) 
+        afficher_rendement("LMNP Micro-Bic", microbic)
+        afficher_plus_value("LMNP Micro-Bic", microbic)
+        afficher_revente("LMNP Micro-Bic", microbic)
+        afficher_sensibilite("LMNP Micro-Bic", microbic)
+        afficher_objectif("LMNP Micro-Bic", microbic)
+        afficher_monte_carlo("LMNP Micro-Bic", microbic)
+        afficher_ajout_foyer("LMNP Micro-Bic", microbic)
+
 
-elif regime == "SCI à l'IR":
-
-    @dataclass
-    class SCIaIR:
-        prix_bien: float
-        part_terrain: float
-        apport: float
-        frais_dossier: float
-        frais_agence: float
-        montant_travaux: float
-        frais_garantie: float
-        frais_tiers: float
-
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-
-        charges_copro: float
-        assurance: float
-        assurance_gli: float
-        taxe_fonciere: float
-        frais_entretien: float
-        frais_compta: float
-        frais_bancaires: float
-        gestion_locative: float
-
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-        tmi: float
-
-        frais_notaire_pct: float = 8.0
-        montant_emprunt: float = field(init=False)
-        frais_notaire: float = field(init=False)
-
-        def __post_init__(self):
-            self.frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
-            total_a_financer = (
-                self.prix_bien + self.frais_notaire + self.frais_agence +
-                self.frais_dossier + self.frais_garantie + self.frais_tiers + self.montant_travaux
-            )
-            self.montant_emprunt = max(0, total_a_financer - self.apport)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            for _ in range(self.differe_mois):
-                capital += capital * tm
-            n = self.duree_annees * 12 - self.differe_mois
-            if n <= 0:
-                raise ValueError("Durée ou différé incohérents")
-            m_hors_assurance = capital * tm / (1 - (1 + tm) ** -n)
-            m_assurance = self.montant_emprunt * ta
-            return m_hors_assurance + m_assurance
-
-        def tableau_amortissement_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            capital_rest = capital
-            mensualite_hors_assurance = None
-            rows = []
-            for mois in range(1, self.duree_annees * 12 + 1):
-                if mois <= self.differe_mois:
-                    interets = capital_rest * tm
-                    principal = 0
-                    capital_rest += interets
-                else:
-                    if mensualite_hors_assurance is None:
-                        mensualite_hors_assurance = self.mensualite_emprunt() - capital * ta
-                    interets = capital_rest * tm
-                    principal = mensualite_hors_assurance - interets
-                    capital_rest -= principal
-                    if capital_rest < 0:
-                        principal += capital_rest
-                        capital_rest = 0
-                rows.append({
-                    'Mois': mois,
-                    'Année': (mois - 1) // 12 + 1,
-                    'Intérêts': interets,
-                    'Principal': principal,
-                    'Assurance': capital * ta,
-                    'Capital restant dû': capital_rest
-                })
-            return pd.DataFrame(rows)
-
-        def resultat_fiscal_annuel(self):
-            interets = self.tableau_amortissement_emprunt().groupby('Année')['Intérêts'].sum().to_dict()
-            assurances = self.tableau_amortissement_emprunt().groupby('Année')['Assurance'].sum().to_dict()
-            mensualite = self.mensualite_emprunt()
-            results = []
-            deficit_reportable = 0.0
-
-            for annee in range(1, 11):
-                revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-                charges_reelles = (
-                    self.charges_copro + self.assurance + self.assurance_gli +
-                    self.taxe_fonciere + self.frais_entretien + self.frais_compta +
-                    self.frais_bancaires + self.gestion_locative
-                )
-                charges_recup = self.charges_copro * 0.8
-                interet = interets.get(annee, 0.0)
-                assurance = assurances.get(annee, 0.0)
-
-                resultat_foncier = revenus - charges_reelles - interet - assurance
-                resultat_fiscal = resultat_foncier + deficit_reportable
-
-                if resultat_fiscal < 0:
-                    ir = 0.0
-                    deficit_reportable = resultat_fiscal
-                else:
-                    ir = resultat_fiscal * (self.tmi / 100)
-                    deficit_reportable = 0.0
-
-                cashflow_mensuel = (revenus - charges_reelles - ir - mensualite * 12 + charges_recup) / 12
-
-                results.append({
-                    'Année': annee,
-                    'Revenus': revenus,
-                    'Charges réelles': charges_reelles,
-                    'Charges récupérables': charges_recup,
-                    'Intérêts': interet,
-                    'Assurance': assurance,
-                    'Résultat foncier': resultat_foncier,
-                    'Résultat fiscal après report': resultat_fiscal,
-                    'Déficit reportable': deficit_reportable if deficit_reportable < 0 else 0.0,
-                    'Impôt sur le revenu (IR)': ir,
-                    'Cashflow mensuel (€)': round(cashflow_mensuel, 2)
-                })
-
-            return pd.DataFrame(results)
+@st.fragment
+def page_sci_ir():
 
     # Interface utilisateur SCI à l’IR
     st.title("Simulateur SCI à l’IR")
@@ -821,6 +644,7 @@ elif regime == "SCI à l'IR":
     taux_interet = st.number_input("Taux d’intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux d’assurance emprunteur (%)", value=0.3)
     differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     charges_copro = st.number_input("Charges de copropriété (€)", value=0)
     assurance = st.number_input("Assurance PNO (€)", value=0)
@@ -835,151 +659,33 @@ elif regime == "SCI à l'IR":
     vacance_locative_mois = st.slider("Vacance locative (mois)", 0, 12, 0)
     tmi = st.slider("TMI (Tranche Marginale d’Imposition en %)", 11, 45, 30)
 
-    if st.button("Lancer la simulation SCI à l’IR"):
-        sci_ir = SCIaIR(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation SCI à l’IR", "SCI à l'IR"):
+        sci_ir = simuler(
+            "SCI à l'IR",
             prix_bien, part_terrain, apport, frais_dossier, frais_agence, montant_travaux,
             frais_garantie, frais_tiers,
             duree_annees, taux_interet, taux_assurance, differe_mois,
             charges_copro, assurance, assurance_gli, taxe_fonciere,
             frais_entretien, frais_compta, frais_bancaires, gestion_locative,
-            loyer_mensuel_hc, vacance_locative_mois, tmi
+            loyer_mensuel_hc, vacance_locative_mois, tmi,
+            horizon=horizon, differe_partiel=differe_partiel
         )
 
-        st.subheader("📆 Résultats SCI à l’IR sur 10 ans")
+        st.subheader(f"📆 Résultats SCI à l’IR sur {horizon} ans")
         st.dataframe(sci_ir.resultat_fiscal_annuel())
-        
-elif regime == "Location nue":
-
-    @dataclass
-    class LocationNue:
-        prix_bien: float
-        apport: float
-        frais_dossier: float
-        frais_agence: float
-        montant_travaux: float
-        frais_garantie: float
-        frais_tiers: float
-
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-
-        charges_copro: float
-        taxe_fonciere: float
-        frais_entretien: float
-        frais_bancaires: float
-        gestion_locative: float
-
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-        tmi: float  # Tranche marginale d'imposition
-
-        frais_notaire_pct: float = 8.0
-        montant_emprunt: float = field(init=False)
-        frais_notaire: float = field(init=False)
-
-        def __post_init__(self):
-            self.frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
-            total_a_financer = (
-                self.prix_bien + self.frais_notaire + self.frais_agence +
-                self.frais_dossier + self.frais_garantie + self.frais_tiers + self.montant_travaux
-            )
-            self.montant_emprunt = max(0, total_a_financer - self.apport)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            for _ in range(self.differe_mois):
-                capital += capital * tm
-            n = self.duree_annees * 12 - self.differe_mois
-            if n <= 0:
-                raise ValueError("Durée ou différé incohérents")
-            m_hors_assurance = capital * tm / (1 - (1 + tm) ** -n)
-            m_assurance = self.montant_emprunt * ta
-            return m_hors_assurance + m_assurance
-
-        def tableau_amortissement_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            capital_rest = capital
-            mensualite_hors_assurance = None
-            rows = []
-            for mois in range(1, self.duree_annees * 12 + 1):
-                if mois <= self.differe_mois:
-                    interets = capital_rest * tm
-                    principal = 0
-                    capital_rest += interets
-                else:
-                    if mensualite_hors_assurance is None:
-                        mensualite_hors_assurance = self.mensualite_emprunt() - capital * ta
-                    interets = capital_rest * tm
-                    principal = mensualite_hors_assurance - interets
-                    capital_rest -= principal
-                    if capital_rest < 0:
-                        principal += capital_rest
-                        capital_rest = 0
-                rows.append({
-                    'Mois': mois,
-                    'Année': (mois - 1) // 12 + 1,
-                    'Intérêts': interets,
-                    'Principal': principal,
-                    'Assurance': capital * ta,
-                    'Capital restant dû': capital_rest
-                })
-            return pd.DataFrame(rows)
-
-        def resultat_fiscal_annuel(self):
-            amort_table = self.tableau_amortissement_emprunt()
-            interets = amort_table.groupby('Année')['Intérêts'].sum().to_dict()
-            assurances = amort_table.groupby('Année')['Assurance'].sum().to_dict()
-            mensualite = self.mensualite_emprunt()
-            results = []
-            deficit_reportable = 0.0
-
-            for annee in range(1, 11):
-                revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-
-                charges_non_recup = (
-                    self.taxe_fonciere + self.frais_entretien +
-                    self.frais_bancaires + self.gestion_locative +
-                    self.charges_copro * 0.2  # 20% non récupérables
-                )
-
-                charges_recup = self.charges_copro * 0.8  # 80% récupérables
-
-                interet = interets.get(annee, 0.0)
-                assurance = assurances.get(annee, 0.0)
-
-                resultat_foncier = revenus - charges_non_recup - interet - assurance
-                resultat_fiscal = resultat_foncier + deficit_reportable
-
-                if resultat_fiscal < 0:
-                    ir = 0.0
-                    deficit_reportable = resultat_fiscal
-                else:
-                    ir = resultat_fiscal * (self.tmi / 100)
-                    deficit_reportable = 0.0
-
-                cashflow_mensuel = (revenus - charges_non_recup - ir - mensualite * 12 + charges_recup) / 12
-
-                results.append({
-                    'Année': annee,
-                    'Revenus': revenus,
-                    'Charges non récupérables': round(charges_non_recup, 2),
-                    'Charges récupérables': round(charges_recup, 2),
-                    'Intérêts': round(interet, 2),
-                    'Assurance': round(assurance, 2),
-                    'Résultat foncier': round(resultat_foncier, 2),
-                    'Résultat fiscal après report': round(resultat_fiscal, 2),
-                    'Déficit reportable': round(deficit_reportable, 2) if deficit_reportable < 0 else 0.0,
-                    'IR': round(ir, 2),
-                    'Cashflow mensuel (€)': round(cashflow_mensuel, 2)
-                })
-
-            return pd.DataFrame(results)
+        afficher_rendement("SCI à l'IR", sci_ir)
+        afficher_plus_value("SCI à l'IR", sci_ir)
+        afficher_revente("SCI à l'IR", sci_ir)
+        afficher_sensibilite("SCI à l'IR", sci_ir)
+        afficher_objectif("SCI à l'IR", sci_ir)
+        afficher_monte_carlo("SCI à l'IR", sci_ir)
+        afficher_ajout_foyer("SCI à l'IR", sci_ir)
+
+
+@st.fragment
+def page_location_nue():
 
     # Interface utilisateur Location Nue
     st.title("Simulateur Location Nue")
@@ -996,6 +702,7 @@ elif regime == "Location nue":
     taux_interet = st.number_input("Taux d’intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux d’assurance emprunteur (%)", value=0.3)
     differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     charges_copro = st.number_input("Charges de copropriété (€)", value=0)
     taxe_fonciere = st.number_input("Taxe foncière (€)", value=0)
@@ -1007,144 +714,36 @@ elif regime == "Location nue":
     vacance_locative_mois = st.slider("Vacance locative (mois)", 0, 12, 0)
     tmi = st.slider("TMI (Tranche Marginale d’Imposition en %)", 11, 45, 30)
 
-    if st.button("Lancer la simulation Location nue"):
-        location = LocationNue(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation Location nue", "Location nue"):
+        location = simuler(
+            "Location nue",
             prix_bien, apport, frais_dossier, frais_agence, montant_travaux,
             frais_garantie, frais_tiers,
             duree_annees, taux_interet, taux_assurance, differe_mois,
             charges_copro, taxe_fonciere, frais_entretien,
             frais_bancaires, gestion_locative,
-            loyer_mensuel_hc, vacance_locative_mois, tmi
+            loyer_mensuel_hc, vacance_locative_mois, tmi,
+            horizon=horizon, differe_partiel=differe_partiel
         )
 
-        st.subheader("📆 Résultats Location nue sur 10 ans")
+        st.subheader(f"📆 Résultats Location nue sur {horizon} ans")
         st.dataframe(location.resultat_fiscal_annuel())
 
         st.subheader("📉 Tableau d’amortissement de l’emprunt")
         st.dataframe(location.tableau_amortissement_emprunt()) 
+        afficher_rendement("Location nue", location)
+        afficher_plus_value("Location nue", location)
+        afficher_revente("Location nue", location)
+        afficher_sensibilite("Location nue", location)
+        afficher_objectif("Location nue", location)
+        afficher_monte_carlo("Location nue", location)
+        afficher_ajout_foyer("Location nue", location)
 
-elif regime == "Micro foncier":
-
-    @dataclass
-    class MicroFoncier:
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-        tmi: float
-
-        prix_bien: float
-        apport: float
-        frais_dossier: float
-        frais_agence: float
-        montant_travaux: float
-        frais_garantie: float
-        frais_tiers: float
-
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-
-        charges_copro: float
-        taxe_fonciere: float
-        frais_entretien: float
-        frais_bancaires: float
-        gestion_locative: float
-
-        frais_notaire_pct: float = 8.0
-        csg_crds: float = 17.2
-        abattement: float = 0.3
-        montant_emprunt: float = field(init=False)
-        frais_notaire: float = field(init=False)
-
-        def __post_init__(self):
-            self.frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
-            total_a_financer = (
-                self.prix_bien + self.frais_notaire + self.frais_agence +
-                self.frais_dossier + self.frais_garantie + self.frais_tiers + self.montant_travaux
-            )
-            self.montant_emprunt = max(0, total_a_financer - self.apport)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            for _ in range(self.differe_mois):
-                capital += capital * tm
-            n = self.duree_annees * 12 - self.differe_mois
-            if n <= 0:
-                raise ValueError("Durée ou différé incohérents")
-            m_hors_assurance = capital * tm / (1 - (1 + tm) ** -n)
-            m_assurance = self.montant_emprunt * ta
-            return m_hors_assurance + m_assurance
-
-        def tableau_amortissement_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            capital_rest = capital
-            mensualite_hors_assurance = None
-            rows = []
-            for mois in range(1, self.duree_annees * 12 + 1):
-                if mois <= self.differe_mois:
-                    interets = capital_rest * tm
-                    principal = 0
-                    capital_rest += interets
-                else:
-                    if mensualite_hors_assurance is None:
-                        mensualite_hors_assurance = self.mensualite_emprunt() - capital * ta
-                    interets = capital_rest * tm
-                    principal = mensualite_hors_assurance - interets
-                    capital_rest -= principal
-                    if capital_rest < 0:
-                        principal += capital_rest
-                        capital_rest = 0
-                rows.append({
-                    'Mois': mois,
-                    'Année': (mois - 1) // 12 + 1,
-                    'Intérêts': interets,
-                    'Principal': principal,
-                    'Assurance': capital * ta,
-                    'Capital restant dû': capital_rest
-                })
-            return pd.DataFrame(rows)
-
-        def resultat_fiscal_annuel(self):
-            interets = self.tableau_amortissement_emprunt().groupby('Année')['Intérêts'].sum().to_dict()
-            assurances = self.tableau_amortissement_emprunt().groupby('Année')['Assurance'].sum().to_dict()
-            mensualite = self.mensualite_emprunt()
-
-            rows = []
-            for annee in range(1, 11):
-                revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-                revenu_imposable = revenus * (1 - self.abattement)
-                ir = revenu_imposable * (self.tmi / 100)
-                ps = revenu_imposable * (self.csg_crds / 100)
-
-                charges_reelles = (
-                    self.charges_copro + self.taxe_fonciere + self.frais_entretien +
-                    self.frais_bancaires + self.gestion_locative
-                )
-                charges_recup = self.charges_copro * 0.8
-                interet = interets.get(annee, 0.0)
-                assurance = assurances.get(annee, 0.0)
-
-                cashflow = (revenus - charges_reelles - interet - assurance - ir - ps + charges_recup - mensualite * 12) / 12
-
-                rows.append({
-                    "Année": annee,
-                    "Revenus bruts": round(revenus, 2),
-                    "Revenu imposable (abattement 30%)": round(revenu_imposable, 2),
-                    "IR (TMI)": round(ir, 2),
-                    "Prélèvements sociaux (17.2%)": round(ps, 2),
-                    "Charges réelles": round(charges_reelles, 2),
-                    "Intérêts": round(interet, 2),
-                    "Assurance emprunt": round(assurance, 2),
-                    "Charges récupérables": round(charges_recup, 2),
-                    "Mensualité emprunt (annuelle)": round(mensualite * 12, 2),
-                    "Cashflow mensuel": round(cashflow, 2) / 12
-                })
-
-            return pd.DataFrame(rows)
+
+@st.fragment
+def page_micro_foncier():
 
     # Interface utilisateur Micro-Foncier
     st.title("Simulateur Micro-Foncier")
@@ -1161,6 +760,7 @@ elif regime == "Micro foncier":
     taux_interet = st.number_input("Taux d’intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux assurance emprunteur (%)", value=0.3)
     differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     charges_copro = st.number_input("Charges de copropriété (€)", value=0)
     taxe_fonciere = st.number_input("Taxe foncière (€)", value=0)
@@ -1172,184 +772,37 @@ elif regime == "Micro foncier":
     vacance_locative_mois = st.slider("Vacance locative (mois)", 0, 12, 1)
     tmi = st.slider("TMI (Tranche Marginale d’Imposition en %)", 0, 45, 30)
 
-    if st.button("Lancer la simulation Micro-Foncier"):
-        micro = MicroFoncier(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation Micro-Foncier", "Micro foncier"):
+        micro = simuler(
+            "Micro foncier",
             loyer_mensuel_hc, vacance_locative_mois, tmi,
             prix_bien, apport, frais_dossier, frais_agence, montant_travaux,
             frais_garantie, frais_tiers,
             duree_annees, taux_interet, taux_assurance, differe_mois,
-            charges_copro, taxe_fonciere, frais_entretien, frais_bancaires, gestion_locative
+            charges_copro, taxe_fonciere, frais_entretien, frais_bancaires, gestion_locative,
+            horizon=horizon, differe_partiel=differe_partiel
         )
 
-        st.subheader("📊 Résultats Micro-Foncier sur 10 ans")
+        if micro.revenus_annuels() > micro.plafond_microfoncier:
+            st.warning(f"⚠️ Revenus bruts annuels ({micro.revenus_annuels():,.0f} €) dépassent le plafond micro-foncier ({micro.plafond_microfoncier:,.0f} €). Basculer vers le régime réel.")
+
+        st.subheader(f"📊 Résultats Micro-Foncier sur {horizon} ans")
         st.dataframe(micro.resultat_fiscal_annuel())
         st.subheader("📉 Tableau d’amortissement de l’emprunt")
         st.dataframe(micro.tableau_amortissement_emprunt())
+        afficher_rendement("Micro foncier", micro)
+        afficher_plus_value("Micro foncier", micro)
+        afficher_revente("Micro foncier", micro)
+        afficher_sensibilite("Micro foncier", micro)
+        afficher_objectif("Micro foncier", micro)
+        afficher_monte_carlo("Micro foncier", micro)
+        afficher_ajout_foyer("Micro foncier", micro)
+
 
-elif regime == "LMP réel":
-
-    @dataclass
-    class LMPReel:
-        prix_bien: float
-        part_terrain: float
-        apport: float
-        frais_dossier: float
-        frais_agence: float
-        montant_travaux: float
-        frais_garantie: float
-        frais_tiers: float
-        mobilier: float
-
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-
-        charges_copro: float
-        assurance: float
-        assurance_gli: float
-        taxe_fonciere: float
-        frais_entretien: float
-        frais_compta: float
-        frais_bancaires: float
-        gestion_locative: float
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-        tmi: float
-
-        duree_amort_bati: int
-        duree_amort_travaux: int
-        duree_amort_mobilier: int
-        duree_amort_frais: int
-
-        frais_notaire_pct: float = 8.0
-        montant_emprunt: float = field(init=False)
-        frais_notaire: float = field(init=False)
-
-        def __post_init__(self):
-            self.frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
-            total_a_financer = (
-                self.prix_bien + self.frais_notaire + self.frais_agence +
-                self.frais_dossier + self.frais_garantie + self.frais_tiers + self.montant_travaux
-            )
-            self.montant_emprunt = max(0, total_a_financer - self.apport)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            for _ in range(self.differe_mois):
-                capital += capital * tm
-            n = self.duree_annees * 12 - self.differe_mois
-            if n <= 0:
-                raise ValueError("Durée ou différé incohérents")
-            m_hors_assurance = capital * tm / (1 - (1 + tm) ** -n)
-            m_assurance = self.montant_emprunt * ta
-            return m_hors_assurance + m_assurance
-
-        def tableau_amortissement_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            capital_rest = capital
-            mensualite_hors_assurance = None
-            rows = []
-            for mois in range(1, self.duree_annees * 12 + 1):
-                if mois <= self.differe_mois:
-                    interets = capital_rest * tm
-                    principal = 0
-                    capital_rest += interets
-                else:
-                    if mensualite_hors_assurance is None:
-                        mensualite_hors_assurance = self.mensualite_emprunt() - capital * ta
-                    interets = capital_rest * tm
-                    principal = mensualite_hors_assurance - interets
-                    capital_rest -= principal
-                    if capital_rest < 0:
-                        principal += capital_rest
-                        capital_rest = 0
-                rows.append({
-                    'Mois': mois,
-                    'Année': (mois - 1) // 12 + 1,
-                    'Intérêts': interets,
-                    'Principal': principal,
-                    'Assurance': capital * ta,
-                    'Capital restant dû': capital_rest
-                })
-            return pd.DataFrame(rows)
-
-        def amortissements(self):
-            valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
-            rows = []
-            for annee in range(1, 11):
-                bati = valeur_bati / self.duree_amort_bati if annee <= self.duree_amort_bati else 0
-                mobilier = self.mobilier / self.duree_amort_mobilier if annee <= self.duree_amort_mobilier else 0
-                travaux = self.montant_travaux / self.duree_amort_travaux if annee <= self.duree_amort_travaux else 0
-                frais = (self.frais_dossier + self.frais_agence + self.frais_garantie + self.frais_tiers) / self.duree_amort_frais if annee <= self.duree_amort_frais else 0
-                total = bati + mobilier + travaux + frais
-                rows.append({
-                    'Année': annee,
-                    'Amortissement Bâti': bati,
-                    'Amortissement Mobilier': mobilier,
-                    'Amortissement Travaux': travaux,
-                    'Amortissement Frais': frais,
-                    'Total Amortissement': total
-                })
-            return pd.DataFrame(rows)
-
-        def resultat_fiscal_annuel(self):
-            amort = self.amortissements().set_index('Année')['Total Amortissement'].to_dict()
-            amort_table = self.tableau_amortissement_emprunt()
-            interets = amort_table.groupby('Année')['Intérêts'].sum().to_dict()
-            assurances = amort_table.groupby('Année')['Assurance'].sum().to_dict()
-
-            mensualite = self.mensualite_emprunt()
-            results = []
-            deficit_reportable = 0.0
-
-            for annee in range(1, 11):
-                revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-                charges_reelles = (
-                    self.charges_copro + self.assurance + self.assurance_gli +
-                    self.taxe_fonciere + self.frais_entretien + self.frais_compta +
-                    self.frais_bancaires + self.gestion_locative
-                )
-                charges_recup = self.charges_copro * 0.8
-                interet = interets.get(annee, 0.0)
-                assurance = assurances.get(annee, 0.0)
-                dotation = amort.get(annee, 0.0)
-
-                resultat_brut = revenus - charges_reelles - interet - assurance - dotation
-                resultat_net = resultat_brut + deficit_reportable
-
-                if resultat_net < 0:
-                    ir = 0.0
-                    ssi = 0.0
-                    deficit_reportable = resultat_net
-                else:
-                    ir = resultat_net * (self.tmi / 100)
-                    ssi = resultat_net * 0.40
-                    deficit_reportable = 0.0
-
-                cashflow_mensuel = (revenus - charges_reelles - ir - ssi - mensualite * 12 + charges_recup) / 12
-
-                results.append({
-                    'Année': annee,
-                    'Revenus': revenus,
-                    'Charges réelles': charges_reelles,
-                    'Charges récupérables': charges_recup,
-                    'Intérêts': interet,
-                    'Assurance': assurance,
-                    'Amortissements': dotation,
-                    'Résultat fiscal brut': resultat_brut,
-                    'Résultat fiscal net': resultat_net,
-                    'Déficit reportable': deficit_reportable if deficit_reportable < 0 else 0.0,
-                    'IR (TMI)': round(ir, 2),
-                    'Cotisations sociales (SSI)': round(ssi, 2),
-                    'Cashflow mensuel (€)': round(cashflow_mensuel, 2)
-                })
-
-            return pd.DataFrame(results)
+@st.fragment
+def page_lmp_reel():
 
     # Interface utilisateur LMP réel
     st.title("Simulateur LMP réel")
@@ -1368,6 +821,7 @@ elif regime == "LMP réel":
     taux_interet = st.number_input("Taux d’intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux assurance emprunteur (%)", value=0.3)
     differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     charges_copro = st.number_input("Charges de copropriété (€)", value=0)
     assurance = st.number_input("Assurance propriétaire (€)", value=0)
@@ -1387,18 +841,22 @@ elif regime == "LMP réel":
     duree_amort_mobilier = st.slider("Durée amortissement mobilier (années)", 5, 15, 7)
     duree_amort_frais = st.slider("Durée amortissement frais (années)", 5, 15, 10)
 
-    if st.button("Lancer la simulation LMP réel"):
-        lmp = LMPReel(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation LMP réel", "LMP réel"):
+        lmp = simuler(
+            "LMP réel",
             prix_bien, part_terrain, apport, frais_dossier, frais_agence, montant_travaux,
             frais_garantie, frais_tiers, mobilier,
             duree_annees, taux_interet, taux_assurance, differe_mois,
             charges_copro, assurance, assurance_gli, taxe_fonciere, frais_entretien,
             frais_compta, frais_bancaires, gestion_locative,
             loyer_mensuel_hc, vacance_locative_mois, tmi,
-            duree_amort_bati, duree_amort_travaux, duree_amort_mobilier, duree_amort_frais
+            duree_amort_bati, duree_amort_travaux, duree_amort_mobilier, duree_amort_frais,
+            horizon=horizon, differe_partiel=differe_partiel
         )
 
-        st.subheader("📊 Résultats LMP réel sur 10 ans")
+        st.subheader(f"📊 Résultats LMP réel sur {horizon} ans")
         st.dataframe(lmp.resultat_fiscal_annuel())
 
         st.subheader("📉 Tableau d’amortissement de l’emprunt")
@@ -1406,169 +864,18 @@ elif regime == "LMP réel":
 
         st.subheader("📑 Tableau des amortissements comptables")
         st.dataframe(lmp.amortissements()) 
+        afficher_rendement("LMP réel", lmp)
+        afficher_plus_value("LMP réel", lmp)
+        afficher_revente("LMP réel", lmp)
+        afficher_sensibilite("LMP réel", lmp)
+        afficher_objectif("LMP réel", lmp)
+        afficher_monte_carlo("LMP réel", lmp)
+        afficher_ajout_foyer("LMP réel", lmp)
+
+
+@st.fragment
+def page_sarl_famille():
 
-elif regime == "SARL de famille":
-
-    @dataclass
-    class SARLDeFamille:
-        prix_bien: float
-        part_terrain: float
-        apport: float
-        frais_dossier: float
-        frais_agence: float
-        montant_travaux: float
-        frais_garantie: float
-        frais_tiers: float
-        mobilier: float
-
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-
-        charges_copro: float
-        assurance: float
-        assurance_gli: float
-        taxe_fonciere: float
-        frais_entretien: float
-        frais_compta: float
-        frais_bancaires: float
-        gestion_locative: float
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-        tmi: float
-
-        duree_amort_bati: int
-        duree_amort_travaux: int
-        duree_amort_mobilier: int
-        duree_amort_frais: int
-
-        frais_notaire_pct: float = 8.0
-        montant_emprunt: float = field(init=False)
-        frais_notaire: float = field(init=False)
-
-        def __post_init__(self):
-            self.frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
-            total_a_financer = (
-                self.prix_bien + self.frais_notaire + self.frais_agence +
-                self.frais_dossier + self.frais_garantie + self.frais_tiers + self.montant_travaux
-            )
-            self.montant_emprunt = max(0, total_a_financer - self.apport)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            for _ in range(self.differe_mois):
-                capital += capital * tm
-            n = self.duree_annees * 12 - self.differe_mois
-            if n <= 0:
-                raise ValueError("Durée ou différé incohérents")
-            m_hors_assurance = capital * tm / (1 - (1 + tm) ** -n)
-            m_assurance = self.montant_emprunt * ta
-            return m_hors_assurance + m_assurance
-
-        def tableau_amortissement_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            capital_rest = capital
-            mensualite_hors_assurance = None
-            rows = []
-            for mois in range(1, self.duree_annees * 12 + 1):
-                if mois <= self.differe_mois:
-                    interets = capital_rest * tm
-                    principal = 0
-                    capital_rest += interets
-                else:
-                    if mensualite_hors_assurance is None:
-                        mensualite_hors_assurance = self.mensualite_emprunt() - capital * ta
-                    interets = capital_rest * tm
-                    principal = mensualite_hors_assurance - interets
-                    capital_rest -= principal
-                    if capital_rest < 0:
-                        principal += capital_rest
-                        capital_rest = 0
-                rows.append({
-                    'Mois': mois,
-                    'Année': (mois - 1) // 12 + 1,
-                    'Intérêts': interets,
-                    'Principal': principal,
-                    'Assurance': capital * ta,
-                    'Capital restant dû': capital_rest
-                })
-            return pd.DataFrame(rows)
-
-        def amortissements(self):
-            valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
-            rows = []
-            for annee in range(1, 11):
-                bati = valeur_bati / self.duree_amort_bati if annee <= self.duree_amort_bati else 0
-                mobilier = self.mobilier / self.duree_amort_mobilier if annee <= self.duree_amort_mobilier else 0
-                travaux = self.montant_travaux / self.duree_amort_travaux if annee <= self.duree_amort_travaux else 0
-                frais = (self.frais_dossier + self.frais_agence + self.frais_garantie + self.frais_tiers) / self.duree_amort_frais if annee <= self.duree_amort_frais else 0
-                total = bati + mobilier + travaux + frais
-                rows.append({
-                    'Année': annee,
-                    'Amortissement Bâti': bati,
-                    'Amortissement Mobilier': mobilier,
-                    'Amortissement Travaux': travaux,
-                    'Amortissement Frais': frais,
-                    'Total Amortissement': total
-                })
-            return pd.DataFrame(rows)
-
-        def resultat_fiscal_annuel(self):
-            amort = self.amortissements().set_index('Année')['Total Amortissement'].to_dict()
-            amort_table = self.tableau_amortissement_emprunt()
-            interets = amort_table.groupby('Année')['Intérêts'].sum().to_dict()
-            assurances = amort_table.groupby('Année')['Assurance'].sum().to_dict()
-
-            mensualite = self.mensualite_emprunt()
-            results = []
-            deficit_reportable = 0.0
-
-            for annee in range(1, 11):
-                revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-                charges_reelles = (
-                    self.charges_copro + self.assurance + self.assurance_gli +
-                    self.taxe_fonciere + self.frais_entretien + self.frais_compta +
-                    self.frais_bancaires + self.gestion_locative
-                )
-                charges_recup = self.charges_copro * 0.8
-                interet = interets.get(annee, 0.0)
-                assurance = assurances.get(annee, 0.0)
-                dotation = amort.get(annee, 0.0)
-
-                resultat_brut = revenus - charges_reelles - interet - assurance - dotation
-                resultat_net = resultat_brut + deficit_reportable
-
-                if resultat_net < 0:
-                    ir = 0.0
-                    deficit_reportable = resultat_net
-                else:
-                    ir = resultat_net * (self.tmi / 100)
-                    deficit_reportable = 0.0
-
-                cashflow_mensuel = (revenus - charges_reelles - ir - mensualite * 12 + charges_recup) / 12
-
-                results.append({
-                    'Année': annee,
-                    'Revenus': revenus,
-                    'Charges réelles': charges_reelles,
-                    'Charges récupérables': charges_recup,
-                    'Intérêts': interet,
-                    'Assurance': assurance,
-                    'Amortissements': dotation,
-                    'Résultat fiscal brut': resultat_brut,
-                    'Résultat fiscal net': resultat_net,
-                    'Déficit reportable': deficit_reportable if deficit_reportable < 0 else 0.0,
-                    'IR (TMI)': round(ir, 2),
-                    'Cashflow mensuel (€)': round(cashflow_mensuel, 2)
-                })
-
-            return pd.DataFrame(results) 
-                
     # Interface utilisateur SARL de famille
     st.title("Simulation SARL de Famille (IR)")
 
@@ -1586,6 +893,7 @@ elif regime == "SARL de famille":
     taux_interet = st.number_input("Taux d’intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux assurance emprunteur (%)", value=0.3)
     differe_mois = st.slider("Différé de remboursement (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     charges_copro = st.number_input("Charges de copropriété (€)", value=0)
     assurance = st.number_input("Assurance propriétaire (€)", value=0)
@@ -1604,152 +912,38 @@ elif regime == "SARL de famille":
     duree_amort_mobilier = st.slider("Durée amort. mobilier (ans)", 5, 10, 7)
     duree_amort_frais = st.slider("Durée amort. frais (ans)", 5, 10, 5)
 
-    if st.button("Lancer la simulation SARL de Famille"):
-        sarl = SARLDeFamille(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation SARL de Famille", "SARL de famille"):
+        sarl = simuler(
+            "SARL de famille",
             prix_bien, part_terrain, apport, frais_dossier, frais_agence,
             montant_travaux, frais_garantie, frais_tiers, mobilier,
             duree_annees, taux_interet, taux_assurance, differe_mois,
             charges_copro, assurance, assurance_gli, taxe_fonciere, frais_entretien,
             frais_compta, frais_bancaires, gestion_locative,
             loyer_mensuel_hc, vacance_locative_mois, tmi,
-            duree_amort_bati, duree_amort_travaux, duree_amort_mobilier, duree_amort_frais
+            duree_amort_bati, duree_amort_travaux, duree_amort_mobilier, duree_amort_frais,
+            horizon=horizon, differe_partiel=differe_partiel
         )
 
-        st.subheader("📈 Résultats fiscaux SARL de Famille sur 10 ans")
+        st.subheader(f"📈 Résultats fiscaux SARL de Famille sur {horizon} ans")
         st.dataframe(sarl.resultat_fiscal_annuel())
 
         st.subheader("📊 Tableau d’amortissement de l’emprunt")
         st.dataframe(sarl.tableau_amortissement_emprunt())
+        afficher_rendement("SARL de famille", sarl)
+        afficher_plus_value("SARL de famille", sarl)
+        afficher_revente("SARL de famille", sarl)
+        afficher_sensibilite("SARL de famille", sarl)
+        afficher_objectif("SARL de famille", sarl)
+        afficher_monte_carlo("SARL de famille", sarl)
+        afficher_ajout_foyer("SARL de famille", sarl)
+
+
+@st.fragment
+def page_reel_foncier():
 
-elif regime == "Réel foncier":
-
-    @dataclass
-    class ReelFoncier:
-        prix_bien: float
-        apport: float
-        frais_dossier: float
-        frais_agence: float
-        montant_travaux: float
-        frais_garantie: float
-        frais_tiers: float
-
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-
-        charges_copro: float
-        taxe_fonciere: float
-        frais_entretien: float
-        frais_compta: float
-        frais_bancaires: float
-        gestion_locative: float
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-        tmi: float
-
-        frais_notaire_pct: float = 8.0
-        montant_emprunt: float = field(init=False)
-        frais_notaire: float = field(init=False)
-
-        def __post_init__(self):
-            self.frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
-            total = self.prix_bien + self.frais_notaire + self.frais_agence + self.frais_dossier + self.frais_garantie + self.frais_tiers + self.montant_travaux
-            self.montant_emprunt = max(0, total - self.apport)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            for _ in range(self.differe_mois):
-                capital += capital * tm
-            n = self.duree_annees * 12 - self.differe_mois
-            m_hors_assurance = capital * tm / (1 - (1 + tm) ** -n)
-            m_assurance = self.montant_emprunt * ta
-            return m_hors_assurance + m_assurance
-
-        def tableau_amortissement_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            capital_rest = capital
-            mensualite_hors_assurance = None
-            rows = []
-            for mois in range(1, self.duree_annees * 12 + 1):
-                if mois <= self.differe_mois:
-                    interets = capital_rest * tm
-                    principal = 0
-                    capital_rest += interets
-                else:
-                    if mensualite_hors_assurance is None:
-                        mensualite_hors_assurance = self.mensualite_emprunt() - capital * ta
-                    interets = capital_rest * tm
-                    principal = mensualite_hors_assurance - interets
-                    capital_rest -= principal
-                    if capital_rest < 0:
-                        principal += capital_rest
-                        capital_rest = 0
-                rows.append({
-                    'Mois': mois,
-                    'Année': (mois - 1) // 12 + 1,
-                    'Intérêts': interets,
-                    'Principal': principal,
-                    'Assurance': capital * ta,
-                    'Capital restant dû': capital_rest
-                })
-            return pd.DataFrame(rows)
-
-        def resultat_fiscal_annuel(self):
-            amort_emprunt = self.tableau_amortissement_emprunt()
-            interets = amort_emprunt.groupby('Année')['Intérêts'].sum().to_dict()
-            assurances = amort_emprunt.groupby('Année')['Assurance'].sum().to_dict()
-            mensualite = self.mensualite_emprunt()
-
-            results = []
-            deficit_reportable_foncier = 0.0
-
-            for annee in range(1, 11):
-                revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-                charges = (
-                    self.charges_copro + self.taxe_fonciere + self.frais_entretien +
-                    self.frais_compta + self.frais_bancaires + self.gestion_locative
-                )
-                interet = interets.get(annee, 0.0)
-                assurance = assurances.get(annee, 0.0)
-                charges_recup = self.charges_copro * 0.8
-
-                resultat_foncier = revenus - charges - interet - assurance
-                resultat_net = resultat_foncier + deficit_reportable_foncier
-
-                if resultat_net < 0:
-                    imputable_rg = max(resultat_net, -10700)
-                    reportable = resultat_net - imputable_rg
-                    ir = 0.0
-                    deficit_reportable_foncier = reportable
-                else:
-                    ir = resultat_net * (self.tmi / 100)
-                    imputable_rg = 0.0
-                    deficit_reportable_foncier = 0.0
-
-                cashflow = (revenus - charges - interet - assurance - ir - mensualite * 12 + charges_recup) / 12
-
-                results.append({
-                    'Année': annee,
-                    'Revenus': revenus,
-                    'Charges réelles': charges,
-                    'Charges récupérables': charges_recup,
-                    'Intérêts': interet,
-                    'Assurance': assurance,
-                    'Résultat foncier': resultat_foncier,
-                    'Résultat fiscal net': resultat_net,
-                    'Déficit imputé sur revenu global': -imputable_rg if imputable_rg < 0 else 0.0,
-                    'Déficit reportable foncier': deficit_reportable_foncier if deficit_reportable_foncier < 0 else 0.0,
-                    'Impôt (IR)': round(ir, 2),
-                    'Cashflow mensuel (€)': round(cashflow, 2) / 12
-                })
-
-            return pd.DataFrame(results) 
-    
     # Interface utilisateur – Régime Réel Foncier
     st.title("Simulateur Réel Foncier")
 
@@ -1765,6 +959,7 @@ elif regime == "Réel foncier":
     taux_interet = st.number_input("Taux d’intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux d’assurance emprunteur (%)", value=0.3)
     differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     charges_copro = st.number_input("Charges de copropriété (€)", value=0)
     taxe_fonciere = st.number_input("Taxe foncière (€)", value=0)
@@ -1777,179 +972,35 @@ elif regime == "Réel foncier":
     vacance_locative_mois = st.slider("Vacance locative (mois)", 0, 12, 0)
     tmi = st.slider("TMI (Tranche Marginale d’Imposition en %)", 0, 45, 30)
 
-    if st.button("Lancer la simulation Réel Foncier"):
-        reel = ReelFoncier(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation Réel Foncier", "Réel foncier"):
+        reel = simuler(
+            "Réel foncier",
             prix_bien, apport, frais_dossier, frais_agence, montant_travaux,
             frais_garantie, frais_tiers,
             duree_annees, taux_interet, taux_assurance, differe_mois,
             charges_copro, taxe_fonciere, frais_entretien, frais_compta,
             frais_bancaires, gestion_locative,
-            loyer_mensuel_hc, vacance_locative_mois, tmi
+            loyer_mensuel_hc, vacance_locative_mois, tmi,
+            horizon=horizon, differe_partiel=differe_partiel
         )
 
-        st.subheader("📆 Résultats régime réel foncier sur 10 ans")
+        st.subheader(f"📆 Résultats régime réel foncier sur {horizon} ans")
         st.dataframe(reel.resultat_fiscal_annuel())
         st.subheader("📉 Tableau d’amortissement de l’emprunt")
         st.dataframe(reel.tableau_amortissement_emprunt())
-        
-elif regime == "Holding à l'IS":
-
-    # --------------------------------------------------------------------------------
-    # CLASSE HOLDING À L'IS
-    # --------------------------------------------------------------------------------
-    @dataclass
-    class HoldingIS:
-        prix_bien: float
-        part_terrain: float
-        apport: float
-        frais_dossier: float
-        frais_agence: float
-        montant_travaux: float
-        frais_garantie: float
-        frais_tiers: float
-        mobilier: float
-
-        duree_annees: int
-        taux_interet: float
-        taux_assurance: float
-        differe_mois: int
-
-        charges_copro: float
-        assurance: float
-        assurance_gli: float
-        taxe_fonciere: float
-        frais_entretien: float
-        frais_compta: float
-        frais_bancaires: float
-        gestion_locative: float
-        loyer_mensuel_hc: float
-        vacance_locative_mois: int
-
-        duree_amort_bati: int
-        duree_amort_travaux: int
-        duree_amort_mobilier: int
-        duree_amort_frais: int
-
-        frais_notaire_pct: float = 8.0
-        montant_emprunt: float = field(init=False)
-        frais_notaire: float = field(init=False)
-
-        def __post_init__(self):
-            self.frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
-            total_a_financer = (
-                self.prix_bien + self.frais_notaire + self.frais_agence +
-                self.frais_dossier + self.frais_garantie + self.frais_tiers + self.montant_travaux
-            )
-            self.montant_emprunt = max(0, total_a_financer - self.apport)
-
-        def mensualite_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            for _ in range(self.differe_mois):
-                capital += capital * tm
-            n = self.duree_annees * 12 - self.differe_mois
-            m_hors_assurance = capital * tm / (1 - (1 + tm) ** -n)
-            m_assurance = self.montant_emprunt * ta
-            return m_hors_assurance + m_assurance
-
-        def tableau_amortissement_emprunt(self):
-            tm = self.taux_interet / 100 / 12
-            ta = self.taux_assurance / 100 / 12
-            capital = self.montant_emprunt
-            capital_rest = capital
-            mensualite_hors_assurance = None
-            rows = []
-            for mois in range(1, self.duree_annees * 12 + 1):
-                if mois <= self.differe_mois:
-                    interets = capital_rest * tm
-                    principal = 0
-                    capital_rest += interets
-                else:
-                    if mensualite_hors_assurance is None:
-                        mensualite_hors_assurance = self.mensualite_emprunt() - capital * ta
-                    interets = capital_rest * tm
-                    principal = mensualite_hors_assurance - interets
-                    capital_rest -= principal
-                    if capital_rest < 0:
-                        principal += capital_rest
-                        capital_rest = 0
-                rows.append({
-                    'Mois': mois,
-                    'Année': (mois - 1) // 12 + 1,
-                    'Intérêts': interets,
-                    'Principal': principal,
-                    'Assurance': capital * ta,
-                    'Capital restant dû': capital_rest
-                })
-            return pd.DataFrame(rows)
-
-        def amortissements(self):
-            valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
-            rows = []
-            for annee in range(1, 11):
-                bati = valeur_bati / self.duree_amort_bati if annee <= self.duree_amort_bati else 0
-                mobilier = self.mobilier / self.duree_amort_mobilier if annee <= self.duree_amort_mobilier else 0
-                travaux = self.montant_travaux / self.duree_amort_travaux if annee <= self.duree_amort_travaux else 0
-                frais = (self.frais_dossier + self.frais_agence + self.frais_garantie + self.frais_tiers) / self.duree_amort_frais if annee <= self.duree_amort_frais else 0
-                total = bati + mobilier + travaux + frais
-                rows.append({
-                    'Année': annee,
-                    'Amortissement Bâti': bati,
-                    'Amortissement Mobilier': mobilier,
-                    'Amortissement Travaux': travaux,
-                    'Amortissement Frais': frais,
-                    'Total Amortissement': total
-                })
-            return pd.DataFrame(rows)
-
-        def resultat_fiscal_annuel(self):
-            amort = self.amortissements().set_index('Année')['Total Amortissement'].to_dict()
-            amort_table = self.tableau_amortissement_emprunt()
-            interets = amort_table.groupby('Année')['Intérêts'].sum().to_dict()
-            assurances = amort_table.groupby('Année')['Assurance'].sum().to_dict()
-            mensualite = self.mensualite_emprunt()
-            results = []
-            deficit_reportable = 0.0
-            for annee in range(1, 11):
-                revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
-                charges_reelles = (
-                    self.charges_copro + self.assurance + self.assurance_gli +
-                    self.taxe_fonciere + self.frais_entretien + self.frais_compta +
-                    self.frais_bancaires + self.gestion_locative
-                )
-                charges_recup = self.charges_copro * 0.8
-                charges_fiscales = charges_reelles - charges_recup
-                interet = interets.get(annee, 0.0)
-                assurance = assurances.get(annee, 0.0)
-                dotation = amort.get(annee, 0.0)
-                resultat_brut = revenus - charges_fiscales - interet - assurance - dotation
-                resultat_net = resultat_brut + deficit_reportable
-                if resultat_net < 0:
-                    is_impot = 0.0
-                    deficit_reportable = resultat_net
-                else:
-                    if resultat_net <= 42500:
-                        is_impot = resultat_net * 0.15
-                    else:
-                        is_impot = 42500 * 0.15 + (resultat_net - 42500) * 0.25
-                    deficit_reportable = 0.0
-                cashflow_mensuel = (revenus - charges_reelles - is_impot - mensualite * 12 + charges_recup) / 12
-                results.append({
-                    'Année': annee,
-                    'Revenus': revenus,
-                    'Charges réelles': charges_reelles,
-                    'Charges récupérables': charges_recup,
-                    'Intérêts': interet,
-                    'Assurance': assurance,
-                    'Amortissements': dotation,
-                    'Résultat fiscal brut': resultat_brut,
-                    'Résultat fiscal net': resultat_net,
-                    'Déficit reportable': deficit_reportable if deficit_reportable < 0 else 0.0,
-                    'IS': is_impot,
-                    'Cashflow mensuel (€)': round(cashflow_mensuel, 2)
-                })
-            return pd.DataFrame(results)
+        afficher_rendement("Réel foncier", reel)
+        afficher_plus_value("Réel foncier", reel)
+        afficher_revente("Réel foncier", reel)
+        afficher_sensibilite("Réel foncier", reel)
+        afficher_objectif("Réel foncier", reel)
+        afficher_monte_carlo("Réel foncier", reel)
+        afficher_ajout_foyer("Réel foncier", reel)
+
+
+@st.fragment
+def page_holding_is():
 
     # Interface utilisateur Holding à l’IS
     st.title("Simulateur Holding à l’IS")
@@ -1968,6 +1019,7 @@ elif regime == "Holding à l'IS":
     taux_interet = st.number_input("Taux d’intérêt (%)", value=3.0)
     taux_assurance = st.number_input("Taux assurance emprunteur (%)", value=0.3)
     differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+    differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
 
     charges_copro = st.number_input("Charges de copropriété (€)", value=0)
     assurance = st.number_input("Assurance PNO (€)", value=0)
@@ -1986,25 +1038,176 @@ elif regime == "Holding à l'IS":
     duree_amort_mobilier = st.slider("Amortissement mobilier", 5, 15, 7)
     duree_amort_frais = st.slider("Amortissement frais annexes", 3, 10, 5)
 
-    if st.button("Lancer la simulation Holding à l’IS"):
-        hold = HoldingIS(
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Lancer la simulation Holding à l’IS", "Holding à l'IS"):
+        hold = simuler(
+            "Holding à l'IS",
             prix_bien, part_terrain, apport, frais_dossier, frais_agence, montant_travaux,
             frais_garantie, frais_tiers, mobilier,
             duree_annees, taux_interet, taux_assurance, differe_mois,
             charges_copro, assurance, assurance_gli, taxe_fonciere,
             frais_entretien, frais_compta, frais_bancaires, gestion_locative,
             loyer_mensuel_hc, vacance_locative_mois,
-            duree_amort_bati, duree_amort_travaux, duree_amort_mobilier, duree_amort_frais
+            duree_amort_bati, duree_amort_travaux, duree_amort_mobilier, duree_amort_frais,
+            horizon=horizon, differe_partiel=differe_partiel
         )
-        st.subheader("📊 Résultats sur 10 ans")
+        st.subheader(f"📊 Résultats sur {horizon} ans")
         st.dataframe(hold.resultat_fiscal_annuel())
         st.subheader("📉 Tableau d’amortissement de l’emprunt")
         st.dataframe(hold.tableau_amortissement_emprunt())
         st.subheader("📑 Amortissements comptables")
         st.dataframe(hold.amortissements())
+        afficher_rendement("Holding à l'IS", hold)
+        afficher_plus_value("Holding à l'IS", hold)
+        afficher_revente("Holding à l'IS", hold)
+        afficher_sensibilite("Holding à l'IS", hold)
+        afficher_objectif("Holding à l'IS", hold)
+        afficher_monte_carlo("Holding à l'IS", hold)
+        afficher_ajout_foyer("Holding à l'IS", hold)
 
 
+# --------------------------------------------------------------------------------
+# COMPARAISON DE TOUS LES RÉGIMES
+# --------------------------------------------------------------------------------
+@st.fragment
+def page_comparaison():
+
+    # Interface utilisateur commune aux dix régimes
+    st.title("Comparer tous les régimes")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.subheader("Acquisition")
+        prix_bien = st.number_input("Prix du bien (€)", value=0)
+        part_terrain = st.slider("Part du terrain (%)", 0, 100, 15)
+        apport = st.number_input("Apport (€)", value=0)
+        frais_dossier = st.number_input("Frais de dossier (€)", value=0)
+        frais_agence = st.number_input("Frais d'agence (€)", value=0)
+        montant_travaux = st.number_input("Travaux (€)", value=0)
+        frais_garantie = st.number_input("Frais de garantie (€)", value=0)
+        frais_tiers = st.number_input("Frais de tiers (€)", value=0)
+        mobilier = st.number_input("Mobilier (€)", value=0)
+    with col2:
+        st.subheader("Financement et revenus")
+        duree_annees = st.slider("Durée prêt (années)", 5, 30, 20)
+        taux_interet = st.number_input("Taux d'intérêt (%)", value=3.0)
+        taux_assurance = st.number_input("Taux assurance emprunteur (%)", value=0.3)
+        differe_mois = st.slider("Différé (mois)", 0, 24, 0)
+        differe_partiel = st.checkbox("Différé partiel (intérêts payés pendant le différé)")
+        loyer_mensuel_hc = st.number_input("Loyer mensuel HC (€)", value=0)
+        vacance_locative_mois = st.slider("Vacance locative (mois)", 0, 12, 0)
+        tmi = st.slider("TMI (%)", 0, 45, 30)
+    with col3:
+        st.subheader("Charges annuelles")
+        charges_copro = st.number_input("Charges copropriété (€)", value=0)
+        assurance_pno = st.number_input("Assurance PNO / habitation (€)", value=0)
+        assurance_gli = st.number_input("Assurance GLI (€)", value=0)
+        taxe_fonciere = st.number_input("Taxe foncière (€)", value=0)
+        frais_entretien = st.number_input("Entretien (€)", value=0)
+        frais_compta = st.number_input("Comptabilité (€)", value=0)
+        frais_bancaires = st.number_input("Frais bancaires (€)", value=0)
+        gestion_locative = st.number_input("Gestion locative (€)", value=0)
+        taxe_habitation = st.number_input("Taxe d'habitation (€)", value=0)
 
+    duree_amort_bati = st.slider("Amortissement bâti", 20, 50, 30)
+    duree_amort_travaux = st.slider("Amortissement travaux", 5, 20, 10)
+    duree_amort_mobilier = st.slider("Amortissement mobilier", 5, 15, 7)
+    duree_amort_frais = st.slider("Amortissement frais annexes", 3, 10, 5)
 
+    horizon = st.slider("Horizon de projection (années)", 1, 40, 10)
+
+    if simulation_lancee("Comparer les régimes", "Comparaison"):
+        classement = comparer(
+            prix_bien=prix_bien, part_terrain=part_terrain, apport=apport,
+            frais_dossier=frais_dossier, frais_agence=frais_agence, montant_travaux=montant_travaux,
+            frais_garantie=frais_garantie, frais_tiers=frais_tiers, mobilier=mobilier,
+            duree_annees=duree_annees, taux_interet=taux_interet, taux_assurance=taux_assurance,
+            differe_mois=differe_mois, differe_partiel=differe_partiel,
+            charges_copro=charges_copro, assurance_pno=assurance_pno, assurance_gli=assurance_gli,
+            taxe_fonciere=taxe_fonciere, frais_entretien=frais_entretien, frais_compta=frais_compta,
+            frais_bancaires=frais_bancaires, gestion_locative=gestion_locative,
+            taxe_habitation=taxe_habitation, loyer_mensuel_hc=loyer_mensuel_hc,
+            vacance_locative_mois=vacance_locative_mois, tmi=tmi,
+            duree_amort_bati=duree_amort_bati, duree_amort_travaux=duree_amort_travaux,
+            duree_amort_mobilier=duree_amort_mobilier, duree_amort_frais=duree_amort_frais,
+            horizon=horizon
+        )
+        st.subheader(f"🏆 Classement des régimes sur {horizon} ans")
+        st.caption("TRI, VAN (à 5 %) et multiple : apport en année 0, cashflows annuels, revente au prix d'achat à l'horizon.")
+        st.dataframe(classement, hide_index=True)
 
 
+# --------------------------------------------------------------------------------
+# FOYER FISCAL : PLUSIEURS BIENS, UNE SEULE TMI
+# --------------------------------------------------------------------------------
+@st.fragment
+def page_foyer():
+
+    st.title("Mon foyer")
+    st.caption("Ajoutez des biens depuis la page de leur régime (« ➕ Ajouter au foyer ») : "
+               "ils sont imposés ensemble, sur le revenu global du foyer.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        foyer().revenu_annuel_global = st.number_input("Revenu global imposable hors biens (€/an)", value=40000)
+    with col2:
+        foyer().nombre_parts = st.number_input("Nombre de parts", value=1.0, min_value=1.0, step=0.5)
+
+    if not foyer().biens:
+        st.info("Aucun bien dans le foyer.")
+        return
+
+    libelles = {classe: libelle for libelle, classe in REGIMES.items()}
+    st.subheader(f"🏘️ {len(foyer().biens)} bien(s)")
+    for nom, simulation in list(foyer().biens.items()):
+        col1, col2, col3 = st.columns([3, 2, 1])
+        col1.write(nom)
+        col2.write(libelles[type(simulation)])
+        if col3.button("Retirer", key=f"foyer_retirer_{nom}"):
+            foyer().retirer(nom)
+            st.rerun(scope="fragment")
+
+    synthese = foyer().synthese()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("TMI du foyer an 1", f"{synthese.tmi[0]:.0f} %")
+    col2.metric("Supplément d'IR an 1", f"{synthese.supplement_ir[0]:,.0f} €")
+    col3.metric("Prélèvements sociaux an 1", f"{synthese.prelevements_sociaux[0]:,.0f} €")
+    col4.metric("Cashflow mensuel an 1", f"{synthese.cashflow[0] / 12:,.0f} €")
+    if not synthese.micro_bic_possible.all():
+        st.warning("Recettes meublées du foyer au-delà du plafond micro-BIC : les biens en micro passent au réel.")
+    if not synthese.micro_foncier_possible.all():
+        st.warning("Recettes foncières du foyer au-delà du plafond micro-foncier : les biens en micro passent au réel.")
+
+    st.dataframe({
+        "Année": synthese.annees,
+        "Revenu imposable (€)": np.round(synthese.revenu_imposable, 2),
+        "TMI (%)": synthese.tmi,
+        "IR du foyer (€)": np.round(synthese.impot_revenu, 2),
+        "Supplément d'IR (€)": np.round(synthese.supplement_ir, 2),
+        "Prélèvements sociaux (€)": np.round(synthese.prelevements_sociaux, 2),
+        "Déficit foncier imputé (€)": np.round(synthese.deficit_foncier_impute, 2),
+        "Déficit BIC reportable (€)": np.round(synthese.deficit_bic_reportable, 2),
+        "Déficit foncier reportable (€)": np.round(synthese.deficit_foncier_reportable, 2),
+        "Cashflow annuel (€)": np.round(synthese.cashflow, 2),
+    }, hide_index=True)
+    st.caption(f"{foyer().recalculs} simulation(s) de bien depuis l'ouverture : "
+               "seuls les biens ajoutés ou modifiés sont recalculés.")
+
+
+# Chaque régime est un fragment : modifier une saisie ne réexécute que sa page
+PAGES = {
+    "LMNP réel": page_lmnp_reel,
+    "LMNP Micro-Bic": page_micro_bic,
+    "LMP réel": page_lmp_reel,
+    "SCI à l'IS": page_sci_is,
+    "SCI à l'IR": page_sci_ir,
+    "SARL de famille": page_sarl_famille,
+    "Holding à l'IS": page_holding_is,
+    "Location nue": page_location_nue,
+    "Micro foncier": page_micro_foncier,
+    "Réel foncier": page_reel_foncier,
+    "Comparer tous les régimes": page_comparaison,
+    "Mon foyer": page_foyer,
+}
+PAGES[regime]()
@@ -1,8 +1,50 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-from typing import Optional
+import json
+import os
+from contextlib import asynccontextmanager
+from dataclasses import fields
 
-app = FastAPI()
+import anyio
+import numpy as np
+from fastapi import Body, FastAPI, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Dict, List, Optional, Union
+
+from lexyo_core.batch import construire_simulation
+from lexyo_core.cache import CacheLRU, CacheSQLite, empreinte_canonique
+from lexyo_core.execution import DelaiDepasse, Executeur, FileSaturee
+from lexyo_core.foyer import contribution_bien, synthese_foyer
+from lexyo_core.regimes import HORIZON_MAX
+from lexyo_core.simulation import (
+    DEFAUTS_RENDEMENT,
+    INDICATEURS_RENDEMENT,
+    colonnes_simulation,
+    simulate,
+    simuler_colonnes,
+    simuler_lot,
+)
+
+
+@asynccontextmanager
+async def cycle_de_vie(app):
+    yield
+    # Arrêt du serveur : pool de calcul et cache disque fermés
+    executeur.fermer()
+    if cache_disque is not None:
+        cache_disque.fermer()
+
+
+app = FastAPI(lifespan=cycle_de_vie)
+
+# Calculs hors de la boucle d'événements, dans un pool configurable (LEXYO_EXECUTEUR,
+# LEXYO_WORKERS, LEXYO_FILE_MAX, LEXYO_DELAI)
+executeur = Executeur.depuis_environnement()
+
+# Réponses de /simulate indexées par l'empreinte des entrées validées ; le second
+# niveau SQLite (LEXYO_CACHE_SQLITE) survit aux redémarrages
+_ttl_cache = float(os.environ["LEXYO_CACHE_TTL"]) if "LEXYO_CACHE_TTL" in os.environ else None
+cache_reponses = CacheLRU(taille_max=int(os.environ.get("LEXYO_CACHE_TAILLE", 4096)), ttl=_ttl_cache)
+cache_disque = CacheSQLite(os.environ["LEXYO_CACHE_SQLITE"], ttl=_ttl_cache) if "LEXYO_CACHE_SQLITE" in os.environ else None
 
 
 class SimulationInputs(BaseModel):
@@ -34,102 +76,307 @@ class SimulationInputs(BaseModel):
     taux_assurance: float
     revenu_annuel_global: float
     nombre_parts: float
+    # Rendement sur l'horizon de détention ; facultatifs
+    horizon: int = Field(DEFAUTS_RENDEMENT["horizon"], ge=1, le=HORIZON_MAX)
+    taux_actualisation: float = Field(DEFAUTS_RENDEMENT["taux_actualisation"], gt=-1)
+    valeur_revente: Optional[float] = Field(DEFAUTS_RENDEMENT["valeur_revente"], ge=0)
 
 
-def calcul_tmi(revenu_imposable, parts):
-    tranches = [
-        (0, 11294, 0.0),
-        (11295, 28797, 0.11),
-        (28798, 82341, 0.30),
-        (82342, 177106, 0.41),
-        (177107, float('inf'), 0.45),
-    ]
-    quotient = revenu_imposable / parts
-    for bas, haut, taux in tranches:
-        if bas <= quotient <= haut:
-            return taux
-    return 0.30
-
-
-def calcul_impot_ir(revenu_foncier_net, inputs: SimulationInputs):
-    revenu_total = inputs.revenu_annuel_global + revenu_foncier_net
-    tmi = calcul_tmi(revenu_total, inputs.nombre_parts)
-    prelevements_sociaux = 0.172
-    if revenu_foncier_net < 0:
-        return 0
-    return revenu_foncier_net * (tmi + prelevements_sociaux)
-
-
-def calcul_impot_is(benefice):
-    if benefice <= 42500:
-        return benefice * 0.15
-    return 42500 * 0.15 + (benefice - 42500) * 0.25
-
-
-def calcul_amortissement(prix, duree):
-    return prix / duree if duree and duree > 0 else 0
-
-
-def simulate(inputs: SimulationInputs):
-    loyer_annuel = inputs.loyer_mensuel_hc * 12
-
-    charges = sum([
-        inputs.charges_copro,
-        inputs.assurance_pno,
-        inputs.assurance_gli,
-        inputs.taxe_fonciere,
-        inputs.frais_entretien,
-        inputs.frais_gestion,
-        inputs.frais_bancaire,
-        inputs.comptabilite
-    ])
-
-    charges_annuelles = charges
-    interets_emprunt = (inputs.prix_bien - inputs.montant_apport) * inputs.taux_interet
-    assurance_credit = (inputs.prix_bien - inputs.montant_apport) * inputs.taux_assurance
-
-    total_amortissements = 0
-    if inputs.regime in ["LMNP réel", "LMP réel", "SCI à l'IS", "SARL de famille", "Holding à l'IS"]:
-        amort_bien = calcul_amortissement(inputs.prix_bien * 0.8, inputs.amortissement_bien_duree)
-        amort_notaire = calcul_amortissement(inputs.frais_notaire, inputs.amortissement_notaire_duree)
-        amort_mobilier = calcul_amortissement(inputs.mobilier, inputs.amortissement_mobilier_duree)
-        amort_travaux = calcul_amortissement(inputs.travaux, inputs.amortissement_travaux_duree)
-        total_amortissements = amort_bien + amort_notaire + amort_mobilier + amort_travaux
-
-    revenu_net = loyer_annuel - charges_annuelles - interets_emprunt - assurance_credit
-
-    if inputs.regime == "Micro BIC":
-        revenu_imposable = loyer_annuel * 0.5
-        impot = calcul_impot_ir(revenu_imposable, inputs)
-        return {"impot": impot, "cashflow": revenu_net - impot}
-
-    elif inputs.regime == "Micro foncier":
-        revenu_imposable = loyer_annuel * 0.7
-        impot = calcul_impot_ir(revenu_imposable, inputs)
-        return {"impot": impot, "cashflow": revenu_net - impot}
-
-    elif inputs.regime in ["LMNP réel", "LMP réel", "SARL de famille"]:
-        revenu_net_bic = revenu_net - total_amortissements
-        impot = 0 if revenu_net_bic < 0 else calcul_impot_ir(revenu_net_bic, inputs)
-        return {"impot": impot, "cashflow": revenu_net - impot}
-
-    elif inputs.regime in ["Location nue réel", "SCI à l'IR"]:
-        revenu_foncier = revenu_net
-        if revenu_foncier < -10700:
-            revenu_foncier = -10700
-        impot = calcul_impot_ir(revenu_foncier, inputs)
-        return {"impot": impot, "cashflow": revenu_net - impot}
-
-    elif inputs.regime in ["SCI à l'IS", "Holding à l'IS"]:
-        benefice = revenu_net - total_amortissements
-        impot = 0 if benefice < 0 else calcul_impot_is(benefice)
-        return {"impot": impot, "cashflow": revenu_net - impot}
-
-    else:
-        raise ValueError("Régime inconnu")
+async def executer(fonction, *args):
+    """Calcul délégué à l'exécuteur : 429 si la file est pleine, 504 si le délai expire."""
+    try:
+        return await executeur.soumettre(fonction, *args)
+    except FileSaturee as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except DelaiDepasse as e:
+        raise HTTPException(status_code=504, detail=str(e))
 
 
 @app.post("/simulate")
-def simulate_endpoint(inputs: SimulationInputs):
-    result = simulate(inputs)
+async def simulate_endpoint(inputs: SimulationInputs):
+    donnees = inputs.model_dump() if hasattr(inputs, "model_dump") else inputs.dict()
+    cle = empreinte_canonique(["simulate", donnees])
+
+    trouve, result = cache_reponses.lire(cle)
+    if trouve:
+        return result
+    # Accès SQLite bloquants : exécutés dans un thread, hors de la boucle d'événements
+    if cache_disque is not None:
+        trouve, result = await anyio.to_thread.run_sync(cache_disque.lire, cle)
+        if trouve:
+            cache_reponses.ecrire(cle, result)
+            return result
+
+    try:
+        result = await executer(simulate, inputs)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    cache_reponses.ecrire(cle, result)
+    if cache_disque is not None:
+        await anyio.to_thread.run_sync(cache_disque.ecrire, cle, result)
     return result
+
+
+@app.get("/simulate/cache")
+def statistiques_cache():
+    return {
+        "memoire": cache_reponses.statistiques(),
+        "disque": cache_disque.statistiques() if cache_disque is not None else None,
+    }
+
+
+def lignes_du_lot(lot):
+    """Entrées d'un lot, envoyé en liste d'objets ou en colonnes {champ: [valeurs]}."""
+    if isinstance(lot, list):
+        return lot
+    if len({len(valeurs) for valeurs in lot.values()}) > 1:
+        raise HTTPException(status_code=422, detail="Colonnes de longueurs différentes")
+    return [dict(zip(lot, valeurs)) for valeurs in zip(*lot.values())]
+
+
+COLONNES_RESULTAT = ("impot", "cashflow") + INDICATEURS_RENDEMENT
+
+
+def _nombre_ou_null(valeur):
+    # TRI indéfini (flux sans changement de signe) → null
+    return None if np.isnan(valeur) else float(valeur)
+
+
+def simuler_lignes(lignes):
+    """Résultats (ou erreurs) d'une liste d'entrées brutes, dans l'ordre des entrées."""
+    resultats = [None] * len(lignes)
+
+    # Validation en une passe : une entrée invalide n'interrompt pas le lot
+    entrees, positions = [], []
+    for i, ligne in enumerate(lignes):
+        if not isinstance(ligne, dict):
+            resultats[i] = {"erreur": ligne.message if isinstance(ligne, LigneInvalide) else "Objet JSON attendu"}
+            continue
+        try:
+            entrees.append(SimulationInputs(**ligne))
+            positions.append(i)
+        except ValidationError as e:
+            resultats[i] = {"erreur": [{"loc": list(err["loc"]), "msg": err["msg"]} for err in e.errors()]}
+
+    calcul = simuler_lot(colonnes_simulation(entrees))
+    for j, i in enumerate(positions):
+        if calcul["erreurs"][j] is not None:
+            resultats[i] = {"erreur": calcul["erreurs"][j]}
+        else:
+            resultats[i] = {
+                nom: _nombre_ou_null(calcul[nom][j]) for nom in COLONNES_RESULTAT
+            }
+
+    return resultats
+
+
+@app.post("/simulate/batch")
+async def simulate_batch_endpoint(lot: Union[List[Dict[str, Any]], Dict[str, List[Any]]] = Body(...)):
+    return {"resultats": await executer(simuler_lignes, lignes_du_lot(lot))}
+
+
+# --------------------------------------------------------------------------------
+# FLUX NDJSON
+# --------------------------------------------------------------------------------
+TAILLE_MORCEAU = 1000
+
+
+class LigneInvalide:
+    def __init__(self, message):
+        self.message = message
+
+
+def _decoder_ligne(brute):
+    try:
+        return json.loads(brute)
+    except ValueError:
+        return LigneInvalide("JSON invalide")
+
+
+async def _morceaux_ndjson(flux, taille):
+    """Regroupe les lignes NDJSON d'un flux d'octets par paquets de `taille` entrées."""
+    reste = b""
+    morceau = []
+    async for octets in flux:
+        *completes, reste = (reste + octets).split(b"\n")
+        for brute in completes:
+            if brute.strip():
+                morceau.append(_decoder_ligne(brute))
+                if len(morceau) == taille:
+                    yield morceau
+                    morceau = []
+    if reste.strip():
+        morceau.append(_decoder_ligne(reste))
+    if morceau:
+        yield morceau
+
+
+class ReponseNDJSON(StreamingResponse):
+    """Réponse en flux qui laisse la lecture du corps à la requête.
+
+    Sans serveur ASGI 2.4, la réponse standard lit `receive` en parallèle pour
+    détecter la déconnexion du client et consommerait le corps encore en
+    cours de lecture ; la déconnexion remonte ici par `request.stream()`.
+    """
+    media_type = "application/x-ndjson"
+
+    async def listen_for_disconnect(self, receive):
+        await anyio.sleep_forever()
+
+
+@app.post("/simulate/stream")
+async def simulate_stream_endpoint(request: Request):
+    """Une entrée JSON par ligne en entrée, un résultat JSON par ligne en sortie.
+
+    Le lot est traité par morceaux de TAILLE_MORCEAU entrées : chaque morceau
+    est renvoyé dès qu'il est calculé et la mémoire reste bornée quelle que
+    soit la taille du lot.
+    """
+    if executeur.sature():
+        raise HTTPException(status_code=429, detail="File de calcul saturée", headers={"Retry-After": "1"})
+
+    async def resultats():
+        async for morceau in _morceaux_ndjson(request.stream(), TAILLE_MORCEAU):
+            # Le statut HTTP est déjà parti : un morceau refusé est signalé ligne par ligne
+            try:
+                calcules = await executeur.soumettre(simuler_lignes, morceau)
+            except (FileSaturee, DelaiDepasse) as e:
+                calcules = [{"erreur": str(e)}] * len(morceau)
+            yield "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in calcules)
+
+    return ReponseNDJSON(resultats())
+
+
+# --------------------------------------------------------------------------------
+# LOTS EN COLONNES (JSON, MSGPACK, ARROW)
+# --------------------------------------------------------------------------------
+def _type_colonne(annotation):
+    if annotation is str:
+        return "texte"
+    if annotation is float:
+        return "reel"
+    if annotation is int:
+        return "entier"
+    if annotation == Optional[float]:
+        return "reel_optionnel"
+    if annotation == Optional[int]:
+        return "entier_optionnel"
+    raise TypeError(f"Type de champ non géré en colonnes : {annotation}")
+
+
+# Schéma des colonnes dérivé du modèle, qui reste la seule définition des champs
+TYPES_COLONNES = {nom: _type_colonne(annotation) for nom, annotation in SimulationInputs.__annotations__.items()}
+
+FORMAT_JSON = "application/json"
+FORMAT_MSGPACK = "application/msgpack"
+FORMAT_ARROW = "application/vnd.apache.arrow.stream"
+FORMATS_COLONNES = (FORMAT_JSON, FORMAT_MSGPACK, FORMAT_ARROW)
+
+
+def lire_colonnes(corps, format_):
+    """Colonnes {champ: valeurs} d'un corps de requête ; msgpack et pyarrow sont optionnels."""
+    if format_ == FORMAT_MSGPACK:
+        import msgpack
+        return msgpack.unpackb(corps)
+    if format_ == FORMAT_ARROW:
+        import pyarrow as pa
+        table = pa.ipc.open_stream(corps).read_all()
+        return {nom: table.column(nom).to_numpy(zero_copy_only=False) for nom in table.column_names}
+    return json.loads(corps)
+
+
+def ecrire_colonnes(resultats, format_):
+    if format_ == FORMAT_ARROW:
+        import pyarrow as pa
+        erreurs = [e if e is None or isinstance(e, str) else json.dumps(e, ensure_ascii=False)
+                   for e in resultats["erreurs"]]
+        table = pa.table({
+            **{nom: pa.array(resultats[nom], from_pandas=True) for nom in COLONNES_RESULTAT},
+            "erreur": pa.array(erreurs, type=pa.string()),
+        })
+        puits = pa.BufferOutputStream()
+        with pa.ipc.new_stream(puits, table.schema) as flux:
+            flux.write_table(table)
+        return puits.getvalue().to_pybytes()
+
+    # NaN (entrée en erreur, TRI indéfini) → null
+    colonnes = {
+        **{nom: np.where(np.isnan(resultats[nom]), None, resultats[nom]).tolist() for nom in COLONNES_RESULTAT},
+        "erreur": resultats["erreurs"],
+    }
+    if format_ == FORMAT_MSGPACK:
+        import msgpack
+        return msgpack.packb(colonnes)
+    return json.dumps(colonnes, ensure_ascii=False).encode("utf-8")
+
+
+@app.post("/simulate/columns")
+async def simulate_columns_endpoint(request: Request):
+    """Lot en colonnes : une liste de valeurs par champ, résultats renvoyés en colonnes.
+
+    Le format suit le Content-Type (JSON, msgpack ou flux Arrow IPC) et la
+    réponse utilise le même. Les entrées sont validées colonne par colonne :
+    aucun objet n'est construit par entrée.
+    """
+    format_ = request.headers.get("content-type", FORMAT_JSON).split(";")[0].strip()
+    if format_ not in FORMATS_COLONNES:
+        raise HTTPException(status_code=415, detail=f"Formats acceptés : {', '.join(FORMATS_COLONNES)}")
+    try:
+        colonnes = lire_colonnes(await request.body(), format_)
+    except ImportError as e:
+        raise HTTPException(status_code=415, detail=f"Format {format_} indisponible sur ce serveur ({e.name})")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Corps de requête illisible")
+    if not isinstance(colonnes, dict):
+        raise HTTPException(status_code=422, detail="Objet {champ: [valeurs]} attendu")
+
+    try:
+        resultats = await executer(simuler_colonnes, colonnes, TYPES_COLONNES, DEFAUTS_RENDEMENT)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return Response(ecrire_colonnes(resultats, format_), media_type=format_)
+
+
+# --------------------------------------------------------------------------------
+# FOYER FISCAL : PLUSIEURS BIENS, UNE SEULE TMI
+# --------------------------------------------------------------------------------
+# Contributions des biens indexées par leur empreinte : renvoyer le foyer avec
+# un bien modifié ne resimule que ce bien
+cache_biens = CacheLRU(taille_max=int(os.environ.get("LEXYO_CACHE_TAILLE", 4096)), ttl=_ttl_cache)
+
+
+class FoyerInputs(BaseModel):
+    revenu_annuel_global: float
+    nombre_parts: float
+    horizon: int = Field(DEFAUTS_RENDEMENT["horizon"], ge=1, le=HORIZON_MAX)
+    # Un objet par bien : "regime" (libellé de la page) et les champs du régime
+    biens: List[Dict[str, Any]]
+
+
+def contributions_biens(lignes, horizon):
+    # Horizon du foyer imposé à tous les biens
+    return [contribution_bien(construire_simulation({**ligne, "horizon": horizon}, horizon)) for ligne in lignes]
+
+
+@app.post("/foyer")
+async def foyer_endpoint(inputs: FoyerInputs):
+    """Imposition commune de plusieurs biens : TMI, IR et cashflow du foyer par année."""
+    cles = [empreinte_canonique(["bien", ligne, inputs.horizon]) for ligne in inputs.biens]
+    contributions = [cache_biens.lire(cle) for cle in cles]
+    manquants = [i for i, (trouve, _) in enumerate(contributions) if not trouve]
+    try:
+        # Foyer entièrement en cache : aucune place prise dans la file de calcul
+        if manquants:
+            calcules = await executer(contributions_biens, [inputs.biens[i] for i in manquants], inputs.horizon)
+            for i, contribution in zip(manquants, calcules):
+                cache_biens.ecrire(cles[i], contribution)
+                contributions[i] = (True, contribution)
+        synthese = synthese_foyer(
+            [contribution for _, contribution in contributions], inputs.revenu_annuel_global, inputs.nombre_parts
+        )
+    except (ValueError, TypeError, ZeroDivisionError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {
+        "biens_recalcules": len(manquants),
+        **{champ.name: getattr(synthese, champ.name).tolist() for champ in fields(synthese)},
+    }
@@ -0,0 +1,156 @@
+"""Cœur de calcul Lexyo : NumPy uniquement, sans Streamlit ni matplotlib.
+
+pandas n'est importé qu'à la construction des tableaux de résultats.
+
+Temps d'import : celui de NumPy (60 à 90 ms selon la machine), que
+l'interface et l'API chargent de toute façon, plus 50 à 75 ms pour le cœur
+lui-même, surtout la génération des dix dataclasses de régimes. L'objectif
+est donc un cœur sous 100 ms en plus de NumPy, et non un import à froid
+sous 100 ms : NumPy n'est pas chargé à la demande.
+"""
+from .cache import CacheLRU, CacheSQLite, empreinte_canonique
+from .comparaison import comparer_regimes
+from .deficits import ReportDeficits, imputer_deficits
+from .emprunt import (
+    COLONNES_EMPRUNT,
+    Echeancier,
+    EcheancierAnnuel,
+    EcheancierLot,
+    cache_echeanciers,
+    capital_apres_differe,
+    echeancier_annuel,
+    echeancier_emprunt,
+    echeancier_lot,
+    echeancier_lot_table,
+    indemnites_remboursement_anticipe,
+    interets_differe,
+    mensualite_emprunt,
+)
+from .finance import Rendement, rendement, tri, van
+from .foyer import (
+    PLAFOND_DEFICIT_FONCIER,
+    PLAFOND_MICRO_BIC,
+    PLAFOND_MICRO_FONCIER,
+    ContributionBien,
+    Foyer,
+    SyntheseFoyer,
+    bareme_ir,
+    contribution_bien,
+    synthese_foyer,
+)
+from .identifiants import Identifiants, hacher_mot_de_passe
+from .monte_carlo import HypothesesMonteCarlo, Loi, ResultatMonteCarlo, simuler_monte_carlo
+from .objectif import SolutionObjectif, resoudre_objectif
+from .plus_value import (
+    ABATTEMENT_IR,
+    ABATTEMENT_LONG_TERME,
+    ABATTEMENT_PS,
+    PlusValue,
+    plus_value_particulier,
+    plus_value_professionnelle,
+    plus_value_societe,
+)
+from .regimes import (
+    HORIZON_MAX,
+    REGIMES,
+    HoldingIS,
+    LMNPReel,
+    LMPReel,
+    LocationNue,
+    MicroBIC,
+    MicroFoncier,
+    ReelFoncier,
+    SARLDeFamille,
+    SCIaIR,
+    SCIaIS,
+    flux_rendement,
+    rendement_simulation,
+    verifier_horizon,
+)
+from .revente import MatriceRevente, matrice_revente
+from .sensibilite import GrilleSensibilite, grille_sensibilite
+from .simulation import (
+    colonnes_simulation,
+    rendement_lot,
+    simulate,
+    simuler_colonnes,
+    simuler_lot,
+    valider_colonnes,
+)
+from .statistiques import StatistiquesFlux
+
+__all__ = [
+    "ABATTEMENT_IR",
+    "ABATTEMENT_LONG_TERME",
+    "ABATTEMENT_PS",
+    "COLONNES_EMPRUNT",
+    "HORIZON_MAX",
+    "PLAFOND_DEFICIT_FONCIER",
+    "PLAFOND_MICRO_BIC",
+    "PLAFOND_MICRO_FONCIER",
+    "REGIMES",
+    "CacheLRU",
+    "CacheSQLite",
+    "ContributionBien",
+    "Echeancier",
+    "EcheancierAnnuel",
+    "EcheancierLot",
+    "Foyer",
+    "GrilleSensibilite",
+    "HoldingIS",
+    "HypothesesMonteCarlo",
+    "Identifiants",
+    "LMNPReel",
+    "LMPReel",
+    "LocationNue",
+    "Loi",
+    "MatriceRevente",
+    "MicroBIC",
+    "MicroFoncier",
+    "PlusValue",
+    "ReelFoncier",
+    "Rendement",
+    "ReportDeficits",
+    "ResultatMonteCarlo",
+    "SARLDeFamille",
+    "SCIaIR",
+    "SCIaIS",
+    "SolutionObjectif",
+    "StatistiquesFlux",
+    "SyntheseFoyer",
+    "bareme_ir",
+    "cache_echeanciers",
+    "capital_apres_differe",
+    "colonnes_simulation",
+    "comparer_regimes",
+    "contribution_bien",
+    "echeancier_annuel",
+    "echeancier_emprunt",
+    "echeancier_lot",
+    "echeancier_lot_table",
+    "empreinte_canonique",
+    "flux_rendement",
+    "grille_sensibilite",
+    "hacher_mot_de_passe",
+    "imputer_deficits",
+    "indemnites_remboursement_anticipe",
+    "interets_differe",
+    "matrice_revente",
+    "mensualite_emprunt",
+    "plus_value_particulier",
+    "plus_value_professionnelle",
+    "plus_value_societe",
+    "rendement",
+    "rendement_lot",
+    "rendement_simulation",
+    "resoudre_objectif",
+    "simulate",
+    "simuler_colonnes",
+    "simuler_lot",
+    "simuler_monte_carlo",
+    "synthese_foyer",
+    "tri",
+    "valider_colonnes",
+    "van",
+    "verifier_horizon",
+]
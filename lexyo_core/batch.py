@@ -0,0 +1,319 @@
+"""lexyo-batch : simule un portefeuille de biens (CSV ou Parquet) avec les régimes Lexyo.
+
+    python -m lexyo_core.batch portefeuille.csv projections.parquet
+
+Une ligne par bien, avec une colonne `regime` (libellé du menu Streamlit) et
+les champs du régime correspondant ; les champs absents prennent leur valeur
+par défaut. Écrit les projections annuelles (format long : ligne, regime,
+annee, indicateur, valeur) et une synthèse par bien (`*_synthese.parquet`),
+avec le TRI, la VAN, le cash-on-cash et le multiple de l'apport (revente au
+prix d'achat, ou à la colonne facultative `valeur_revente`).
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import MISSING, fields
+
+import numpy as np
+
+from . import finance
+from .regimes import REGIMES, flux_rendement, indicateurs_annuels
+from .sensibilite import CHAMPS_NON_VARIABLES
+
+
+# --------------------------------------------------------------------------------
+# SIMULATION D'UNE LIGNE
+# --------------------------------------------------------------------------------
+def _absent(valeur):
+    return valeur is None or (isinstance(valeur, float) and math.isnan(valeur))
+
+
+def _convertir(valeur, type_champ):
+    if type_champ is bool:
+        return valeur if isinstance(valeur, bool) else str(valeur).strip().lower() in ("1", "true", "vrai", "oui")
+    if type_champ is int:
+        # int() tronquerait 19.7 en 19 : seule une valeur entière est acceptée
+        reel = float(valeur)
+        if not reel.is_integer():
+            raise ValueError(f"Entier attendu : {valeur!r}")
+        return int(reel)
+    return float(valeur)
+
+
+def parametres_ligne(ligne, horizon):
+    """(classe, paramètres complets) d'une ligne ; ValueError si le régime ou un champ obligatoire manque."""
+    classe = REGIMES.get(ligne.get("regime"))
+    if classe is None:
+        raise ValueError(f"Régime inconnu : {ligne.get('regime')!r}")
+    parametres = {}
+    for champ in fields(classe):
+        if not champ.init:
+            continue
+        valeur = ligne.get(champ.name)
+        if _absent(valeur):
+            if champ.name == "horizon":
+                valeur = horizon
+            elif champ.default is not MISSING:
+                valeur = champ.default
+            elif champ.default_factory is not MISSING:
+                valeur = champ.default_factory()
+            else:
+                raise ValueError(f"Champ manquant : {champ.name}")
+        parametres[champ.name] = _convertir(valeur, champ.type)
+    return classe, parametres
+
+
+def construire_simulation(ligne, horizon):
+    """Instance du régime de la ligne ; ValueError si le régime ou un champ obligatoire manque."""
+    classe, parametres = parametres_ligne(ligne, horizon)
+    return classe(**parametres)
+
+
+INDICATEURS_RENDEMENT = ("tri", "van", "cash_on_cash", "multiple")
+
+
+def _par_ligne(valeur, n):
+    # Paramètre ou résultat d'un lot, de forme (n, 1), scalaire ou non : une valeur par ligne
+    valeur = np.asarray(valeur, dtype=float)
+    return np.broadcast_to(valeur[..., 0] if valeur.ndim else valeur, (n,))
+
+
+def _sorties(simulation, regime, numeros, valeur_revente, taux_actualisation):
+    # Projections (format long) et synthèse d'une simulation : en lot, une
+    # ligne du morceau par scénario ; sinon une seule
+    n = len(numeros)
+    resultats = simulation.resultat_fiscal_annuel()
+    indicateurs = indicateurs_annuels(simulation)
+    colonnes = [
+        colonne for colonne in resultats
+        if colonne != "Année" and np.issubdtype(np.asarray(resultats[colonne]).dtype, np.number)
+    ]
+    valeurs = np.stack([np.atleast_2d(np.asarray(resultats[c], dtype=float)) for c in colonnes], axis=1)
+    annees = np.atleast_2d(indicateurs["annee"])[0]
+    projections = {
+        "ligne": np.repeat(numeros, len(colonnes) * len(annees)),
+        "regime": np.full(valeurs.size, regime, dtype=object),
+        "annee": np.tile(annees, n * len(colonnes)),
+        "indicateur": np.tile(np.repeat(np.array(colonnes, dtype=object), len(annees)), n),
+        "valeur": valeurs.ravel(),
+    }
+
+    cashflows = np.atleast_2d(indicateurs["cashflow_mensuel"])
+    impots = np.broadcast_to(np.atleast_2d(indicateurs["impots"]), cashflows.shape)
+    montants = _par_ligne(simulation.montant_emprunt, n)
+    mensualites = _par_ligne(simulation.mensualite_emprunt(), n)
+    synthese = [
+        {
+            "ligne": int(numero),
+            "regime": regime,
+            "erreur": None,
+            "horizon": int(simulation.horizon),
+            "montant_emprunt": float(montant),
+            "mensualite_emprunt": float(mensualite),
+            "cashflow_mensuel_an1": float(cashflow[0]),
+            "cashflow_mensuel_moyen": float(cashflow.mean()),
+            "cashflow_cumule": float((cashflow * 12).sum()),
+            "impots_cumules": float(impot.sum()),
+        }
+        for numero, montant, mensualite, cashflow, impot in zip(numeros, montants, mensualites, cashflows, impots)
+    ]
+    if hasattr(simulation, "apport"):
+        apport, cashflows_annuels, valeur_finale = flux_rendement(simulation, valeur_revente)
+        rendements = finance.rendement(
+            np.atleast_1d(apport), np.atleast_2d(cashflows_annuels), np.atleast_1d(valeur_finale), taux_actualisation
+        )
+        for nom in INDICATEURS_RENDEMENT:
+            for ligne, valeur in zip(synthese, getattr(rendements, nom)):
+                ligne[nom] = float(valeur) if np.isfinite(valeur) else None
+    return projections, synthese
+
+
+def _simuler_ligne(numero, ligne, horizon, taux_actualisation):
+    # Calcul scalaire d'une seule ligne : les erreurs (division par zéro,
+    # durée incohérente...) sont celles de l'instance du régime
+    regime = ligne.get("regime")
+    try:
+        simulation = construire_simulation(ligne, horizon)
+        revente = ligne.get("valeur_revente")
+        return _sorties(simulation, regime, [numero], None if _absent(revente) else float(revente),
+                        taux_actualisation)
+    except (ValueError, TypeError, ZeroDivisionError) as e:
+        return None, [{"ligne": numero, "regime": regime, "erreur": str(e)}]
+
+
+def _simuler_groupe(classe, numeros, lignes, parametres, horizon, taux_actualisation):
+    # Lignes d'un même régime (et de même horizon) en un calcul vectorisé :
+    # paramètres empilés en tableaux (lignes, 1), sauf les champs de forme.
+    # Un lot ne lève pas d'erreur pour une division par zéro (il renvoie inf,
+    # parfois masqué ensuite) : toute erreur numérique coupe le groupe en deux,
+    # jusqu'à recalculer seule la ligne fautive.
+    try:
+        lot = {
+            nom: valeur if nom in CHAMPS_NON_VARIABLES else np.array([p[nom] for p in parametres])[:, np.newaxis]
+            for nom, valeur in parametres[0].items()
+        }
+        revente = np.array([
+            np.nan if _absent(ligne.get("valeur_revente")) else float(ligne["valeur_revente"]) for ligne in lignes
+        ])[:, np.newaxis]
+        if "prix_bien" in lot:
+            revente = np.where(np.isnan(revente), lot["prix_bien"], revente)
+        with np.errstate(divide="raise", over="raise", invalid="raise"):
+            return [_sorties(classe(**lot), lignes[0].get("regime"), np.asarray(numeros), revente, taux_actualisation)]
+    except (ValueError, TypeError, ZeroDivisionError, FloatingPointError):
+        if len(lignes) == 1:
+            return [_simuler_ligne(numeros[0], lignes[0], horizon, taux_actualisation)]
+        milieu = len(lignes) // 2
+        return (
+            _simuler_groupe(classe, numeros[:milieu], lignes[:milieu], parametres[:milieu], horizon, taux_actualisation)
+            + _simuler_groupe(classe, numeros[milieu:], lignes[milieu:], parametres[milieu:], horizon,
+                              taux_actualisation)
+        )
+
+
+def simuler_morceau(lignes, premiere_ligne, horizon, taux_actualisation=0.05):
+    """Projections (colonnes du format long) et synthèse d'un morceau de portefeuille.
+
+    Les lignes d'un même régime et d'un même horizon sont simulées ensemble,
+    en un seul calcul vectorisé ; une ligne en erreur est recalculée seule,
+    pour rapporter l'erreur du régime comme en calcul ligne à ligne.
+    """
+    synthese = [None] * len(lignes)
+    blocs = []
+    groupes = {}
+    for decalage, ligne in enumerate(lignes):
+        try:
+            classe, parametres = parametres_ligne(ligne, horizon)
+        except (ValueError, TypeError) as e:
+            synthese[decalage] = {"ligne": premiere_ligne + decalage, "regime": ligne.get("regime"), "erreur": str(e)}
+            continue
+        cle = (classe, *(parametres.get(nom) for nom in CHAMPS_NON_VARIABLES))
+        groupes.setdefault(cle, []).append((decalage, parametres))
+
+    for (classe, *_), groupe in groupes.items():
+        decalages = [decalage for decalage, _ in groupe]
+        for bloc, lignes_synthese in _simuler_groupe(
+            classe, [premiere_ligne + d for d in decalages], [lignes[d] for d in decalages],
+            [parametres for _, parametres in groupe], horizon, taux_actualisation,
+        ):
+            if bloc is not None:
+                blocs.append(bloc)
+            for ligne_synthese in lignes_synthese:
+                synthese[ligne_synthese["ligne"] - premiere_ligne] = ligne_synthese
+
+    if not blocs:
+        return {nom: [] for nom in ("ligne", "regime", "annee", "indicateur", "valeur")}, synthese
+    projections = {nom: np.concatenate([bloc[nom] for bloc in blocs]) for nom in blocs[0]}
+    ordre = np.argsort(projections["ligne"], kind="stable")
+    return {nom: colonne[ordre] for nom, colonne in projections.items()}, synthese
+
+
+# --------------------------------------------------------------------------------
+# LECTURE PAR MORCEAUX ET ÉCRITURE PARQUET
+# --------------------------------------------------------------------------------
+def lire_morceaux(chemin, taille):
+    """Listes de dictionnaires de `taille` lignes au plus, sans charger tout le fichier."""
+    if chemin.lower().endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+        for lot in pq.ParquetFile(chemin).iter_batches(batch_size=taille):
+            yield lot.to_pylist()
+    else:
+        import pandas as pd
+        for morceau in pd.read_csv(chemin, chunksize=taille):
+            yield morceau.to_dict("records")
+
+
+def _schemas():
+    import pyarrow as pa
+    projections = pa.schema([
+        ("ligne", pa.int64()), ("regime", pa.string()), ("annee", pa.int64()),
+        ("indicateur", pa.string()), ("valeur", pa.float64()),
+    ])
+    synthese = pa.schema([
+        ("ligne", pa.int64()), ("regime", pa.string()), ("erreur", pa.string()),
+        ("horizon", pa.int64()), ("montant_emprunt", pa.float64()),
+        ("mensualite_emprunt", pa.float64()), ("cashflow_mensuel_an1", pa.float64()),
+        ("cashflow_mensuel_moyen", pa.float64()), ("cashflow_cumule", pa.float64()),
+        ("impots_cumules", pa.float64()),
+        *[(nom, pa.float64()) for nom in INDICATEURS_RENDEMENT],
+    ])
+    return projections, synthese
+
+
+def executer_lot(entree, sortie, synthese=None, horizon=10, taille_morceau=1000, workers=None,
+                 progression=None, taux_actualisation=0.05):
+    """Simule tout le portefeuille ; renvoie (lignes traitées, lignes en erreur).
+
+    Les morceaux sont répartis sur un pool de processus ; au plus deux
+    morceaux par processus sont en vol, ce qui borne la mémoire, et les
+    résultats sont écrits dans l'ordre du fichier d'entrée.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    synthese = synthese or os.path.splitext(sortie)[0] + "_synthese.parquet"
+    workers = workers or os.cpu_count() or 1
+    schema_projections, schema_synthese = _schemas()
+    traitees = erreurs = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            pq.ParquetWriter(sortie, schema_projections) as ecrivain_projections, \
+            pq.ParquetWriter(synthese, schema_synthese) as ecrivain_synthese:
+        en_vol = deque()
+
+        def ecrire_premier():
+            nonlocal traitees, erreurs
+            projections, lignes_synthese = en_vol.popleft().result()
+            ecrivain_projections.write_table(pa.table(projections, schema=schema_projections))
+            ecrivain_synthese.write_table(pa.Table.from_pylist(lignes_synthese, schema=schema_synthese))
+            traitees += len(lignes_synthese)
+            erreurs += sum(1 for ligne in lignes_synthese if ligne["erreur"] is not None)
+            if progression is not None:
+                progression(traitees, erreurs)
+
+        premiere_ligne = 0
+        for morceau in lire_morceaux(entree, taille_morceau):
+            en_vol.append(pool.submit(simuler_morceau, morceau, premiere_ligne, horizon, taux_actualisation))
+            premiere_ligne += len(morceau)
+            if len(en_vol) >= 2 * workers:
+                ecrire_premier()
+        while en_vol:
+            ecrire_premier()
+
+    return traitees, erreurs
+
+
+# --------------------------------------------------------------------------------
+# LIGNE DE COMMANDE
+# --------------------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="lexyo-batch", description=__doc__.splitlines()[0])
+    parser.add_argument("entree", help="portefeuille CSV ou Parquet")
+    parser.add_argument("sortie", help="fichier Parquet des projections annuelles")
+    parser.add_argument("--synthese", help="fichier Parquet de synthèse (défaut : <sortie>_synthese.parquet)")
+    parser.add_argument("--horizon", type=int, default=10, help="horizon des lignes sans colonne horizon")
+    parser.add_argument("--taille-morceau", type=int, default=1000, help="lignes lues par morceau")
+    parser.add_argument("--workers", type=int, help="processus (défaut : nombre de cœurs)")
+    parser.add_argument("--taux-actualisation", type=float, default=0.05, help="taux de la VAN (0.05 = 5 %%)")
+    args = parser.parse_args(argv)
+
+    debut = time.perf_counter()
+
+    def progression(traitees, erreurs):
+        debit = traitees / max(time.perf_counter() - debut, 1e-9)
+        print(f"\r{traitees} lignes traitées, {erreurs} en erreur ({debit:,.0f} lignes/s)",
+              end="", file=sys.stderr, flush=True)
+
+    traitees, erreurs = executer_lot(
+        args.entree, args.sortie, args.synthese, args.horizon,
+        args.taille_morceau, args.workers, progression, args.taux_actualisation,
+    )
+    print(f"\nTerminé : {traitees} lignes en {time.perf_counter() - debut:.1f} s", file=sys.stderr)
+    return 1 if erreurs and erreurs == traitees else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
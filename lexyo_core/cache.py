@@ -0,0 +1,163 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def empreinte_canonique(donnees):
+    """Empreinte SHA-256 stable d'une structure JSON (ordre des clés indifférent)."""
+    texte = json.dumps(donnees, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(texte.encode("utf-8")).hexdigest()
+
+
+# --------------------------------------------------------------------------------
+# CACHE LRU PARTAGÉ PAR LE PROCESSUS
+# --------------------------------------------------------------------------------
+class CacheLRU:
+    """Cache borné, sûr entre threads, qui évince l'entrée la moins récemment utilisée.
+
+    Les valeurs sont partagées entre tous les appelants (et donc entre les
+    sessions Streamlit) : elles doivent être traitées en lecture seule. Avec
+    `ttl` (en secondes), une entrée plus ancienne est recalculée.
+    """
+
+    def __init__(self, taille_max=512, ttl=None):
+        if taille_max < 1:
+            raise ValueError("taille_max doit être au moins 1")
+        self.taille_max = taille_max
+        self.ttl = ttl
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def lire(self, cle):
+        """(True, valeur) si la clé est présente et encore valide, sinon (False, None)."""
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None:
+                valeur, expiration = entree
+                if expiration is None or expiration > time.monotonic():
+                    self._entrees.move_to_end(cle)
+                    self.succes += 1
+                    return True, valeur
+                del self._entrees[cle]
+                self.expirations += 1
+            self.echecs += 1
+            return False, None
+
+    def ecrire(self, cle, valeur):
+        expiration = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._verrou:
+            self._entrees[cle] = (valeur, expiration)
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+                self.evictions += 1
+
+    def obtenir(self, cle, calcul):
+        trouve, valeur = self.lire(cle)
+        if trouve:
+            return valeur
+
+        # Calcul hors du verrou : deux threads peuvent calculer la même clé,
+        # le résultat est identique et le second écrase simplement le premier.
+        valeur = calcul()
+        self.ecrire(cle, valeur)
+        return valeur
+
+    def vider(self):
+        with self._verrou:
+            self._entrees.clear()
+            self.succes = self.echecs = self.evictions = self.expirations = 0
+
+    def statistiques(self):
+        with self._verrou:
+            total = self.succes + self.echecs
+            return {
+                "taille": len(self._entrees),
+                "taille_max": self.taille_max,
+                "ttl": self.ttl,
+                "succes": self.succes,
+                "echecs": self.echecs,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "taux_succes": self.succes / total if total else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._entrees)
+
+
+# --------------------------------------------------------------------------------
+# SECOND NIVEAU PERSISTANT (SQLITE)
+# --------------------------------------------------------------------------------
+class CacheSQLite:
+    """Cache de valeurs JSON sur disque, conservé entre deux redémarrages.
+
+    Les clés sont des chaînes (typiquement `empreinte_canonique`) ; `ttl`
+    s'exprime en secondes d'horloge murale pour rester valable d'un
+    processus à l'autre.
+    """
+
+    def __init__(self, chemin, ttl=None):
+        self.chemin = chemin
+        self.ttl = ttl
+        self._connexion = sqlite3.connect(chemin, check_same_thread=False, isolation_level=None)
+        self._connexion.execute("PRAGMA journal_mode=WAL")
+        self._connexion.execute(
+            "CREATE TABLE IF NOT EXISTS cache (cle TEXT PRIMARY KEY, valeur TEXT NOT NULL, expiration REAL)"
+        )
+        self._verrou = threading.Lock()
+        self.succes = 0
+        self.echecs = 0
+        self.expirations = 0
+
+    def lire(self, cle):
+        with self._verrou:
+            ligne = self._connexion.execute(
+                "SELECT valeur, expiration FROM cache WHERE cle = ?", (cle,)
+            ).fetchone()
+            if ligne is not None:
+                valeur, expiration = ligne
+                if expiration is None or expiration > time.time():
+                    self.succes += 1
+                    return True, json.loads(valeur)
+                self._connexion.execute("DELETE FROM cache WHERE cle = ?", (cle,))
+                self.expirations += 1
+            self.echecs += 1
+            return False, None
+
+    def ecrire(self, cle, valeur):
+        expiration = time.time() + self.ttl if self.ttl is not None else None
+        with self._verrou:
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO cache (cle, valeur, expiration) VALUES (?, ?, ?)",
+                (cle, json.dumps(valeur), expiration),
+            )
+
+    def vider(self):
+        with self._verrou:
+            self._connexion.execute("DELETE FROM cache")
+            self.succes = self.echecs = self.expirations = 0
+
+    def statistiques(self):
+        with self._verrou:
+            taille = self._connexion.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            total = self.succes + self.echecs
+            return {
+                "taille": taille,
+                "ttl": self.ttl,
+                "succes": self.succes,
+                "echecs": self.echecs,
+                "expirations": self.expirations,
+                "taux_succes": self.succes / total if total else 0.0,
+            }
+
+    def fermer(self):
+        with self._verrou:
+            self._connexion.close()
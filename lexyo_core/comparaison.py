@@ -0,0 +1,100 @@
+from dataclasses import MISSING, fields
+
+import numpy as np
+
+from . import emprunt, finance
+from .regimes import REGIMES, MicroBIC, MicroFoncier, cout_acquisition, indicateurs_annuels
+
+# Champs qui désignent la même saisie sous des noms différents selon les régimes
+ALIAS_CHAMPS = {
+    "assurance_habitation": "assurance_pno",
+    "assurance": "assurance_pno",
+    "frais_gestion": "gestion_locative",
+}
+
+
+# --------------------------------------------------------------------------------
+# COMPARAISON DE TOUS LES RÉGIMES
+# --------------------------------------------------------------------------------
+def eligible(simulation):
+    """Faux pour un régime micro dont les recettes dépassent le plafond (micro-BIC, micro-foncier)."""
+    if isinstance(simulation, MicroBIC):
+        return simulation.revenus_annuels() <= simulation.plafond_microbic
+    if isinstance(simulation, MicroFoncier):
+        return simulation.revenus_annuels() <= simulation.plafond_microfoncier
+    return True
+
+
+def parametres_regime(classe, communs, montant_emprunt):
+    """Arguments du constructeur d'un régime, pris dans le formulaire commun."""
+    parametres = {}
+    for champ in fields(classe):
+        if not champ.init:
+            continue
+        nom = ALIAS_CHAMPS.get(champ.name, champ.name)
+        if champ.name == "montant_emprunt":
+            parametres["montant_emprunt"] = montant_emprunt
+        elif nom in communs:
+            parametres[champ.name] = communs[nom]
+        elif champ.default is MISSING and champ.default_factory is MISSING:
+            raise ValueError(f"Champ manquant pour {classe.__name__} : {nom}")
+    return parametres
+
+
+def comparer_regimes(communs, valeur_revente=None, taux_actualisation=0.05):
+    """Cashflow, imposition et TRI des dix régimes pour une même saisie, classés.
+
+    Le coût d'acquisition est calculé une fois ; les dix régimes empruntent
+    le même montant aux mêmes conditions et partagent donc un seul échéancier
+    (cache process). Le TRI porte sur l'apport en année 0, les cashflows
+    annuels, puis la revente à l'horizon (`valeur_revente`, par défaut le prix
+    d'achat) diminuée du capital restant dû ; la VAN est actualisée au
+    `taux_actualisation`.
+    """
+    cout = cout_acquisition(
+        communs["prix_bien"], communs.get("frais_notaire_pct", 8.0), communs["frais_agence"],
+        communs["frais_dossier"], communs["frais_garantie"], communs["frais_tiers"],
+        communs["montant_travaux"], communs["apport"],
+    )
+    horizon = communs.get("horizon", 10)
+    annuel = emprunt.echeancier_annuel(
+        cout.montant_emprunt, communs["taux_interet"], communs["taux_assurance"],
+        communs["duree_annees"], communs["differe_mois"], communs.get("differe_partiel", False),
+    )
+    capital_restant = annuel.sur_horizon("capital_restant", horizon)[-1]
+    revente = communs["prix_bien"] if valeur_revente is None else valeur_revente
+
+    lignes = []
+    cashflows = []
+    for libelle, classe in REGIMES.items():
+        simulation = classe(**parametres_regime(classe, communs, cout.montant_emprunt))
+        indicateurs = indicateurs_annuels(simulation)
+        cashflow_annuel = indicateurs["cashflow_mensuel"] * 12
+        cashflows.append(cashflow_annuel)
+        lignes.append({
+            "Régime": libelle,
+            "Cashflow mensuel an 1": round(float(indicateurs["cashflow_mensuel"][0]), 2),
+            "Cashflow mensuel moyen": round(float(indicateurs["cashflow_mensuel"].mean()), 2),
+            "Cashflow cumulé": round(float(cashflow_annuel.sum()), 2),
+            "Impôts cumulés": round(float(indicateurs["impots"].sum()), 2),
+            "Éligible": eligible(simulation),
+        })
+
+    # Un seul calcul de rendement pour les dix régimes
+    rendements = finance.rendement(
+        communs["apport"], np.array(cashflows), revente - capital_restant, taux_actualisation
+    )
+    for ligne, t, v, m in zip(lignes, rendements.tri, rendements.van, rendements.multiple):
+        ligne["TRI (%)"] = round(float(t) * 100, 2) if np.isfinite(t) else None
+        ligne["VAN (€)"] = round(float(v), 2)
+        ligne["Multiple"] = round(float(m), 2) if np.isfinite(m) else None
+
+    lignes.sort(key=lambda l: (
+        not l["Éligible"],
+        l["TRI (%)"] is None,
+        -(l["TRI (%)"] or 0.0),
+        -l["Cashflow cumulé"],
+    ))
+    for rang, ligne in enumerate(lignes, start=1):
+        ligne["Rang"] = rang
+    return lignes
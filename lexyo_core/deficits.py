@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# --------------------------------------------------------------------------------
+# REPORT DES DÉFICITS
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class ReportDeficits:
+    resultat_net: np.ndarray
+    imposable: np.ndarray
+    impute: np.ndarray
+    disponible: np.ndarray
+    reportable: np.ndarray
+    expire: np.ndarray
+
+
+def imputer_deficits(resultats, duree_report=None):
+    """Report en avant des déficits, imputés dans l'ordre FIFO.
+
+    `resultats` est un tableau (..., années) de résultats fiscaux avant report ;
+    les dimensions de tête sont autant de scénarios indépendants. Le déficit
+    d'une année est imputable sur les `duree_report` années suivantes (sans
+    limite si `None`), les plus anciens en premier. Le calcul est linéaire en
+    nombre d'années et ne modifie aucun état : mêmes entrées, mêmes sorties.
+    """
+    resultats = np.asarray(resultats, dtype=float)
+    benefices = np.maximum(resultats, 0.0)
+    deficits = np.maximum(-resultats, 0.0)
+    # Cumul des déficits créés : le stock FIFO est la part de ce cumul
+    # qui n'a été ni imputée ni périmée.
+    cumul_deficits = np.cumsum(deficits, axis=-1)
+
+    impute = np.zeros_like(resultats)
+    disponible = np.zeros_like(resultats)
+    expire = np.zeros_like(resultats)
+    reportable = np.zeros_like(resultats)
+    consomme = np.zeros(resultats.shape[:-1])
+
+    for t in range(resultats.shape[-1]):
+        cumul_precedent = cumul_deficits[..., t - 1] if t > 0 else 0.0
+        if duree_report is not None and t - 1 - duree_report >= 0:
+            perime = np.maximum(cumul_deficits[..., t - 1 - duree_report] - consomme, 0.0)
+            expire[..., t] = perime
+            consomme = consomme + perime
+        disponible[..., t] = np.maximum(cumul_precedent - consomme, 0.0)
+        impute[..., t] = np.minimum(benefices[..., t], disponible[..., t])
+        consomme = consomme + impute[..., t]
+        reportable[..., t] = np.maximum(cumul_deficits[..., t] - consomme, 0.0)
+
+    return ReportDeficits(
+        resultat_net=resultats - disponible,
+        imposable=benefices - impute,
+        impute=impute,
+        disponible=disponible,
+        reportable=reportable,
+        expire=expire,
+    )
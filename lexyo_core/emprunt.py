@@ -0,0 +1,406 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .cache import CacheLRU
+
+
+COLONNES_EMPRUNT = ("montant_emprunt", "taux_interet", "taux_assurance", "duree_annees", "differe_mois")
+
+# Échéanciers partagés par tout le processus : un même financement simulé sous
+# plusieurs régimes, ou relancé sans changement, n'est calculé qu'une fois.
+cache_echeanciers = CacheLRU(taille_max=512)
+
+
+# --------------------------------------------------------------------------------
+# MOTEUR D'ÉCHÉANCIER D'EMPRUNT
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class Echeancier:
+    mois: np.ndarray
+    annee: np.ndarray
+    interets: np.ndarray
+    principal: np.ndarray
+    assurance: np.ndarray
+    capital_restant: np.ndarray
+    mensualite_hors_assurance: float
+    mensualite_assurance: float
+
+    @property
+    def mensualite(self):
+        return self.mensualite_hors_assurance + self.mensualite_assurance
+
+
+@dataclass(frozen=True)
+class EcheancierAnnuel:
+    """Totaux annuels d'un emprunt, ou d'un lot d'emprunts (tableaux (..., années)).
+
+    En lot, les mensualités gardent la forme (..., 1) des paramètres pour se
+    diffuser directement sur l'axe des années.
+    """
+    annee: np.ndarray
+    interets: np.ndarray
+    principal: np.ndarray
+    assurance: np.ndarray
+    capital_restant: np.ndarray
+    actif: np.ndarray
+    interets_capitalises: np.ndarray
+    mensualite_hors_assurance: float
+    mensualite_assurance: float
+
+    @property
+    def mensualite(self):
+        return self.mensualite_hors_assurance + self.mensualite_assurance
+
+    def sur_horizon(self, colonne, horizon):
+        """Colonne annuelle ramenée à `horizon` années (zéros après la fin du prêt)."""
+        tableau = getattr(self, colonne)
+        valeurs = np.zeros(tableau.shape[:-1] + (horizon,), dtype=tableau.dtype)
+        n = min(horizon, len(self.annee))
+        valeurs[..., :n] = tableau[..., :n]
+        return valeurs
+
+    def annuites_sur_horizon(self, horizon):
+        """Sommes payées chaque année, assurance comprise, sur `horizon` années.
+
+        Pendant un différé total, les intérêts capitalisés ne sont pas payés :
+        seule l'assurance l'est (les intérêts aussi en différé partiel).
+        """
+        payes = self.interets + self.principal + self.assurance - self.interets_capitalises
+        valeurs = np.zeros(payes.shape[:-1] + (horizon,))
+        n = min(horizon, len(self.annee))
+        valeurs[..., :n] = payes[..., :n]
+        return valeurs
+
+
+@dataclass(frozen=True)
+class EcheancierLot:
+    """Échéanciers de plusieurs emprunts : une ligne par emprunt, une colonne par période.
+
+    Les périodes situées après la fin d'un emprunt plus court sont à zéro et
+    marquées `False` dans `actif`. `interets_capitalises` est la part des
+    intérêts ajoutée au capital pendant un différé total, donc non payée.
+    """
+    periode: np.ndarray
+    interets: np.ndarray
+    principal: np.ndarray
+    assurance: np.ndarray
+    capital_restant: np.ndarray
+    actif: np.ndarray
+    interets_capitalises: np.ndarray
+    mensualite_hors_assurance: np.ndarray
+    mensualite_assurance: np.ndarray
+
+    @property
+    def mensualite(self):
+        return self.mensualite_hors_assurance + self.mensualite_assurance
+
+    def __len__(self):
+        return len(self.mensualite_hors_assurance)
+
+
+def _verifier_duree(duree_annees, differe_mois):
+    n = np.asarray(duree_annees) * 12 - np.asarray(differe_mois)
+    if np.any(n <= 0):
+        raise ValueError("Durée ou différé incohérents")
+    return n
+
+
+def capital_apres_differe(montant_emprunt, taux_interet, differe_mois, differe_partiel=False):
+    """Capital à amortir à l'issue du différé, en forme close et vectorisée.
+
+    Différé total : les intérêts sont capitalisés, C·(1 + t)^d. Différé
+    partiel : les intérêts sont payés chaque mois et le capital reste C.
+    Tous les paramètres peuvent être des tableaux (diffusés entre eux).
+    """
+    montant_emprunt = np.asarray(montant_emprunt, dtype=float)
+    tm = np.asarray(taux_interet, dtype=float) / 100 / 12
+    capitalise = montant_emprunt * np.exp(np.asarray(differe_mois) * np.log1p(tm))
+    return np.where(differe_partiel, montant_emprunt, capitalise)
+
+
+def interets_differe(montant_emprunt, taux_interet, differe_mois, differe_partiel=False):
+    """Intérêts générés pendant le différé : capitalisés (total) ou payés (partiel)."""
+    montant_emprunt = np.asarray(montant_emprunt, dtype=float)
+    tm = np.asarray(taux_interet, dtype=float) / 100 / 12
+    capitalises = capital_apres_differe(montant_emprunt, taux_interet, differe_mois) - montant_emprunt
+    return np.where(differe_partiel, montant_emprunt * tm * np.asarray(differe_mois), capitalises)
+
+
+def indemnites_remboursement_anticipe(capital_restant, taux_interet, plafond_pct=3.0):
+    """Indemnités de remboursement anticipé au plafond légal, vectorisées.
+
+    Six mois d'intérêts au taux du prêt sur le capital remboursé, sans
+    dépasser `plafond_pct` % du capital restant dû (nulles une fois le prêt soldé).
+    """
+    capital_restant = np.asarray(capital_restant, dtype=float)
+    six_mois = capital_restant * np.asarray(taux_interet, dtype=float) / 100 / 2
+    return np.minimum(six_mois, capital_restant * plafond_pct / 100)
+
+
+def _mensualite_hors_assurance(montant_emprunt, taux_interet, tm, n, differe_mois, differe_partiel):
+    capital_differe = capital_apres_differe(montant_emprunt, taux_interet, differe_mois, differe_partiel)
+    tm_sur = np.where(tm > 0, tm, 1.0)
+    return np.where(
+        tm > 0,
+        capital_differe * tm_sur / (1 - (1 + tm_sur) ** -n),
+        capital_differe / n,
+    )
+
+
+def _capital_restant(montant_emprunt, tm, m_hors_assurance, differe_mois, differe_partiel, mois):
+    """Capital restant dû (non borné) à la fin de chaque mois donné, en forme close."""
+    # Nombre d'échéances d'amortissement payées à la fin de chaque mois
+    k = np.maximum(mois - differe_mois, 0)
+    log_croissance = np.log1p(tm)
+    mois_capitalises = np.where(differe_partiel, 0, mois - k)
+    capital_differe = montant_emprunt * np.exp(mois_capitalises * log_croissance)
+    facteur_k = np.exp(k * log_croissance)
+    tm_sur = np.where(tm > 0, tm, 1.0)
+    cumul = np.where(tm > 0, (facteur_k - 1) / tm_sur, k)
+    return capital_differe * facteur_k - m_hors_assurance * cumul
+
+
+def _parametres_lot(montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois,
+                    differe_partiel=False):
+    (montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois,
+     differe_partiel) = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(montant_emprunt, dtype=float)),
+        np.atleast_1d(np.asarray(taux_interet, dtype=float)),
+        np.atleast_1d(np.asarray(taux_assurance, dtype=float)),
+        np.atleast_1d(np.asarray(duree_annees, dtype=np.int64)),
+        np.atleast_1d(np.asarray(differe_mois, dtype=np.int64)),
+        np.atleast_1d(np.asarray(differe_partiel, dtype=bool)),
+    )
+    n = _verifier_duree(duree_annees, differe_mois)
+    tm = taux_interet / 100 / 12
+    ta = taux_assurance / 100 / 12
+    m_hors_assurance = _mensualite_hors_assurance(
+        montant_emprunt, taux_interet, tm, n, differe_mois, differe_partiel
+    )
+    return montant_emprunt, tm, ta, duree_annees, differe_mois, differe_partiel, m_hors_assurance
+
+
+def echeancier_lot(montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois,
+                   differe_partiel=False, par="mois"):
+    """Échéanciers d'un lot d'emprunts en un seul calcul vectorisé.
+
+    Chaque paramètre est un scalaire ou un tableau 1-D (diffusés entre eux).
+    `differe_partiel` choisit, par emprunt, un différé où les intérêts sont
+    payés plutôt que capitalisés. `par="mois"` renvoie des tableaux
+    (emprunts × mois), `par="annee"` des totaux (emprunts × années), bien
+    moins coûteux pour les gros lots.
+    """
+    montant, tm, ta, duree, differe, partiel, m_ha = _parametres_lot(
+        montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois, differe_partiel
+    )
+    montant, tm, ta, differe, partiel, m_ha_col = (
+        montant[:, None], tm[:, None], ta[:, None], differe[:, None], partiel[:, None], m_ha[:, None]
+    )
+    mensualite_assurance = montant * ta
+
+    if par == "mois":
+        periode = np.arange(1, duree.max() * 12 + 1)
+        actif = periode <= duree[:, None] * 12
+        capital_restant = _capital_restant(montant, tm, m_ha_col, differe, partiel, periode)
+
+        capital_debut = np.empty_like(capital_restant)
+        capital_debut[:, 0] = montant[:, 0]
+        capital_debut[:, 1:] = capital_restant[:, :-1]
+        interets = capital_debut * tm
+        principal = np.where(periode > differe, m_ha_col - interets, 0.0)
+        interets_capitalises = np.where((periode <= differe) & ~partiel, interets, 0.0)
+        assurance = np.broadcast_to(mensualite_assurance, capital_restant.shape)
+    elif par == "annee":
+        periode = np.arange(1, duree.max() + 1)
+        actif = periode <= duree[:, None]
+        debut = (periode - 1) * 12
+        fin = periode * 12
+        fin_differe = np.clip(differe, debut, fin)
+
+        capital_debut = _capital_restant(montant, tm, m_ha_col, differe, partiel, debut)
+        capital_fin_differe = _capital_restant(montant, tm, m_ha_col, differe, partiel, fin_differe)
+        capital_restant = _capital_restant(montant, tm, m_ha_col, differe, partiel, fin)
+
+        # Pendant le différé les intérêts sont capitalisés (ou payés s'il est
+        # partiel), ensuite le principal est la baisse du capital et les
+        # intérêts le reste des échéances.
+        interets_du_differe = np.where(
+            partiel, montant * tm * (fin_differe - debut), capital_fin_differe - capital_debut
+        )
+        interets = (
+            interets_du_differe
+            + m_ha_col * (fin - fin_differe)
+            - (capital_fin_differe - capital_restant)
+        )
+        principal = capital_fin_differe - capital_restant
+        interets_capitalises = np.where(partiel, 0.0, interets_du_differe)
+        assurance = np.broadcast_to(mensualite_assurance * 12, capital_restant.shape)
+    else:
+        raise ValueError("par doit valoir 'mois' ou 'annee'")
+
+    # Dernière échéance : on solde le reliquat négatif dû aux arrondis
+    negatif = capital_restant < 0
+    principal = principal + np.where(negatif, capital_restant, 0.0)
+    capital_restant = np.where(negatif, 0.0, capital_restant)
+
+    return EcheancierLot(
+        periode=periode,
+        interets=np.where(actif, interets, 0.0),
+        principal=np.where(actif, principal, 0.0),
+        assurance=np.where(actif, assurance, 0.0),
+        capital_restant=np.where(actif, capital_restant, 0.0),
+        actif=actif,
+        interets_capitalises=np.where(actif, interets_capitalises, 0.0),
+        mensualite_hors_assurance=m_ha,
+        mensualite_assurance=mensualite_assurance[:, 0],
+    )
+
+
+def echeancier_lot_table(table, par="mois"):
+    """`echeancier_lot` sur une table (DataFrame ou dict de colonnes) aux noms de COLONNES_EMPRUNT.
+
+    Une colonne `differe_partiel` facultative choisit le type de différé.
+    """
+    colonnes = [np.asarray(table[colonne]) for colonne in COLONNES_EMPRUNT]
+    differe_partiel = np.asarray(table["differe_partiel"]) if "differe_partiel" in table else False
+    return echeancier_lot(*colonnes, differe_partiel=differe_partiel, par=par)
+
+
+def _cle_emprunt(montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois,
+                 differe_partiel=False):
+    """Forme canonique des paramètres d'un emprunt, utilisée comme clé de cache."""
+    return (
+        float(montant_emprunt), float(taux_interet), float(taux_assurance),
+        int(duree_annees), int(differe_mois), bool(differe_partiel),
+    )
+
+
+def _en_lot(*parametres):
+    return any(np.ndim(parametre) > 0 for parametre in parametres)
+
+
+def _echeancier_annuel_lot(montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois,
+                           differe_partiel=False):
+    """`echeancier_annuel` pour des paramètres en tableaux de forme (..., 1), hors cache.
+
+    La dernière dimension, de taille 1, est celle des années : les totaux
+    sont renvoyés en (..., années) et se combinent tels quels avec les autres
+    colonnes d'un régime simulé en lot.
+    """
+    parametres = np.broadcast_arrays(
+        montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois, differe_partiel
+    )
+    forme = parametres[0].shape
+    lot = echeancier_lot(*(parametre.ravel() for parametre in parametres), par="annee")
+
+    def remettre_en_forme(tableau):
+        return tableau.reshape(forme[:-1] + tableau.shape[-1:])
+
+    return EcheancierAnnuel(
+        annee=lot.periode,
+        interets=remettre_en_forme(lot.interets),
+        principal=remettre_en_forme(lot.principal),
+        assurance=remettre_en_forme(lot.assurance),
+        capital_restant=remettre_en_forme(lot.capital_restant),
+        actif=remettre_en_forme(lot.actif),
+        interets_capitalises=remettre_en_forme(lot.interets_capitalises),
+        mensualite_hors_assurance=lot.mensualite_hors_assurance.reshape(forme),
+        mensualite_assurance=lot.mensualite_assurance.reshape(forme),
+    )
+
+
+def _lecture_seule(*tableaux):
+    for tableau in tableaux:
+        tableau.flags.writeable = False
+
+
+def mensualite_emprunt(montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois,
+                       differe_partiel=False):
+    """Mensualité assurance comprise, à l'issue du différé (total ou partiel).
+
+    Avec des paramètres en tableaux (..., 1), renvoie un tableau de même forme.
+    """
+    if _en_lot(montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois, differe_partiel):
+        return _echeancier_annuel_lot(
+            montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois, differe_partiel
+        ).mensualite
+    cle = _cle_emprunt(
+        montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois, differe_partiel
+    )
+
+    def calcul():
+        montant, tm, ta, duree, differe, partiel, m_ha = _parametres_lot(*cle)
+        return float(m_ha[0] + montant[0] * ta[0])
+
+    return cache_echeanciers.obtenir(("mensualite",) + cle, calcul)
+
+
+def echeancier_emprunt(montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois,
+                       differe_partiel=False):
+    """Échéancier mensuel complet calculé en une seule passe NumPy.
+
+    Les intérêts du différé sont capitalisés (ou payés si `differe_partiel`),
+    puis le capital est amorti à mensualité constante ; la dernière échéance est ajustée pour solder le
+    capital restant dû. Le résultat est mis en cache et en lecture seule.
+    """
+    cle = _cle_emprunt(
+        montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois, differe_partiel
+    )
+
+    def calcul():
+        lot = echeancier_lot(*cle)
+        echeancier = Echeancier(
+            mois=lot.periode,
+            annee=(lot.periode - 1) // 12 + 1,
+            interets=lot.interets[0],
+            principal=lot.principal[0],
+            assurance=lot.assurance[0],
+            capital_restant=lot.capital_restant[0],
+            mensualite_hors_assurance=float(lot.mensualite_hors_assurance[0]),
+            mensualite_assurance=float(lot.mensualite_assurance[0]),
+        )
+        _lecture_seule(
+            echeancier.mois, echeancier.annee, echeancier.interets, echeancier.principal,
+            echeancier.assurance, echeancier.capital_restant,
+        )
+        return echeancier
+
+    return cache_echeanciers.obtenir(("mois",) + cle, calcul)
+
+
+def echeancier_annuel(montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois,
+                      differe_partiel=False):
+    """Totaux annuels de l'emprunt sans construire l'échéancier mensuel (mis en cache).
+
+    Des paramètres en tableaux (..., 1) donnent les échéanciers d'un lot en
+    un seul calcul vectorisé, non mis en cache.
+    """
+    if _en_lot(montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois, differe_partiel):
+        return _echeancier_annuel_lot(
+            montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois, differe_partiel
+        )
+    cle = _cle_emprunt(
+        montant_emprunt, taux_interet, taux_assurance, duree_annees, differe_mois, differe_partiel
+    )
+
+    def calcul():
+        lot = echeancier_lot(*cle, par="annee")
+        annuel = EcheancierAnnuel(
+            annee=lot.periode,
+            interets=lot.interets[0],
+            principal=lot.principal[0],
+            assurance=lot.assurance[0],
+            capital_restant=lot.capital_restant[0],
+            actif=lot.actif[0],
+            interets_capitalises=lot.interets_capitalises[0],
+            mensualite_hors_assurance=float(lot.mensualite_hors_assurance[0]),
+            mensualite_assurance=float(lot.mensualite_assurance[0]),
+        )
+        _lecture_seule(
+            annuel.annee, annuel.interets, annuel.principal,
+            annuel.assurance, annuel.capital_restant, annuel.actif, annuel.interets_capitalises,
+        )
+        return annuel
+
+    return cache_echeanciers.obtenir(("annee",) + cle, calcul)
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# --------------------------------------------------------------------------------
+# EXÉCUTEUR BORNÉ POUR LES CALCULS DE L'API
+# --------------------------------------------------------------------------------
+class FileSaturee(RuntimeError):
+    """Plus aucune place dans la file : la demande doit être refusée (HTTP 429)."""
+
+
+class DelaiDepasse(TimeoutError):
+    """Le calcul n'a pas abouti dans le délai imparti."""
+
+
+class Executeur:
+    """Pool de threads ou de processus avec une file d'attente bornée.
+
+    `taille_file` limite le nombre de calculs acceptés en plus de ceux en
+    cours ; au-delà, `soumettre` lève FileSaturee au lieu d'allonger la file.
+    Un calcul qui dépasse `delai` secondes lève DelaiDepasse ; sa place n'est
+    rendue qu'à la fin effective du calcul, un thread ne pouvant être
+    interrompu.
+    """
+
+    TYPES = ("thread", "process")
+
+    def __init__(self, type_pool="thread", workers=None, taille_file=64, delai=30.0):
+        if type_pool not in self.TYPES:
+            raise ValueError(f"type_pool doit valoir {' ou '.join(self.TYPES)}")
+        self.type_pool = type_pool
+        self.workers = workers or os.cpu_count() or 1
+        self.capacite = self.workers + taille_file
+        self.delai = delai
+        self._pool = None
+        self._en_cours = 0
+        self._verrou = threading.Lock()
+
+    @classmethod
+    def depuis_environnement(cls, prefixe="LEXYO_"):
+        """Configuration par variables d'environnement (EXECUTEUR, WORKERS, FILE_MAX, DELAI)."""
+        env = os.environ
+        return cls(
+            type_pool=env.get(prefixe + "EXECUTEUR", "thread"),
+            workers=int(env[prefixe + "WORKERS"]) if prefixe + "WORKERS" in env else None,
+            taille_file=int(env.get(prefixe + "FILE_MAX", 64)),
+            delai=float(env.get(prefixe + "DELAI", 30.0)),
+        )
+
+    def _obtenir_pool(self):
+        # Pool créé au premier calcul : importer le module ne lance aucun processus
+        if self._pool is None:
+            pool = ThreadPoolExecutor if self.type_pool == "thread" else ProcessPoolExecutor
+            self._pool = pool(max_workers=self.workers)
+        return self._pool
+
+    @property
+    def en_cours(self):
+        return self._en_cours
+
+    def sature(self):
+        return self._en_cours >= self.capacite
+
+    def _liberer(self, _future):
+        with self._verrou:
+            self._en_cours -= 1
+
+    async def soumettre(self, fonction, *args, delai=None):
+        with self._verrou:
+            if self._en_cours >= self.capacite:
+                raise FileSaturee("File de calcul saturée")
+            self._en_cours += 1
+            pool = self._obtenir_pool()
+        try:
+            future = pool.submit(fonction, *args)
+        except BaseException:
+            self._liberer(None)
+            raise
+        future.add_done_callback(self._liberer)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), delai or self.delai)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise DelaiDepasse("Délai de calcul dépassé") from None
+
+    def fermer(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
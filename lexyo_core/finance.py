@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+# --------------------------------------------------------------------------------
+# ACTUALISATION ET TAUX DE RENDEMENT INTERNE
+# --------------------------------------------------------------------------------
+def van(flux, taux):
+    """Valeur actuelle nette de flux annuels (année 0 en premier) au `taux` donné.
+
+    `flux` est un tableau (..., années) ; `taux` est diffusé sur les dimensions
+    de tête, ce qui évalue d'un coup autant de scénarios que voulu.
+    """
+    flux = np.asarray(flux, dtype=float)
+    facteur = 1 / (1 + np.asarray(taux, dtype=float))
+    # Schéma de Horner : une multiplication-addition par année, sans puissance
+    total = np.zeros(np.broadcast_shapes(flux.shape[:-1], facteur.shape))
+    for annee in range(flux.shape[-1] - 1, -1, -1):
+        total = total * facteur + flux[..., annee]
+    return total
+
+
+def tri(flux, borne_basse=-0.99, borne_haute=10.0, iterations=100, tolerance=1e-10):
+    """Taux de rendement interne par dichotomie, vectorisé sur les dimensions de tête.
+
+    Tous les scénarios avancent ensemble ; le calcul s'arrête dès que
+    l'intervalle est plus étroit que `tolerance`. Renvoie NaN quand la VAN
+    ne change pas de signe entre les deux bornes (pas de TRI dans
+    l'intervalle, par exemple sans apport initial).
+    """
+    flux = np.asarray(flux, dtype=float)
+    forme = flux.shape[:-1]
+    bas = np.full(forme, borne_basse)
+    haut = np.full(forme, borne_haute)
+    van_bas = van(flux, bas)
+    encadre = np.sign(van_bas) * np.sign(van(flux, haut)) < 0
+
+    for _ in range(iterations):
+        if np.all(haut - bas < tolerance):
+            break
+        milieu = (bas + haut) / 2
+        van_milieu = van(flux, milieu)
+        meme_signe = np.sign(van_milieu) == np.sign(van_bas)
+        bas = np.where(meme_signe, milieu, bas)
+        van_bas = np.where(meme_signe, van_milieu, van_bas)
+        haut = np.where(meme_signe, haut, milieu)
+
+    return np.where(encadre, (bas + haut) / 2, np.nan)
+
+
+def flux_investissement(apport, cashflows_annuels, valeur_finale):
+    """Flux d'un investissement : -apport en année 0, cashflows, valeur finale ajoutée à la dernière année.
+
+    Tous les arguments sont diffusés sur les dimensions de tête ;
+    `cashflows_annuels` porte les années sur sa dernière dimension.
+    """
+    cashflows_annuels = np.asarray(cashflows_annuels, dtype=float)
+    apport = np.asarray(apport, dtype=float)
+    forme = np.broadcast_shapes(cashflows_annuels.shape[:-1], apport.shape, np.shape(valeur_finale))
+    flux = np.zeros(forme + (cashflows_annuels.shape[-1] + 1,))
+    flux[..., 0] = -apport
+    flux[..., 1:] = cashflows_annuels
+    flux[..., -1] += valeur_finale
+    return flux
+
+
+# --------------------------------------------------------------------------------
+# INDICATEURS DE RENDEMENT
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class Rendement:
+    tri: np.ndarray
+    van: np.ndarray
+    cash_on_cash: np.ndarray
+    multiple: np.ndarray
+
+
+def rendement(apport, cashflows_annuels, valeur_finale=0.0, taux_actualisation=0.05):
+    """TRI, VAN, cash-on-cash et multiple des capitaux d'un investissement.
+
+    Flux : -apport en année 0, les cashflows annuels, puis `valeur_finale`
+    (revente nette du capital restant dû) la dernière année. Le cash-on-cash
+    est le cashflow annuel moyen rapporté à l'apport, le multiple la somme
+    des flux reçus rapportée à l'apport (NaN sans apport). Vectorisé sur les
+    dimensions de tête : un scénario par ligne.
+    """
+    flux = flux_investissement(apport, cashflows_annuels, valeur_finale)
+    apport = -flux[..., 0]
+    recu = flux[..., 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cash_on_cash = np.where(apport > 0, np.asarray(cashflows_annuels, dtype=float).mean(axis=-1) / apport, np.nan)
+        multiple = np.where(apport > 0, recu.sum(axis=-1) / apport, np.nan)
+    return Rendement(
+        tri=tri(flux),
+        van=van(flux, taux_actualisation),
+        cash_on_cash=cash_on_cash,
+        multiple=multiple,
+    )
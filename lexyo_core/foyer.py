@@ -0,0 +1,290 @@
+import dataclasses
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import deficits, emprunt
+from .regimes import (
+    HoldingIS,
+    LMNPReel,
+    LMPReel,
+    LocationNue,
+    MicroBIC,
+    MicroFoncier,
+    ReelFoncier,
+    SARLDeFamille,
+    SCIaIR,
+    SCIaIS,
+    indicateurs_annuels,
+)
+from .simulation import TRANCHES_TMI
+
+PLAFOND_MICRO_BIC = 77700
+PLAFOND_MICRO_FONCIER = 15000
+PLAFOND_DEFICIT_FONCIER = 10700
+DUREE_REPORT = 10
+TAUX_PRELEVEMENTS_SOCIAUX = 0.172
+
+# Catégorie de revenus de chaque régime au niveau du foyer : les sociétés à
+# l'IS restent imposées à part, les cotisations SSI du LMP restent au bien
+CATEGORIES = {
+    LMNPReel: "bic",
+    SARLDeFamille: "bic",
+    MicroBIC: "micro_bic",
+    LMPReel: "bic_pro",
+    LocationNue: "foncier",
+    ReelFoncier: "foncier",
+    SCIaIR: "foncier",
+    MicroFoncier: "micro_foncier",
+    SCIaIS: "is",
+    HoldingIS: "is",
+}
+
+# Colonnes d'imposition calculées par le bien avec sa TMI saisie, remplacées
+# par l'imposition du foyer
+COLONNES_IMPOTS_FOYER = {
+    LMNPReel: ('Impôt',),
+    MicroBIC: ('IR (TMI)', 'Prélèvements sociaux (17.2%)'),
+    LMPReel: ('IR (TMI)',),
+    SCIaIS: (),
+    SCIaIR: ('Impôt sur le revenu (IR)',),
+    SARLDeFamille: ('IR (TMI)',),
+    HoldingIS: (),
+    LocationNue: ('IR',),
+    MicroFoncier: ('IR (TMI)', 'Prélèvements sociaux (17.2%)'),
+    ReelFoncier: ('Impôt (IR)',),
+}
+
+
+# --------------------------------------------------------------------------------
+# CONTRIBUTION D'UN BIEN AUX REVENUS DU FOYER
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class ContributionBien:
+    """Revenus d'un bien avant imposition du foyer, un tableau par année.
+
+    `resultat` est le résultat réel avant report des déficits (en micro, le
+    résultat de repli si le foyer dépasse le plafond) ; `imposable_micro`
+    le revenu après abattement forfaitaire (nul hors micro).
+    """
+    categorie: str
+    recettes: np.ndarray
+    resultat: np.ndarray
+    imposable_micro: np.ndarray
+    interets: np.ndarray
+    cashflow_avant_ir: np.ndarray
+
+
+def _colonne(resultats, nom):
+    return np.asarray(resultats[nom], dtype=float)
+
+
+def _interets_micro_bic(simulation):
+    if np.all(np.asarray(simulation.duree_annees) * 12 - simulation.differe_mois <= 0):
+        return np.zeros(simulation.horizon)
+    annuel = emprunt.echeancier_annuel(
+        simulation.montant_emprunt, simulation.taux_interet, simulation.taux_assurance,
+        simulation.duree_annees, simulation.differe_mois, simulation.differe_partiel
+    )
+    return annuel.sur_horizon('interets', simulation.horizon) + annuel.sur_horizon('assurance', simulation.horizon)
+
+
+def contribution_bien(simulation):
+    """Contribution d'une simulation (non vectorisée) aux revenus du foyer."""
+    classe = type(simulation)
+    if classe not in CATEGORIES:
+        raise ValueError(f"Régime non géré dans un foyer : {classe.__name__}")
+    resultats = simulation.resultat_fiscal_annuel()
+    indicateurs = indicateurs_annuels(simulation)
+    impots_foyer = sum((_colonne(resultats, c) for c in COLONNES_IMPOTS_FOYER[classe]), np.zeros(simulation.horizon))
+    cashflow_avant_ir = indicateurs['cashflow_mensuel'] * 12 + impots_foyer
+    zeros = np.zeros(simulation.horizon)
+
+    if classe is LMNPReel:
+        recettes = _colonne(resultats, 'Revenus nets')
+        resultat = (recettes - _colonne(resultats, 'Charges') - _colonne(resultats, 'Intérêts')
+                    - _colonne(resultats, 'Amortissements'))
+        interets, imposable_micro = zeros, zeros
+    elif classe is MicroBIC:
+        recettes = _colonne(resultats, 'Revenus bruts')
+        # Repli au réel sans amortissements (biens et mobilier non saisis en micro)
+        interets = _interets_micro_bic(simulation)
+        resultat = recettes - _colonne(resultats, 'Charges non récupérables') - interets
+        imposable_micro = _colonne(resultats, 'Revenu imposable')
+    elif classe is MicroFoncier:
+        recettes = _colonne(resultats, 'Revenus bruts')
+        interets = _colonne(resultats, 'Intérêts') + _colonne(resultats, 'Assurance emprunt')
+        resultat = (recettes - _colonne(resultats, 'Charges réelles') + _colonne(resultats, 'Charges récupérables')
+                    - interets)
+        imposable_micro = _colonne(resultats, 'Revenu imposable (abattement 30%)')
+    elif CATEGORIES[classe] == "foncier":
+        recettes = _colonne(resultats, 'Revenus')
+        interets = _colonne(resultats, 'Intérêts') + _colonne(resultats, 'Assurance')
+        resultat = _colonne(resultats, 'Résultat foncier')
+        imposable_micro = zeros
+    else:
+        recettes = _colonne(resultats, 'Revenus')
+        resultat = _colonne(resultats, 'Résultat fiscal brut')
+        interets, imposable_micro = zeros, zeros
+
+    return ContributionBien(
+        categorie=CATEGORIES[classe],
+        recettes=np.broadcast_to(recettes, (simulation.horizon,)),
+        resultat=resultat,
+        imposable_micro=np.broadcast_to(imposable_micro, (simulation.horizon,)),
+        interets=interets,
+        cashflow_avant_ir=cashflow_avant_ir,
+    )
+
+
+# --------------------------------------------------------------------------------
+# IMPOSITION DU FOYER
+# --------------------------------------------------------------------------------
+def bareme_ir(revenu_imposable, parts):
+    """(impôt, TMI) du barème progressif par quotient familial, vectorisé."""
+    quotient = np.maximum(np.asarray(revenu_imposable, dtype=float), 0.0) / parts
+    hauts = np.array([haut for _, haut, _ in TRANCHES_TMI])
+    bas = np.concatenate(([0.0], hauts[:-1]))
+    taux = np.array([t for _, _, t in TRANCHES_TMI])
+    par_tranche = np.clip(quotient[..., np.newaxis] - bas, 0.0, hauts - bas)
+    tmi = taux[np.minimum(np.searchsorted(hauts, quotient), len(taux) - 1)]
+    return (par_tranche * taux).sum(axis=-1) * parts, tmi
+
+
+@dataclass(frozen=True)
+class SyntheseFoyer:
+    annees: np.ndarray
+    revenu_imposable: np.ndarray
+    tmi: np.ndarray
+    impot_revenu: np.ndarray
+    supplement_ir: np.ndarray
+    prelevements_sociaux: np.ndarray
+    deficit_foncier_impute: np.ndarray
+    deficit_bic_reportable: np.ndarray
+    deficit_foncier_reportable: np.ndarray
+    micro_bic_possible: np.ndarray
+    micro_foncier_possible: np.ndarray
+    cashflow_avant_ir: np.ndarray
+    cashflow: np.ndarray
+
+
+def synthese_foyer(contributions, revenu_annuel_global, nombre_parts,
+                   plafond_micro_bic=PLAFOND_MICRO_BIC, plafond_micro_foncier=PLAFOND_MICRO_FONCIER):
+    """Imposition du foyer sur les revenus cumulés de tous ses biens, année par année.
+
+    Les plafonds micro portent sur les recettes cumulées du foyer (meublé,
+    foncier) : au-delà, les biens en micro passent au résultat réel. Les
+    déficits BIC non professionnels se reportent sur les BIC du foyer, le
+    déficit foncier s'impute sur le revenu global dans la limite de
+    PLAFOND_DEFICIT_FONCIER (hors intérêts) et le reste sur les revenus
+    fonciers, le déficit LMP sur le revenu global. L'IR du barème et la TMI
+    sont ceux du revenu total ; le supplément d'IR dû aux biens est l'écart
+    avec l'IR sur `revenu_annuel_global` seul.
+    """
+    contributions = list(contributions)
+    if not contributions:
+        raise ValueError("Le foyer ne contient aucun bien")
+    if not nombre_parts > 0:
+        raise ValueError("nombre_parts doit être strictement positif")
+    horizon = len(contributions[0].resultat)
+    zeros = np.zeros(horizon)
+
+    def somme(categories, champ):
+        return sum((getattr(c, champ) for c in contributions if c.categorie in categories), zeros)
+
+    def au_reel(categorie, categorie_micro, micro_possible, champ):
+        # Biens au réel, plus les biens en micro les années où le plafond est dépassé
+        return somme((categorie,), champ) + np.where(micro_possible, 0.0, somme((categorie_micro,), champ))
+
+    micro_bic_possible = somme(("bic", "micro_bic", "bic_pro"), "recettes") <= plafond_micro_bic
+    micro_foncier_possible = somme(("foncier", "micro_foncier"), "recettes") <= plafond_micro_foncier
+
+    bic = au_reel("bic", "micro_bic", micro_bic_possible, "resultat")
+    report_bic = deficits.imputer_deficits(bic, duree_report=DUREE_REPORT)
+    micro_bic = np.where(micro_bic_possible, somme(("micro_bic",), "imposable_micro"), 0.0)
+
+    # Foncier : les intérêts s'imputent d'abord sur les loyers, le reste du
+    # déficit sur le revenu global (plafonné), l'excédent se reporte
+    recettes_foncieres = au_reel("foncier", "micro_foncier", micro_foncier_possible, "recettes")
+    interets_fonciers = au_reel("foncier", "micro_foncier", micro_foncier_possible, "interets")
+    foncier = au_reel("foncier", "micro_foncier", micro_foncier_possible, "resultat")
+    deficit_hors_interets = np.maximum(-foncier - np.maximum(interets_fonciers - recettes_foncieres, 0.0), 0.0)
+    impute_global = np.where(foncier < 0, np.minimum(deficit_hors_interets, PLAFOND_DEFICIT_FONCIER), 0.0)
+    report_foncier = deficits.imputer_deficits(foncier + impute_global, duree_report=DUREE_REPORT)
+    micro_foncier = np.where(micro_foncier_possible, somme(("micro_foncier",), "imposable_micro"), 0.0)
+
+    revenus_patrimoine = report_bic.imposable + micro_bic + report_foncier.imposable + micro_foncier
+    revenu_imposable = np.maximum(
+        revenu_annuel_global + revenus_patrimoine - impute_global + somme(("bic_pro",), "resultat"), 0.0
+    )
+    impot, tmi = bareme_ir(revenu_imposable, nombre_parts)
+    impot_sans_biens, _ = bareme_ir(np.full(horizon, float(revenu_annuel_global)), nombre_parts)
+    supplement_ir = impot - impot_sans_biens
+    prelevements = revenus_patrimoine * TAUX_PRELEVEMENTS_SOCIAUX
+    cashflow_avant_ir = sum((c.cashflow_avant_ir for c in contributions), zeros)
+
+    return SyntheseFoyer(
+        annees=np.arange(1, horizon + 1),
+        revenu_imposable=revenu_imposable,
+        tmi=tmi * 100,
+        impot_revenu=impot,
+        supplement_ir=supplement_ir,
+        prelevements_sociaux=prelevements,
+        deficit_foncier_impute=impute_global,
+        deficit_bic_reportable=report_bic.reportable,
+        deficit_foncier_reportable=report_foncier.reportable,
+        micro_bic_possible=micro_bic_possible,
+        micro_foncier_possible=micro_foncier_possible,
+        cashflow_avant_ir=cashflow_avant_ir,
+        cashflow=cashflow_avant_ir - supplement_ir - prelevements,
+    )
+
+
+# --------------------------------------------------------------------------------
+# FOYER ET RECALCUL INCRÉMENTAL
+# --------------------------------------------------------------------------------
+class Foyer:
+    """Biens d'un foyer fiscal, tous régimes confondus, sur un horizon commun.
+
+    La contribution de chaque bien est conservée : ajouter, modifier ou
+    retirer un bien ne recalcule que ce bien, la synthèse du foyer (quelques
+    opérations par année) est refaite à chaque appel. `recalculs` compte les
+    biens simulés.
+    """
+
+    def __init__(self, revenu_annuel_global, nombre_parts):
+        self.revenu_annuel_global = revenu_annuel_global
+        self.nombre_parts = nombre_parts
+        self.biens = {}
+        self._contributions = {}
+        self.recalculs = 0
+
+    def ajouter(self, nom, simulation):
+        """Ajoute ou remplace le bien `nom` ; ValueError si son horizon diffère des autres."""
+        if type(simulation) not in CATEGORIES:
+            raise ValueError(f"Régime non géré dans un foyer : {type(simulation).__name__}")
+        horizons = {bien.horizon for autre, bien in self.biens.items() if autre != nom}
+        if horizons and simulation.horizon not in horizons:
+            raise ValueError(f"Horizon de {nom} ({simulation.horizon} ans) différent de celui du foyer")
+        self.biens[nom] = simulation
+        self._contributions.pop(nom, None)
+
+    def modifier(self, nom, **changements):
+        """Remplace le bien `nom` par une copie aux champs modifiés."""
+        self.ajouter(nom, dataclasses.replace(self.biens[nom], **changements))
+
+    def retirer(self, nom):
+        del self.biens[nom]
+        self._contributions.pop(nom, None)
+
+    def contribution(self, nom):
+        if nom not in self._contributions:
+            self._contributions[nom] = contribution_bien(self.biens[nom])
+            self.recalculs += 1
+        return self._contributions[nom]
+
+    def synthese(self, **plafonds):
+        return synthese_foyer(
+            [self.contribution(nom) for nom in self.biens],
+            self.revenu_annuel_global, self.nombre_parts, **plafonds
+        )
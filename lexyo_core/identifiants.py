@@ -0,0 +1,111 @@
+import csv
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+
+ALGORITHME = "pbkdf2_sha256"
+ITERATIONS = 100_000
+
+
+# --------------------------------------------------------------------------------
+# HACHAGE DES MOTS DE PASSE
+# --------------------------------------------------------------------------------
+def _deriver(mot_de_passe, sel, iterations):
+    return hashlib.pbkdf2_hmac("sha256", mot_de_passe.encode("utf-8"), sel, iterations)
+
+
+def hacher_mot_de_passe(mot_de_passe, iterations=ITERATIONS):
+    """Empreinte salée au format `pbkdf2_sha256$iterations$sel$empreinte` (hexadécimal).
+
+    C'est le format à placer dans la colonne `password` du fichier
+    d'identifiants pour ne plus y stocker de mot de passe en clair.
+    """
+    sel = secrets.token_bytes(16)
+    empreinte = _deriver(mot_de_passe, sel, iterations)
+    return f"{ALGORITHME}${iterations}${sel.hex()}${empreinte.hex()}"
+
+
+def _lire_empreinte(valeur):
+    """(iterations, sel, empreinte) d'une valeur hachée du fichier ; None pour un mot de passe en clair."""
+    morceaux = valeur.split("$")
+    if len(morceaux) == 4 and morceaux[0] == ALGORITHME:
+        return int(morceaux[1]), bytes.fromhex(morceaux[2]), bytes.fromhex(morceaux[3])
+    return None
+
+
+def _empreinte_en_clair(valeur):
+    sel = secrets.token_bytes(16)
+    return ITERATIONS, sel, _deriver(valeur, sel, ITERATIONS)
+
+
+# --------------------------------------------------------------------------------
+# MAGASIN D'IDENTIFIANTS
+# --------------------------------------------------------------------------------
+class Identifiants:
+    """Identifiants indexés par nom d'utilisateur, rechargés quand le fichier change.
+
+    Le fichier CSV (colonnes `username`, `password`) n'est relu que si sa date
+    de modification a changé. La vérification compare les empreintes en temps
+    constant et dérive une empreinte même pour un utilisateur inconnu, pour ne
+    pas révéler quels comptes existent.
+
+    Un mot de passe encore en clair (ancien format) n'est haché qu'à la
+    première vérification de son compte, puis gardé d'un rechargement à
+    l'autre tant que sa ligne ne change pas : relire le fichier ne coûte
+    aucune dérivation.
+    """
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        self._empreintes = {}
+        self._en_clair = {}
+        self._mtime = None
+        self._verrou = threading.Lock()
+        self._leurre = _empreinte_en_clair(secrets.token_hex(16))
+
+    def actualiser(self):
+        """Recharge le fichier s'il a été modifié ; lève FileNotFoundError s'il manque."""
+        mtime = os.stat(self.chemin).st_mtime_ns
+        if mtime == self._mtime:
+            return
+        with self._verrou:
+            if mtime == self._mtime:
+                return
+            empreintes, en_clair = {}, {}
+            with open(self.chemin, newline="", encoding="utf-8") as fichier:
+                for ligne in csv.DictReader(fichier):
+                    nom, valeur = ligne.get("username"), ligne.get("password") or ""
+                    if not nom:
+                        continue
+                    empreinte = _lire_empreinte(valeur)
+                    if empreinte is not None:
+                        empreintes[nom] = empreinte
+                        continue
+                    en_clair[nom] = valeur
+                    # Empreinte déjà dérivée pour la même ligne : reprise telle quelle
+                    if self._en_clair.get(nom) == valeur and nom in self._empreintes:
+                        empreintes[nom] = self._empreintes[nom]
+            self._empreintes, self._en_clair = empreintes, en_clair
+            self._mtime = mtime
+
+    def _empreinte(self, nom):
+        empreinte = self._empreintes.get(nom)
+        if empreinte is not None or nom not in self._en_clair:
+            return empreinte
+        with self._verrou:
+            if nom in self._en_clair and nom not in self._empreintes:
+                self._empreintes[nom] = _empreinte_en_clair(self._en_clair[nom])
+            return self._empreintes.get(nom)
+
+    def verifier(self, nom, mot_de_passe):
+        self.actualiser()
+        empreinte = self._empreinte(nom)
+        connu = empreinte is not None
+        iterations, sel, attendue = empreinte if connu else self._leurre
+        calculee = _deriver(mot_de_passe, sel, iterations)
+        return hmac.compare_digest(calculee, attendue) and connu
+
+    def __len__(self):
+        return len(self._empreintes.keys() | self._en_clair.keys())
@@ -0,0 +1,46 @@
+import dataclasses
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def _champs(classe):
+    # (champs saisis, champs dérivés calculés par __post_init__) d'une classe de régime
+    champs = dataclasses.fields(classe)
+    return frozenset(c.name for c in champs if c.init), tuple(c.name for c in champs if not c.init)
+
+
+# --------------------------------------------------------------------------------
+# MÉMOÏSATION PAR INSTANCE
+# --------------------------------------------------------------------------------
+class CalculsMemoises:
+    """Base des régimes : les résultats `@memoise` sont oubliés dès qu'un champ change.
+
+    Modifier un champ saisi d'une instance déjà construite relance aussi
+    `__post_init__` : les champs dérivés (montant emprunté, frais de notaire)
+    suivent la nouvelle valeur.
+    """
+
+    def __setattr__(self, nom, valeur):
+        object.__setattr__(self, nom, valeur)
+        self.__dict__.pop("_memo", None)
+        saisis, derives = _champs(type(self))
+        # Pendant __init__, les champs dérivés ne sont pas encore posés
+        if derives and nom in saisis and all(derive in self.__dict__ for derive in derives):
+            self.__post_init__()
+
+
+def memoise(methode):
+    """Calcule la méthode (sans argument) une seule fois par jeu de paramètres.
+
+    Le résultat est partagé entre les appels : il ne doit pas être modifié sur place.
+    """
+    nom = methode.__name__
+
+    @functools.wraps(methode)
+    def enveloppe(self):
+        memo = self.__dict__.setdefault("_memo", {})
+        if nom not in memo:
+            memo[nom] = methode(self)
+        return memo[nom]
+
+    return enveloppe
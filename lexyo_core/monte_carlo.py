@@ -0,0 +1,144 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from .regimes import indicateurs_annuels
+from .statistiques import StatistiquesFlux
+
+# Charges annuelles soumises à l'inflation, sous leurs différents noms selon les régimes
+CHAMPS_CHARGES = (
+    "charges_copro", "assurance", "assurance_habitation", "assurance_pno", "assurance_gli",
+    "taxe_fonciere", "frais_entretien", "frais_compta", "frais_bancaires",
+    "gestion_locative", "frais_gestion", "taxe_habitation",
+)
+
+NIVEAUX = (0.05, 0.5, 0.95)
+
+
+# --------------------------------------------------------------------------------
+# LOIS DE TIRAGE ET HYPOTHÈSES
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class Loi:
+    """Loi d'un paramètre incertain, bornée par [minimum, maximum].
+
+    'fixe' : a ; 'normale' : moyenne a, écart-type b ; 'uniforme' : entre a
+    et b ; 'triangulaire' : minimum a, mode b, maximum c.
+    """
+    type: str
+    a: float
+    b: float = 0.0
+    c: float = 0.0
+    minimum: float = -np.inf
+    maximum: float = np.inf
+
+    def tirer(self, generateur, forme):
+        if self.type == "fixe":
+            valeurs = np.full(forme, float(self.a))
+        elif self.type == "normale":
+            valeurs = generateur.normal(self.a, self.b, forme)
+        elif self.type == "uniforme":
+            valeurs = generateur.uniform(self.a, self.b, forme)
+        elif self.type == "triangulaire":
+            valeurs = generateur.triangular(self.a, self.b, self.c, forme)
+        else:
+            raise ValueError(f"Loi inconnue : {self.type!r}")
+        return np.clip(valeurs, self.minimum, self.maximum)
+
+
+@dataclass(frozen=True)
+class HypothesesMonteCarlo:
+    """Paramètres incertains ; `None` garde la valeur saisie pour le régime.
+
+    `ecart_loyer` (relatif, tiré une fois par chemin) s'applique au loyer
+    initial, `indexation_loyer` et `inflation_charges` (en %) sont tirées
+    chaque année à partir de la deuxième, `vacance_mois` chaque année et
+    `taux_interet` une fois par chemin (prêt à taux fixe).
+    """
+    ecart_loyer: Loi = None
+    vacance_mois: Loi = None
+    taux_interet: Loi = None
+    indexation_loyer: Loi = None
+    inflation_charges: Loi = None
+
+
+def _facteur_cumule(generateur, loi, n, horizon):
+    # Année 1 au niveau saisi, puis capitalisation des taux annuels tirés
+    if loi is None:
+        return np.ones((1, horizon))
+    taux = loi.tirer(generateur, (n, horizon - 1)) / 100
+    return np.concatenate((np.ones((n, 1)), np.cumprod(1 + taux, axis=1)), axis=1)
+
+
+def tirer_parametres(hypotheses, parametres, generateur, n, horizon):
+    """Paramètres tirés pour `n` chemins : (n, 1) par chemin, (n, horizon) par année."""
+    tirages = {}
+    loyer = np.asarray(parametres["loyer_mensuel_hc"], dtype=float)
+    if hypotheses.ecart_loyer is not None:
+        loyer = loyer * (1 + hypotheses.ecart_loyer.tirer(generateur, (n, 1)))
+    if hypotheses.ecart_loyer is not None or hypotheses.indexation_loyer is not None:
+        tirages["loyer_mensuel_hc"] = loyer * _facteur_cumule(generateur, hypotheses.indexation_loyer, n, horizon)
+    if hypotheses.vacance_mois is not None:
+        tirages["vacance_locative_mois"] = np.clip(hypotheses.vacance_mois.tirer(generateur, (n, horizon)), 0, 12)
+    if hypotheses.taux_interet is not None:
+        tirages["taux_interet"] = np.maximum(hypotheses.taux_interet.tirer(generateur, (n, 1)), 0.0)
+    if hypotheses.inflation_charges is not None:
+        inflation = _facteur_cumule(generateur, hypotheses.inflation_charges, n, horizon)
+        for champ in CHAMPS_CHARGES:
+            if champ in parametres:
+                tirages[champ] = parametres[champ] * inflation
+    return tirages
+
+
+# --------------------------------------------------------------------------------
+# MOTEUR MONTE CARLO PAR LOTS
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class ResultatMonteCarlo:
+    chemins: int
+    annees: np.ndarray
+    cashflow_moyen: np.ndarray
+    cashflow_quantiles: np.ndarray
+    proba_cashflow_negatif: np.ndarray
+    proba_cumul_negatif: float
+    impots_cumules: StatistiquesFlux
+
+    @property
+    def impots_quantiles(self):
+        return self.impots_cumules.quantiles(NIVEAUX)[:, 0]
+
+
+def simuler_monte_carlo(classe, parametres, hypotheses, chemins=10_000, taille_lot=10_000, graine=None):
+    """Simule `chemins` trajectoires du régime par lots de `taille_lot`.
+
+    Chaque lot est un seul calcul vectorisé du régime (paramètres tirés en
+    tableaux) ; seules des statistiques en flux sont conservées, la mémoire
+    est donc bornée par `taille_lot`. Le tirage est reproductible pour une
+    même graine et une même taille de lot. Quantiles : P5, P50 et P95.
+    """
+    champs = {champ.name for champ in fields(classe) if champ.init}
+    parametres = {nom: valeur for nom, valeur in parametres.items() if nom in champs}
+    horizon = parametres.get("horizon", 10)
+    generateur = np.random.default_rng(graine)
+
+    cashflow = StatistiquesFlux(colonnes=horizon)
+    cumul = StatistiquesFlux()
+    impots = StatistiquesFlux()
+    for debut in range(0, chemins, taille_lot):
+        n = min(taille_lot, chemins - debut)
+        tirages = tirer_parametres(hypotheses, parametres, generateur, n, horizon)
+        indicateurs = indicateurs_annuels(classe(**{**parametres, **tirages}))
+        cashflow_mensuel = np.broadcast_to(indicateurs["cashflow_mensuel"], (n, horizon))
+        cashflow.ajouter(cashflow_mensuel)
+        cumul.ajouter(cashflow_mensuel.sum(axis=1) * 12)
+        impots.ajouter(np.broadcast_to(indicateurs["impots"], (n, horizon)).sum(axis=1))
+
+    return ResultatMonteCarlo(
+        chemins=chemins,
+        annees=np.arange(1, horizon + 1),
+        cashflow_moyen=cashflow.moyenne,
+        cashflow_quantiles=cashflow.quantiles(NIVEAUX),
+        proba_cashflow_negatif=cashflow.part_negatifs,
+        proba_cumul_negatif=float(cumul.part_negatifs[0]),
+        impots_cumules=impots,
+    )
@@ -0,0 +1,129 @@
+import math
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from .sensibilite import INDICATEURS, axes_possibles, evaluer_indicateur
+
+
+# --------------------------------------------------------------------------------
+# RECHERCHE D'OBJECTIF (VALEUR D'UN PARAMÈTRE POUR UNE CIBLE DONNÉE)
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class SolutionObjectif:
+    variable: str
+    valeur: float
+    indicateur: str
+    cible: float
+    valeur_atteinte: float
+    evaluations: int
+    points_evalues: int
+
+
+def _premier_changement(ecarts):
+    # Premier intervalle [i, j] entre deux points évaluables consécutifs où l'écart
+    # à la cible change de signe (ou s'annule) ; les points non finis (TRI
+    # indéfini...) sont ignorés, l'intervalle peut donc en contenir
+    finis = np.flatnonzero(np.isfinite(ecarts))
+    signes = np.sign(ecarts[finis])
+    changements = np.flatnonzero(signes[:-1] * signes[1:] <= 0)
+    if not len(changements):
+        return None
+    return finis[changements[0]], finis[changements[0] + 1]
+
+
+def resoudre_objectif(classe, parametres, variable, borne_basse, borne_haute, cible,
+                      indicateur="cashflow_mensuel", annee=1, valeur_revente=None,
+                      points=16, tolerance=None, evaluations_max=40):
+    """Valeur de `variable` entre les bornes pour laquelle l'indicateur atteint `cible`.
+
+    Recherche encadrée par multisection : chaque appel au moteur évalue
+    `points` valeurs de l'intervalle courant en un seul calcul vectorisé,
+    puis l'intervalle est réduit à celui où l'écart à la cible change de
+    signe, soit un facteur `points + 1` par appel. S'il y a plusieurs
+    solutions, c'est la plus proche de `borne_basse` qui est retenue. Une
+    variable entière (durée, mois) est évaluée d'un coup sur toutes ses
+    valeurs et la solution est la première qui atteint ou franchit la cible.
+    ValueError si la cible n'est pas atteinte entre les bornes.
+    """
+    if variable not in axes_possibles(classe):
+        raise ValueError(f"{variable} ne peut pas être ajusté pour {classe.__name__}")
+    if indicateur not in INDICATEURS:
+        raise ValueError(f"Indicateur inconnu : {indicateur!r}")
+    if not borne_basse < borne_haute:
+        raise ValueError("La borne basse doit être inférieure à la borne haute")
+    entier = next(champ.type for champ in fields(classe) if champ.name == variable) is int
+    tolerance = tolerance or (borne_haute - borne_basse) * 1e-9
+    compteur = {"evaluations": 0, "points": 0}
+
+    def evaluer(valeurs):
+        lot = {**parametres, variable: valeurs[:, np.newaxis]}
+        return np.broadcast_to(evaluer_indicateur(classe, lot, indicateur, annee, valeur_revente), valeurs.shape)
+
+    def ecarts(valeurs):
+        compteur["evaluations"] += 1
+        compteur["points"] += len(valeurs)
+        try:
+            return evaluer(valeurs) - cible
+        except ValueError as erreur:
+            # Une partie des valeurs est refusée par le moteur (durée couverte par
+            # le différé...) : valeur par valeur, les refusées deviennent non finies
+            resultats = np.full(len(valeurs), np.nan)
+            for k in range(len(valeurs)):
+                try:
+                    resultats[k] = evaluer(valeurs[k:k + 1])[0]
+                except ValueError:
+                    pass
+            if np.isnan(resultats).all():
+                raise erreur
+            return resultats - cible
+
+    if entier:
+        valeurs = np.arange(math.ceil(borne_basse), math.floor(borne_haute) + 1)
+        e = ecarts(valeurs)
+        # Le côté de départ est celui de la première valeur évaluable
+        finis = np.flatnonzero(np.isfinite(e))
+        atteint = finis[(np.sign(e[finis]) != np.sign(e[finis[:1]])) | (e[finis] == 0)]
+        if not len(atteint):
+            raise ValueError(_hors_bornes(indicateur, cible, e))
+        solution = valeurs[atteint[0]]
+        return SolutionObjectif(
+            variable, int(solution), indicateur, cible, float(e[atteint[0]] + cible),
+            compteur["evaluations"], compteur["points"],
+        )
+
+    valeurs = np.linspace(borne_basse, borne_haute, points + 2)
+    e = ecarts(valeurs)
+    intervalle = _premier_changement(e)
+    if intervalle is None:
+        raise ValueError(_hors_bornes(indicateur, cible, e))
+    i, j = intervalle
+    bas, haut, e_bas, e_haut = valeurs[i], valeurs[j], e[i], e[j]
+
+    while haut - bas > tolerance and e_bas != 0 and compteur["evaluations"] < evaluations_max:
+        valeurs = np.linspace(bas, haut, points + 2)
+        e = np.concatenate(([e_bas], ecarts(valeurs[1:-1]), [e_haut]))
+        # Les bornes sont finies et encadrent la cible : un intervalle existe toujours
+        i, j = _premier_changement(e)
+        bas, haut, e_bas, e_haut = valeurs[i], valeurs[j], e[i], e[j]
+
+    # Interpolation linéaire dans le dernier intervalle encadrant
+    if e_bas == 0 or e_bas == e_haut:
+        solution = bas
+    else:
+        solution = bas - e_bas * (haut - bas) / (e_haut - e_bas)
+    atteinte = ecarts(np.array([solution]))[0] + cible
+    return SolutionObjectif(
+        variable, float(solution), indicateur, cible, float(atteinte),
+        compteur["evaluations"], compteur["points"],
+    )
+
+
+def _hors_bornes(indicateur, cible, ecarts):
+    valeurs = ecarts + cible
+    if not np.isfinite(valeurs).any():
+        return f"Cible {cible:,.2f} non atteinte : {INDICATEURS[indicateur]} non défini entre les bornes"
+    return (
+        f"Cible {cible:,.2f} non atteinte entre les bornes : {INDICATEURS[indicateur]} "
+        f"varie de {np.nanmin(valeurs):,.2f} à {np.nanmax(valeurs):,.2f}"
+    )
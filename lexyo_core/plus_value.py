@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Au-delà de cette durée de détention, tous les abattements sont acquis
+ANNEES_TABLE = 40
+
+TAUX_IR_PLUS_VALUE = 0.19
+TAUX_PRELEVEMENTS_SOCIAUX = 0.172
+TAUX_IR_LONG_TERME = 0.128
+
+# Forfaits des particuliers : frais d'acquisition (7,5 % du prix) et travaux
+# (15 % du prix, après cinq ans de détention)
+FORFAIT_FRAIS_ACQUISITION = 0.075
+FORFAIT_TRAVAUX = 0.15
+
+# Exonération des plus-values professionnelles (art. 151 septies) : totale
+# jusqu'à 90 000 € de recettes, dégressive jusqu'à 126 000 €
+SEUIL_EXONERATION_TOTALE = 90_000
+SEUIL_EXONERATION_PARTIELLE = 126_000
+
+
+# --------------------------------------------------------------------------------
+# TABLES D'ABATTEMENT PAR ANNÉE DE DÉTENTION
+# --------------------------------------------------------------------------------
+def _table(taux_par_annee):
+    # Cumul des taux annuels : la case n est l'abattement après n années pleines
+    taux = np.zeros(ANNEES_TABLE + 1)
+    for debut, fin, valeur in taux_par_annee:
+        taux[debut:fin + 1] = valeur
+    return np.minimum(np.cumsum(taux), 1.0)
+
+
+# Particuliers, impôt sur le revenu : 6 % de la 6e à la 21e année, 4 % la 22e
+ABATTEMENT_IR = _table([(6, 21, 0.06), (22, 22, 0.04)])
+# Particuliers, prélèvements sociaux : 1,65 % puis 1,60 % la 22e, 9 % de la 23e à la 30e
+ABATTEMENT_PS = _table([(6, 21, 0.0165), (22, 22, 0.016), (23, 30, 0.09)])
+# Plus-values professionnelles à long terme (art. 151 septies B) : 10 % par an après la 5e
+ABATTEMENT_LONG_TERME = _table([(6, 15, 0.10)])
+
+# Surtaxe des plus-values de plus de 50 000 € : (borne basse, borne haute,
+# taux, coefficient de lissage) ; dans la tranche de lissage, la surtaxe vaut
+# taux × PV − (borne haute − PV) × coefficient
+TRANCHES_SURTAXE = (
+    (50_000, 60_000, 0.02, 1 / 20),
+    (60_000, 100_000, 0.02, 0.0),
+    (100_000, 110_000, 0.03, 1 / 10),
+    (110_000, 150_000, 0.03, 0.0),
+    (150_000, 160_000, 0.04, 15 / 100),
+    (160_000, 200_000, 0.04, 0.0),
+    (200_000, 210_000, 0.05, 20 / 100),
+    (210_000, 250_000, 0.05, 0.0),
+    (250_000, 260_000, 0.06, 25 / 100),
+    (260_000, np.inf, 0.06, 0.0),
+)
+
+
+def _indice(annees):
+    return np.clip(np.asarray(annees), 0, ANNEES_TABLE).astype(np.int64)
+
+
+def surtaxe_plus_value(assiette):
+    """Surtaxe sur la plus-value imposable à l'IR d'un particulier, lissage compris."""
+    assiette = np.asarray(assiette, dtype=float)
+    surtaxe = np.zeros_like(assiette)
+    for bas, haut, taux, lissage in TRANCHES_SURTAXE:
+        dans_tranche = (assiette > bas) & (assiette <= haut)
+        montant = taux * assiette - (haut - assiette) * lissage if lissage else taux * assiette
+        surtaxe = np.where(dans_tranche, montant, surtaxe)
+    return surtaxe
+
+
+def impot_societes(resultat):
+    """IS au taux réduit de 15 % jusqu'à 42 500 €, 25 % au-delà (nul sur un déficit)."""
+    resultat = np.maximum(np.asarray(resultat, dtype=float), 0.0)
+    return np.minimum(resultat, 42500) * 0.15 + np.maximum(resultat - 42500, 0.0) * 0.25
+
+
+# --------------------------------------------------------------------------------
+# PLUS-VALUE DE CESSION SELON LE RÉGIME
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class PlusValue:
+    """Plus-value à la cession et imposition correspondante.
+
+    Tableaux diffusés sur les dimensions des entrées : une année de cession,
+    un prix ou un scénario par case.
+    """
+    prix_cession: np.ndarray
+    plus_value: np.ndarray
+    assiette_impot: np.ndarray
+    assiette_prelevements: np.ndarray
+    impot: np.ndarray
+    prelevements_sociaux: np.ndarray
+    surtaxe: np.ndarray
+
+    @property
+    def imposition(self):
+        return self.impot + self.prelevements_sociaux + self.surtaxe
+
+
+def plus_value_particulier(prix_cession, prix_acquisition, frais_acquisition, travaux, annees,
+                           amortissements=0.0, frais_cession=0.0):
+    """Plus-value immobilière des particuliers : 19 % d'IR, 17,2 % de prélèvements sociaux.
+
+    Les frais et travaux réels sont remplacés par les forfaits quand ceux-ci
+    sont plus favorables. `amortissements` (déduits en LMNP) minorent le prix
+    d'acquisition. Les abattements pour durée de détention sont lus dans
+    ABATTEMENT_IR et ABATTEMENT_PS à l'indice `annees`.
+    """
+    prix_acquisition = np.asarray(prix_acquisition, dtype=float)
+    annees = np.asarray(annees)
+    frais = np.maximum(frais_acquisition, prix_acquisition * FORFAIT_FRAIS_ACQUISITION)
+    travaux = np.where(annees > 5, np.maximum(travaux, prix_acquisition * FORFAIT_TRAVAUX), travaux)
+    plus_value = prix_cession - frais_cession - (prix_acquisition + frais + travaux - amortissements)
+
+    positive = np.maximum(plus_value, 0.0)
+    assiette_impot = positive * (1 - ABATTEMENT_IR[_indice(annees)])
+    assiette_prelevements = positive * (1 - ABATTEMENT_PS[_indice(annees)])
+    return PlusValue(
+        prix_cession=np.broadcast_to(prix_cession, plus_value.shape),
+        plus_value=plus_value,
+        assiette_impot=assiette_impot,
+        assiette_prelevements=assiette_prelevements,
+        impot=assiette_impot * TAUX_IR_PLUS_VALUE,
+        prelevements_sociaux=assiette_prelevements * TAUX_PRELEVEMENTS_SOCIAUX,
+        surtaxe=surtaxe_plus_value(assiette_impot),
+    )
+
+
+def plus_value_professionnelle(prix_cession, valeur_nette_comptable, amortissements, annees, tmi,
+                               recettes, taux_cotisations=TAUX_PRELEVEMENTS_SOCIAUX, frais_cession=0.0):
+    """Plus-value professionnelle (LMP, SARL de famille) sur la valeur nette comptable.
+
+    Court terme (à hauteur des amortissements, ou toute la plus-value avant
+    deux ans) : barème (`tmi`) et `taux_cotisations`. Long terme : abattement
+    ABATTEMENT_LONG_TERME puis 12,8 % d'IR et 17,2 % de prélèvements sociaux.
+    Après cinq ans, exonération selon les `recettes` annuelles (art. 151 septies).
+    """
+    annees = np.asarray(annees)
+    plus_value = np.asarray(prix_cession - frais_cession - valeur_nette_comptable, dtype=float)
+    positive = np.maximum(plus_value, 0.0)
+    court_terme = np.where(annees < 2, positive, np.minimum(positive, amortissements))
+    long_terme = (positive - court_terme) * (1 - ABATTEMENT_LONG_TERME[_indice(annees)])
+
+    exoneration = np.clip(
+        (SEUIL_EXONERATION_PARTIELLE - np.asarray(recettes, dtype=float))
+        / (SEUIL_EXONERATION_PARTIELLE - SEUIL_EXONERATION_TOTALE), 0.0, 1.0
+    )
+    imposable = np.where(annees >= 5, 1 - exoneration, 1.0)
+    court_terme = court_terme * imposable
+    long_terme = long_terme * imposable
+    assiette = court_terme + long_terme
+    return PlusValue(
+        prix_cession=np.broadcast_to(prix_cession, assiette.shape),
+        plus_value=np.broadcast_to(plus_value, assiette.shape),
+        assiette_impot=assiette,
+        assiette_prelevements=assiette,
+        impot=court_terme * np.asarray(tmi) / 100 + long_terme * TAUX_IR_LONG_TERME,
+        prelevements_sociaux=court_terme * taux_cotisations + long_terme * TAUX_PRELEVEMENTS_SOCIAUX,
+        surtaxe=np.zeros_like(assiette),
+    )
+
+
+def plus_value_societe(prix_cession, valeur_nette_comptable, resultat_net=0.0, frais_cession=0.0):
+    """Plus-value d'une société à l'IS : prix de cession moins valeur nette comptable.
+
+    Elle s'ajoute au résultat fiscal net de l'année de cession (déficits
+    reportés déduits) ; l'impôt est le supplément d'IS qui en résulte, négatif
+    pour une moins-value qui réduit l'IS de l'année.
+    """
+    plus_value = np.asarray(prix_cession - frais_cession - valeur_nette_comptable, dtype=float)
+    impot = impot_societes(resultat_net + plus_value) - impot_societes(resultat_net)
+    zeros = np.zeros_like(impot)
+    return PlusValue(
+        prix_cession=np.broadcast_to(prix_cession, impot.shape),
+        plus_value=np.broadcast_to(plus_value, impot.shape),
+        assiette_impot=np.broadcast_to(plus_value, impot.shape),
+        assiette_prelevements=zeros,
+        impot=impot,
+        prelevements_sociaux=zeros,
+        surtaxe=zeros,
+    )
@@ -0,0 +1,1502 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from . import deficits, emprunt, finance, plus_value
+from .memo import CalculsMemoises, memoise
+
+# Horizon de projection le plus long accepté, en années (régimes, API, lots)
+HORIZON_MAX = 40
+
+
+@dataclass(frozen=True)
+class CoutAcquisition:
+    frais_notaire: float
+    total_a_financer: float
+    montant_emprunt: float
+
+
+def cout_acquisition(prix_bien, frais_notaire_pct, frais_agence, frais_dossier, frais_garantie,
+                     frais_tiers, montant_travaux, apport):
+    """Coût total de l'opération et montant emprunté, identiques pour tous les régimes."""
+    frais_notaire = prix_bien * frais_notaire_pct / 100
+    total = (prix_bien + frais_notaire + frais_agence + frais_dossier +
+             frais_garantie + frais_tiers + montant_travaux)
+    return CoutAcquisition(frais_notaire, total, np.maximum(0, total - apport))
+
+
+def verifier_horizon(horizon):
+    """ValueError si l'horizon n'est pas un nombre d'années entre 1 et HORIZON_MAX."""
+    if not 1 <= horizon <= HORIZON_MAX:
+        raise ValueError(f"horizon doit être compris entre 1 et {HORIZON_MAX}")
+
+
+def _dataframe(colonnes):
+    # Simulation en lot (paramètres en tableaux (..., 1)) : les colonnes sont
+    # renvoyées en tableaux (..., années), constantes comprises.
+    if any(np.ndim(valeur) > 1 for valeur in colonnes.values()):
+        forme = np.broadcast_shapes(*(np.shape(valeur) for valeur in colonnes.values()))
+        return {nom: np.broadcast_to(valeur, forme) for nom, valeur in colonnes.items()}
+    # pandas n'est chargé qu'au premier tableau demandé : l'import du cœur
+    # reste léger pour l'API et les traitements par lots.
+    import pandas as pd
+    return pd.DataFrame(colonnes)
+
+
+def _cession(simulation, prix_cession, annee):
+    """Prix et années de cession communs aux méthodes `plus_value` des régimes.
+
+    La cession a lieu en fin d'année `annee` (par défaut l'horizon), après
+    `annee` années pleines de détention, au `prix_cession` (par défaut le prix
+    d'achat). Les deux peuvent être des tableaux : toutes les cessions sont
+    évaluées en un calcul.
+    """
+    annees = np.asarray(simulation.horizon if annee is None else annee)
+    if np.any((annees < 1) | (annees > simulation.horizon)):
+        raise ValueError(f"Année de cession hors de l'horizon (1 à {simulation.horizon})")
+    return simulation.prix_bien if prix_cession is None else prix_cession, annees
+
+
+def _en_fin_annee(serie, annees, cumul=False):
+    # Valeur (ou cumul) d'une série annuelle (..., horizon) à chaque année de cession
+    serie = np.asarray(serie, dtype=float)
+    if cumul:
+        serie = np.cumsum(serie, axis=-1)
+    return np.take(serie, annees - 1, axis=-1)
+
+
+def _valeur_nette_comptable(simulation, annees):
+    # Coût d'entrée à l'actif diminué des amortissements pratiqués
+    cout = (simulation.prix_bien + simulation.frais_notaire + simulation.frais_dossier +
+            simulation.frais_agence + simulation.frais_garantie + simulation.frais_tiers +
+            simulation.montant_travaux + simulation.mobilier)
+    amortis = _en_fin_annee(simulation.amortissements()['Total Amortissement'], annees, cumul=True)
+    return cout - amortis, amortis
+
+
+# --------------------------------------------------------------------------------
+# CLASSE LMNP RÉEL
+# --------------------------------------------------------------------------------
+@dataclass
+class LMNPReel(CalculsMemoises):
+    prix_bien: float
+    part_terrain: float
+    apport: float
+    frais_dossier: float
+    frais_agence: float
+    montant_travaux: float
+    frais_garantie: float
+    frais_tiers: float
+    mobilier: float
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+    charges_copro: float
+    assurance_habitation: float
+    assurance_gli: float
+    taxe_fonciere: float
+    frais_entretien: float
+    frais_compta: float
+    frais_bancaires: float
+    gestion_locative: float
+    taxe_habitation: float
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+    tmi: float
+    frais_notaire_pct: float = 8.0
+    horizon: int = 10
+    differe_partiel: bool = False
+    duree_amort_bati: int = 30
+    duree_amort_mobilier: int = 7
+    montant_emprunt: float = field(init=False)
+    duree_report_deficit: int = 10
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+        cout = cout_acquisition(
+            self.prix_bien, self.frais_notaire_pct, self.frais_agence, self.frais_dossier,
+            self.frais_garantie, self.frais_tiers, self.montant_travaux, self.apport
+        )
+        self.montant_emprunt = cout.montant_emprunt
+
+    @memoise
+    def mensualite_emprunt(self):
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def tableau_amortissement(self):
+        ech = emprunt.echeancier_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+        return _dataframe({
+            'Mois': ech.mois,
+            'Année': ech.annee,
+            'Capital restant dû': ech.capital_restant,
+            'Intérêts': ech.interets,
+            'Principal remboursé': ech.principal,
+            'Assurance': ech.assurance
+        })
+
+    @memoise
+    def amortissements(self):
+        annees = np.arange(1, self.horizon + 1)
+        valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
+        bati = valeur_bati / self.duree_amort_bati
+        mobilier = self.mobilier / self.duree_amort_mobilier
+        hors_differe = annees > self.differe_mois // 12
+        amort_bati = np.where(hors_differe & (annees <= self.duree_amort_bati), bati, 0.0)
+        amort_mobilier = np.where(hors_differe & (annees <= self.duree_amort_mobilier), mobilier, 0.0)
+        return _dataframe({
+            'Année': annees,
+            'Amortissement Bâti': amort_bati,
+            'Amortissement Mobilier': amort_mobilier,
+            'Total Amortissement': amort_bati + amort_mobilier
+        })
+
+    @memoise
+    def echeancier_annuel(self):
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        amort = np.asarray(self.amortissements()['Total Amortissement'])
+        annuel = self.echeancier_annuel()
+        interets = annuel.sur_horizon('interets', self.horizon)
+        annuites = annuel.annuites_sur_horizon(self.horizon)
+
+        revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+        charges = (self.charges_copro + self.assurance_habitation + self.assurance_gli +
+                   self.taxe_fonciere + self.frais_entretien + self.frais_compta +
+                   self.frais_bancaires + self.gestion_locative + self.taxe_habitation)
+        charges_recup = self.charges_copro * 0.8
+
+        resultats_bruts = revenus - charges - interets - amort
+        report = deficits.imputer_deficits(resultats_bruts, duree_report=self.duree_report_deficit)
+        resultat_fiscal = report.imposable
+
+        impot = resultat_fiscal * self.tmi / 100
+        cashflow_mensuel = (revenus - charges - impot - annuites + charges_recup) / 12
+
+        return _dataframe({
+            'Année': annees,
+            'Revenus nets': revenus,
+            'Charges': charges,
+            'Charges récupérables': charges_recup,
+            'Intérêts': interets,
+            'Amortissements': amort,
+            'Résultat fiscal': resultat_fiscal,
+            'Impôt': impot,
+            'Cashflow mensuel': np.round(cashflow_mensuel, 2)
+        })
+
+    def plus_value(self, prix_cession=None, annee=None):
+        """Plus-value des particuliers à la cession (voir `_cession`).
+
+        Les amortissements du bâti déduits pendant la location minorent le
+        prix d'acquisition (réintégration en LMNP).
+        """
+        prix, annees = _cession(self, prix_cession, annee)
+        amortis = _en_fin_annee(self.amortissements()['Amortissement Bâti'], annees, cumul=True)
+        frais_notaire = self.prix_bien * self.frais_notaire_pct / 100
+        return plus_value.plus_value_particulier(
+            prix,
+            self.prix_bien, frais_notaire + self.frais_agence, self.montant_travaux, annees, amortis
+        )
+
+
+# --------------------------------------------------------------------------------
+# CLASSE SCI À L'IS
+# --------------------------------------------------------------------------------
+@dataclass
+class SCIaIS(CalculsMemoises):
+    prix_bien: float
+    part_terrain: float
+    apport: float
+    frais_dossier: float
+    frais_agence: float
+    montant_travaux: float
+    frais_garantie: float
+    frais_tiers: float
+    mobilier: float
+
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+
+    charges_copro: float
+    assurance: float
+    assurance_gli: float
+    taxe_fonciere: float
+    frais_entretien: float
+    frais_compta: float
+    frais_bancaires: float
+    gestion_locative: float
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+
+    duree_amort_bati: int
+    duree_amort_travaux: int
+    duree_amort_mobilier: int
+    duree_amort_frais: int
+
+    frais_notaire_pct: float = 8.0
+    horizon: int = 10
+    differe_partiel: bool = False
+    montant_emprunt: float = field(init=False)
+    frais_notaire: float = field(init=False)
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+        cout = cout_acquisition(
+            self.prix_bien, self.frais_notaire_pct, self.frais_agence, self.frais_dossier,
+            self.frais_garantie, self.frais_tiers, self.montant_travaux, self.apport
+        )
+        self.frais_notaire = cout.frais_notaire
+        self.montant_emprunt = cout.montant_emprunt
+
+    @memoise
+    def mensualite_emprunt(self):
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def tableau_amortissement_emprunt(self):
+        ech = emprunt.echeancier_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+        return _dataframe({
+            'Mois': ech.mois,
+            'Année': ech.annee,
+            'Intérêts': ech.interets,
+            'Principal': ech.principal,
+            'Assurance': ech.assurance,
+            'Capital restant dû': ech.capital_restant
+        })
+
+    @memoise
+    def amortissements(self):
+        annees = np.arange(1, self.horizon + 1)
+        valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
+        frais_annexes = self.frais_dossier + self.frais_agence + self.frais_garantie + self.frais_tiers
+        bati = np.where(annees <= self.duree_amort_bati, valeur_bati / self.duree_amort_bati, 0.0)
+        mobilier = np.where(annees <= self.duree_amort_mobilier, self.mobilier / self.duree_amort_mobilier, 0.0)
+        travaux = np.where(annees <= self.duree_amort_travaux, self.montant_travaux / self.duree_amort_travaux, 0.0)
+        frais = np.where(annees <= self.duree_amort_frais, frais_annexes / self.duree_amort_frais, 0.0)
+        return _dataframe({
+            'Année': annees,
+            'Amortissement Bâti': bati,
+            'Amortissement Mobilier': mobilier,
+            'Amortissement Travaux': travaux,
+            'Amortissement Frais': frais,
+            'Total Amortissement': bati + mobilier + travaux + frais
+        })
+
+    @memoise
+    def echeancier_annuel(self):
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        amort = np.asarray(self.amortissements()['Total Amortissement'])
+        annuel = self.echeancier_annuel()
+        interets = annuel.sur_horizon('interets', self.horizon)
+        assurances = annuel.sur_horizon('assurance', self.horizon)
+        annuites = annuel.annuites_sur_horizon(self.horizon)
+
+        revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+        charges_reelles = (
+            self.charges_copro + self.assurance + self.assurance_gli +
+            self.taxe_fonciere + self.frais_entretien + self.frais_compta +
+            self.frais_bancaires + self.gestion_locative
+        )
+        charges_recup = self.charges_copro * 0.8
+        charges_fiscales = charges_reelles - charges_recup
+
+        resultats_bruts = revenus - charges_fiscales - interets - assurances - amort
+        report = deficits.imputer_deficits(resultats_bruts)
+        resultat_net = report.resultat_net
+
+        is_impot = np.where(
+            resultat_net < 0, 0.0,
+            np.where(resultat_net <= 42500, resultat_net * 0.15, 42500 * 0.15 + (resultat_net - 42500) * 0.25)
+        )
+        cashflow_mensuel = (revenus - charges_reelles - is_impot - annuites + charges_recup) / 12
+
+        return _dataframe({
+            'Année': annees,
+            'Revenus': revenus,
+            'Charges réelles': charges_reelles,
+            'Charges récupérables': charges_recup,
+            'Intérêts': interets,
+            'Assurance': assurances,
+            'Amortissements': amort,
+            'Résultat fiscal brut': resultats_bruts,
+            'Résultat fiscal net': resultat_net,
+            'Déficit reportable': np.where(report.reportable > 0, -report.reportable, 0.0),
+            'IS': is_impot,
+            'Cashflow mensuel (€)': np.round(cashflow_mensuel, 2)
+        })
+
+    def plus_value(self, prix_cession=None, annee=None):
+        """Plus-value à l'IS à la cession (voir `_cession`).
+
+        Calculée sur la valeur nette comptable et ajoutée au résultat fiscal
+        net de l'année.
+        """
+        prix, annees = _cession(self, prix_cession, annee)
+        valeur_nette, _ = _valeur_nette_comptable(self, annees)
+        resultat_net = _en_fin_annee(self.resultat_fiscal_annuel()['Résultat fiscal net'], annees)
+        return plus_value.plus_value_societe(
+            prix, valeur_nette, resultat_net
+        )
+
+
+# --------------------------------------------------------------------------------
+# CLASSE MICRO BIC
+# --------------------------------------------------------------------------------
+@dataclass
+class MicroBIC(CalculsMemoises):
+    # Revenus
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+
+    # Charges réelles non déductibles
+    charges_copro: float
+    taxe_fonciere: float
+    frais_gestion: float
+    assurance_pno: float
+    assurance_gli: float
+
+    # Emprunt
+    montant_emprunt: float
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+
+    # Fiscalité
+    tmi: float
+    csg_crds: float = 17.2
+    abattement: float = 0.5
+    plafond_microbic: float = 77700
+    horizon: int = 10
+    differe_partiel: bool = False
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+
+    def revenus_annuels(self):
+        return self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+
+    def revenu_imposable(self):
+        return self.revenus_annuels() * (1 - self.abattement)
+
+    def impot_ir(self):
+        return self.revenu_imposable() * (self.tmi / 100)
+
+    def prelevements_sociaux(self):
+        return self.revenu_imposable() * (self.csg_crds / 100)
+
+    @memoise
+    def mensualite_emprunt(self):
+        if np.all(np.asarray(self.duree_annees) * 12 - self.differe_mois <= 0):
+            return 0
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def annuites(self):
+        """Sommes payées chaque année pour l'emprunt, différé compris, sur l'horizon."""
+        if np.all(np.asarray(self.duree_annees) * 12 - self.differe_mois <= 0):
+            return np.zeros(self.horizon)
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        ).annuites_sur_horizon(self.horizon)
+
+    def charges_non_recup(self):
+        return (
+            self.taxe_fonciere +
+            self.frais_gestion +
+            self.assurance_pno +
+            self.assurance_gli +
+            self.charges_copro * 0.2
+        )
+
+    def cashflow_annuel(self):
+        return (
+            self.revenus_annuels()
+            - self.impot_ir()
+            - self.prelevements_sociaux()
+            - self.charges_non_recup()
+            - self.annuites()
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        revenu_brut = self.revenus_annuels()
+        revenu_net = self.revenu_imposable()
+        ir = self.impot_ir()
+        ps = self.prelevements_sociaux()
+        annuites = self.annuites()
+        charges_non_recup = self.charges_non_recup()
+        cashflow = revenu_brut - ir - ps - charges_non_recup - annuites
+
+        return _dataframe({
+            "Année": annees,
+            "Revenus bruts": np.round(revenu_brut, 2),
+            "Abattement 50%": np.round(revenu_brut * self.abattement, 2),
+            "Revenu imposable": np.round(revenu_net, 2),
+            "IR (TMI)": np.round(ir, 2),
+            "Prélèvements sociaux (17.2%)": np.round(ps, 2),
+            "Charges non récupérables": np.round(charges_non_recup, 2),
+            "Mensualité de prêt (avec assurance)": np.round(annuites / 12, 2),
+            "💡 Remarque": "Aucune charge déductible fiscalement",
+            "Cashflow mensuel (€)": np.round(cashflow / 12, 2)
+        })
+
+
+# --------------------------------------------------------------------------------
+# CLASSE SCI À L'IR
+# --------------------------------------------------------------------------------
+@dataclass
+class SCIaIR(CalculsMemoises):
+    prix_bien: float
+    part_terrain: float
+    apport: float
+    frais_dossier: float
+    frais_agence: float
+    montant_travaux: float
+    frais_garantie: float
+    frais_tiers: float
+
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+
+    charges_copro: float
+    assurance: float
+    assurance_gli: float
+    taxe_fonciere: float
+    frais_entretien: float
+    frais_compta: float
+    frais_bancaires: float
+    gestion_locative: float
+
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+    tmi: float
+
+    frais_notaire_pct: float = 8.0
+    horizon: int = 10
+    differe_partiel: bool = False
+    duree_report_deficit: int = 10
+    montant_emprunt: float = field(init=False)
+    frais_notaire: float = field(init=False)
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+        cout = cout_acquisition(
+            self.prix_bien, self.frais_notaire_pct, self.frais_agence, self.frais_dossier,
+            self.frais_garantie, self.frais_tiers, self.montant_travaux, self.apport
+        )
+        self.frais_notaire = cout.frais_notaire
+        self.montant_emprunt = cout.montant_emprunt
+
+    @memoise
+    def mensualite_emprunt(self):
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def tableau_amortissement_emprunt(self):
+        ech = emprunt.echeancier_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+        return _dataframe({
+            'Mois': ech.mois,
+            'Année': ech.annee,
+            'Intérêts': ech.interets,
+            'Principal': ech.principal,
+            'Assurance': ech.assurance,
+            'Capital restant dû': ech.capital_restant
+        })
+
+    @memoise
+    def echeancier_annuel(self):
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        annuel = self.echeancier_annuel()
+        interets = annuel.sur_horizon('interets', self.horizon)
+        assurances = annuel.sur_horizon('assurance', self.horizon)
+        annuites = annuel.annuites_sur_horizon(self.horizon)
+
+        revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+        charges_reelles = (
+            self.charges_copro + self.assurance + self.assurance_gli +
+            self.taxe_fonciere + self.frais_entretien + self.frais_compta +
+            self.frais_bancaires + self.gestion_locative
+        )
+        charges_recup = self.charges_copro * 0.8
+
+        resultats_fonciers = revenus - charges_reelles - interets - assurances
+        report = deficits.imputer_deficits(resultats_fonciers, duree_report=self.duree_report_deficit)
+        resultat_fiscal = report.resultat_net
+
+        ir = np.where(resultat_fiscal < 0, 0.0, resultat_fiscal * (self.tmi / 100))
+        cashflow_mensuel = (revenus - charges_reelles - ir - annuites + charges_recup) / 12
+
+        return _dataframe({
+            'Année': annees,
+            'Revenus': revenus,
+            'Charges réelles': charges_reelles,
+            'Charges récupérables': charges_recup,
+            'Intérêts': interets,
+            'Assurance': assurances,
+            'Résultat foncier': resultats_fonciers,
+            'Résultat fiscal après report': resultat_fiscal,
+            'Déficit reportable': np.where(report.reportable > 0, -report.reportable, 0.0),
+            'Impôt sur le revenu (IR)': ir,
+            'Cashflow mensuel (€)': np.round(cashflow_mensuel, 2)
+        })
+
+    def plus_value(self, prix_cession=None, annee=None):
+        """Plus-value des particuliers à la cession (voir `_cession`)."""
+        prix, annees = _cession(self, prix_cession, annee)
+        return plus_value.plus_value_particulier(
+            prix,
+            self.prix_bien, self.frais_notaire + self.frais_agence, self.montant_travaux, annees
+        )
+
+
+# --------------------------------------------------------------------------------
+# CLASSE LOCATION NUE
+# --------------------------------------------------------------------------------
+@dataclass
+class LocationNue(CalculsMemoises):
+    prix_bien: float
+    apport: float
+    frais_dossier: float
+    frais_agence: float
+    montant_travaux: float
+    frais_garantie: float
+    frais_tiers: float
+
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+
+    charges_copro: float
+    taxe_fonciere: float
+    frais_entretien: float
+    frais_bancaires: float
+    gestion_locative: float
+
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+    tmi: float  # Tranche marginale d'imposition
+
+    frais_notaire_pct: float = 8.0
+    horizon: int = 10
+    differe_partiel: bool = False
+    duree_report_deficit: int = 10
+    montant_emprunt: float = field(init=False)
+    frais_notaire: float = field(init=False)
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+        cout = cout_acquisition(
+            self.prix_bien, self.frais_notaire_pct, self.frais_agence, self.frais_dossier,
+            self.frais_garantie, self.frais_tiers, self.montant_travaux, self.apport
+        )
+        self.frais_notaire = cout.frais_notaire
+        self.montant_emprunt = cout.montant_emprunt
+
+    @memoise
+    def mensualite_emprunt(self):
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def tableau_amortissement_emprunt(self):
+        ech = emprunt.echeancier_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+        return _dataframe({
+            'Mois': ech.mois,
+            'Année': ech.annee,
+            'Intérêts': ech.interets,
+            'Principal': ech.principal,
+            'Assurance': ech.assurance,
+            'Capital restant dû': ech.capital_restant
+        })
+
+    @memoise
+    def echeancier_annuel(self):
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        annuel = self.echeancier_annuel()
+        interets = annuel.sur_horizon('interets', self.horizon)
+        assurances = annuel.sur_horizon('assurance', self.horizon)
+        annuites = annuel.annuites_sur_horizon(self.horizon)
+
+        revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+
+        charges_non_recup = (
+            self.taxe_fonciere + self.frais_entretien +
+            self.frais_bancaires + self.gestion_locative +
+            self.charges_copro * 0.2  # 20% non récupérables
+        )
+
+        charges_recup = self.charges_copro * 0.8  # 80% récupérables
+
+        resultats_fonciers = revenus - charges_non_recup - interets - assurances
+        report = deficits.imputer_deficits(resultats_fonciers, duree_report=self.duree_report_deficit)
+        resultat_fiscal = report.resultat_net
+
+        ir = np.where(resultat_fiscal < 0, 0.0, resultat_fiscal * (self.tmi / 100))
+        cashflow_mensuel = (revenus - charges_non_recup - ir - annuites + charges_recup) / 12
+
+        return _dataframe({
+            'Année': annees,
+            'Revenus': revenus,
+            'Charges non récupérables': np.round(charges_non_recup, 2),
+            'Charges récupérables': np.round(charges_recup, 2),
+            'Intérêts': np.round(interets, 2),
+            'Assurance': np.round(assurances, 2),
+            'Résultat foncier': np.round(resultats_fonciers, 2),
+            'Résultat fiscal après report': np.round(resultat_fiscal, 2),
+            'Déficit reportable': np.where(report.reportable > 0, np.round(-report.reportable, 2), 0.0),
+            'IR': np.round(ir, 2),
+            'Cashflow mensuel (€)': np.round(cashflow_mensuel, 2)
+        })
+
+    def plus_value(self, prix_cession=None, annee=None):
+        """Plus-value des particuliers à la cession (voir `_cession`)."""
+        prix, annees = _cession(self, prix_cession, annee)
+        return plus_value.plus_value_particulier(
+            prix,
+            self.prix_bien, self.frais_notaire + self.frais_agence, self.montant_travaux, annees
+        )
+
+
+# --------------------------------------------------------------------------------
+# CLASSE MICRO-FONCIER
+# --------------------------------------------------------------------------------
+@dataclass
+class MicroFoncier(CalculsMemoises):
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+    tmi: float
+
+    prix_bien: float
+    apport: float
+    frais_dossier: float
+    frais_agence: float
+    montant_travaux: float
+    frais_garantie: float
+    frais_tiers: float
+
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+
+    charges_copro: float
+    taxe_fonciere: float
+    frais_entretien: float
+    frais_bancaires: float
+    gestion_locative: float
+
+    frais_notaire_pct: float = 8.0
+    horizon: int = 10
+    differe_partiel: bool = False
+    csg_crds: float = 17.2
+    abattement: float = 0.3
+    plafond_microfoncier: float = 15000
+    montant_emprunt: float = field(init=False)
+    frais_notaire: float = field(init=False)
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+        cout = cout_acquisition(
+            self.prix_bien, self.frais_notaire_pct, self.frais_agence, self.frais_dossier,
+            self.frais_garantie, self.frais_tiers, self.montant_travaux, self.apport
+        )
+        self.frais_notaire = cout.frais_notaire
+        self.montant_emprunt = cout.montant_emprunt
+
+    def revenus_annuels(self):
+        return self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+
+    @memoise
+    def mensualite_emprunt(self):
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def tableau_amortissement_emprunt(self):
+        ech = emprunt.echeancier_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+        return _dataframe({
+            'Mois': ech.mois,
+            'Année': ech.annee,
+            'Intérêts': ech.interets,
+            'Principal': ech.principal,
+            'Assurance': ech.assurance,
+            'Capital restant dû': ech.capital_restant
+        })
+
+    @memoise
+    def echeancier_annuel(self):
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        annuel = self.echeancier_annuel()
+        interets = annuel.sur_horizon('interets', self.horizon)
+        assurances = annuel.sur_horizon('assurance', self.horizon)
+        annuites = annuel.annuites_sur_horizon(self.horizon)
+
+        revenus = self.revenus_annuels()
+        revenu_imposable = revenus * (1 - self.abattement)
+        ir = revenu_imposable * (self.tmi / 100)
+        ps = revenu_imposable * (self.csg_crds / 100)
+
+        charges_reelles = (
+            self.charges_copro + self.taxe_fonciere + self.frais_entretien +
+            self.frais_bancaires + self.gestion_locative
+        )
+        charges_recup = self.charges_copro * 0.8
+
+        cashflow = (revenus - charges_reelles - ir - ps + charges_recup - annuites) / 12
+
+        return _dataframe({
+            "Année": annees,
+            "Revenus bruts": np.round(revenus, 2),
+            "Revenu imposable (abattement 30%)": np.round(revenu_imposable, 2),
+            "IR (TMI)": np.round(ir, 2),
+            "Prélèvements sociaux (17.2%)": np.round(ps, 2),
+            "Charges réelles": np.round(charges_reelles, 2),
+            "Intérêts": np.round(interets, 2),
+            "Assurance emprunt": np.round(assurances, 2),
+            "Charges récupérables": np.round(charges_recup, 2),
+            "Mensualité emprunt (annuelle)": np.round(annuites, 2),
+            "Cashflow mensuel": np.round(cashflow, 2)
+        })
+
+    def plus_value(self, prix_cession=None, annee=None):
+        """Plus-value des particuliers à la cession (voir `_cession`)."""
+        prix, annees = _cession(self, prix_cession, annee)
+        return plus_value.plus_value_particulier(
+            prix,
+            self.prix_bien, self.frais_notaire + self.frais_agence, self.montant_travaux, annees
+        )
+
+
+# --------------------------------------------------------------------------------
+# CLASSE LMP RÉEL
+# --------------------------------------------------------------------------------
+@dataclass
+class LMPReel(CalculsMemoises):
+    prix_bien: float
+    part_terrain: float
+    apport: float
+    frais_dossier: float
+    frais_agence: float
+    montant_travaux: float
+    frais_garantie: float
+    frais_tiers: float
+    mobilier: float
+
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+
+    charges_copro: float
+    assurance: float
+    assurance_gli: float
+    taxe_fonciere: float
+    frais_entretien: float
+    frais_compta: float
+    frais_bancaires: float
+    gestion_locative: float
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+    tmi: float
+
+    duree_amort_bati: int
+    duree_amort_travaux: int
+    duree_amort_mobilier: int
+    duree_amort_frais: int
+
+    frais_notaire_pct: float = 8.0
+    horizon: int = 10
+    differe_partiel: bool = False
+    duree_report_deficit: int = 10
+    montant_emprunt: float = field(init=False)
+    frais_notaire: float = field(init=False)
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+        cout = cout_acquisition(
+            self.prix_bien, self.frais_notaire_pct, self.frais_agence, self.frais_dossier,
+            self.frais_garantie, self.frais_tiers, self.montant_travaux, self.apport
+        )
+        self.frais_notaire = cout.frais_notaire
+        self.montant_emprunt = cout.montant_emprunt
+
+    @memoise
+    def mensualite_emprunt(self):
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def tableau_amortissement_emprunt(self):
+        ech = emprunt.echeancier_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+        return _dataframe({
+            'Mois': ech.mois,
+            'Année': ech.annee,
+            'Intérêts': ech.interets,
+            'Principal': ech.principal,
+            'Assurance': ech.assurance,
+            'Capital restant dû': ech.capital_restant
+        })
+
+    @memoise
+    def amortissements(self):
+        annees = np.arange(1, self.horizon + 1)
+        valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
+        frais_annexes = self.frais_dossier + self.frais_agence + self.frais_garantie + self.frais_tiers
+        bati = np.where(annees <= self.duree_amort_bati, valeur_bati / self.duree_amort_bati, 0.0)
+        mobilier = np.where(annees <= self.duree_amort_mobilier, self.mobilier / self.duree_amort_mobilier, 0.0)
+        travaux = np.where(annees <= self.duree_amort_travaux, self.montant_travaux / self.duree_amort_travaux, 0.0)
+        frais = np.where(annees <= self.duree_amort_frais, frais_annexes / self.duree_amort_frais, 0.0)
+        return _dataframe({
+            'Année': annees,
+            'Amortissement Bâti': bati,
+            'Amortissement Mobilier': mobilier,
+            'Amortissement Travaux': travaux,
+            'Amortissement Frais': frais,
+            'Total Amortissement': bati + mobilier + travaux + frais
+        })
+
+    @memoise
+    def echeancier_annuel(self):
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        amort = np.asarray(self.amortissements()['Total Amortissement'])
+        annuel = self.echeancier_annuel()
+        interets = annuel.sur_horizon('interets', self.horizon)
+        assurances = annuel.sur_horizon('assurance', self.horizon)
+        annuites = annuel.annuites_sur_horizon(self.horizon)
+
+        revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+        charges_reelles = (
+            self.charges_copro + self.assurance + self.assurance_gli +
+            self.taxe_fonciere + self.frais_entretien + self.frais_compta +
+            self.frais_bancaires + self.gestion_locative
+        )
+        charges_recup = self.charges_copro * 0.8
+
+        resultats_bruts = revenus - charges_reelles - interets - assurances - amort
+        report = deficits.imputer_deficits(resultats_bruts, duree_report=self.duree_report_deficit)
+        resultat_net = report.resultat_net
+
+        ir = np.where(resultat_net < 0, 0.0, resultat_net * (self.tmi / 100))
+        ssi = np.where(resultat_net < 0, 0.0, resultat_net * 0.40)
+        cashflow_mensuel = (revenus - charges_reelles - ir - ssi - annuites + charges_recup) / 12
+
+        return _dataframe({
+            'Année': annees,
+            'Revenus': revenus,
+            'Charges réelles': charges_reelles,
+            'Charges récupérables': charges_recup,
+            'Intérêts': interets,
+            'Assurance': assurances,
+            'Amortissements': amort,
+            'Résultat fiscal brut': resultats_bruts,
+            'Résultat fiscal net': resultat_net,
+            'Déficit reportable': np.where(report.reportable > 0, -report.reportable, 0.0),
+            'IR (TMI)': np.round(ir, 2),
+            'Cotisations sociales (SSI)': np.round(ssi, 2),
+            'Cashflow mensuel (€)': np.round(cashflow_mensuel, 2)
+        })
+
+    def plus_value(self, prix_cession=None, annee=None):
+        """Plus-value professionnelle à la cession (voir `_cession`).
+
+        Court terme à hauteur des amortissements (barème et SSI), long terme au-delà.
+        """
+        prix, annees = _cession(self, prix_cession, annee)
+        valeur_nette, amortis = _valeur_nette_comptable(self, annees)
+        recettes = _en_fin_annee(self.resultat_fiscal_annuel()['Revenus'], annees)
+        return plus_value.plus_value_professionnelle(
+            prix,
+            valeur_nette, amortis, annees, self.tmi, recettes, taux_cotisations=0.40
+        )
+
+
+# --------------------------------------------------------------------------------
+# CLASSE SARL DE FAMILLE
+# --------------------------------------------------------------------------------
+@dataclass
+class SARLDeFamille(CalculsMemoises):
+    prix_bien: float
+    part_terrain: float
+    apport: float
+    frais_dossier: float
+    frais_agence: float
+    montant_travaux: float
+    frais_garantie: float
+    frais_tiers: float
+    mobilier: float
+
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+
+    charges_copro: float
+    assurance: float
+    assurance_gli: float
+    taxe_fonciere: float
+    frais_entretien: float
+    frais_compta: float
+    frais_bancaires: float
+    gestion_locative: float
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+    tmi: float
+
+    duree_amort_bati: int
+    duree_amort_travaux: int
+    duree_amort_mobilier: int
+    duree_amort_frais: int
+
+    frais_notaire_pct: float = 8.0
+    horizon: int = 10
+    differe_partiel: bool = False
+    duree_report_deficit: int = 10
+    montant_emprunt: float = field(init=False)
+    frais_notaire: float = field(init=False)
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+        cout = cout_acquisition(
+            self.prix_bien, self.frais_notaire_pct, self.frais_agence, self.frais_dossier,
+            self.frais_garantie, self.frais_tiers, self.montant_travaux, self.apport
+        )
+        self.frais_notaire = cout.frais_notaire
+        self.montant_emprunt = cout.montant_emprunt
+
+    @memoise
+    def mensualite_emprunt(self):
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def tableau_amortissement_emprunt(self):
+        ech = emprunt.echeancier_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+        return _dataframe({
+            'Mois': ech.mois,
+            'Année': ech.annee,
+            'Intérêts': ech.interets,
+            'Principal': ech.principal,
+            'Assurance': ech.assurance,
+            'Capital restant dû': ech.capital_restant
+        })
+
+    @memoise
+    def amortissements(self):
+        annees = np.arange(1, self.horizon + 1)
+        valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
+        frais_annexes = self.frais_dossier + self.frais_agence + self.frais_garantie + self.frais_tiers
+        bati = np.where(annees <= self.duree_amort_bati, valeur_bati / self.duree_amort_bati, 0.0)
+        mobilier = np.where(annees <= self.duree_amort_mobilier, self.mobilier / self.duree_amort_mobilier, 0.0)
+        travaux = np.where(annees <= self.duree_amort_travaux, self.montant_travaux / self.duree_amort_travaux, 0.0)
+        frais = np.where(annees <= self.duree_amort_frais, frais_annexes / self.duree_amort_frais, 0.0)
+        return _dataframe({
+            'Année': annees,
+            'Amortissement Bâti': bati,
+            'Amortissement Mobilier': mobilier,
+            'Amortissement Travaux': travaux,
+            'Amortissement Frais': frais,
+            'Total Amortissement': bati + mobilier + travaux + frais
+        })
+
+    @memoise
+    def echeancier_annuel(self):
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        amort = np.asarray(self.amortissements()['Total Amortissement'])
+        annuel = self.echeancier_annuel()
+        interets = annuel.sur_horizon('interets', self.horizon)
+        assurances = annuel.sur_horizon('assurance', self.horizon)
+        annuites = annuel.annuites_sur_horizon(self.horizon)
+
+        revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+        charges_reelles = (
+            self.charges_copro + self.assurance + self.assurance_gli +
+            self.taxe_fonciere + self.frais_entretien + self.frais_compta +
+            self.frais_bancaires + self.gestion_locative
+        )
+        charges_recup = self.charges_copro * 0.8
+
+        resultats_bruts = revenus - charges_reelles - interets - assurances - amort
+        report = deficits.imputer_deficits(resultats_bruts, duree_report=self.duree_report_deficit)
+        resultat_net = report.resultat_net
+
+        ir = np.where(resultat_net < 0, 0.0, resultat_net * (self.tmi / 100))
+        cashflow_mensuel = (revenus - charges_reelles - ir - annuites + charges_recup) / 12
+
+        return _dataframe({
+            'Année': annees,
+            'Revenus': revenus,
+            'Charges réelles': charges_reelles,
+            'Charges récupérables': charges_recup,
+            'Intérêts': interets,
+            'Assurance': assurances,
+            'Amortissements': amort,
+            'Résultat fiscal brut': resultats_bruts,
+            'Résultat fiscal net': resultat_net,
+            'Déficit reportable': np.where(report.reportable > 0, -report.reportable, 0.0),
+            'IR (TMI)': np.round(ir, 2),
+            'Cashflow mensuel (€)': np.round(cashflow_mensuel, 2)
+        })
+
+    def plus_value(self, prix_cession=None, annee=None):
+        """Plus-value professionnelle à la cession (voir `_cession`).
+
+        Court terme à hauteur des amortissements (barème et prélèvements sociaux), long terme au-delà.
+        """
+        prix, annees = _cession(self, prix_cession, annee)
+        valeur_nette, amortis = _valeur_nette_comptable(self, annees)
+        recettes = _en_fin_annee(self.resultat_fiscal_annuel()['Revenus'], annees)
+        return plus_value.plus_value_professionnelle(
+            prix,
+            valeur_nette, amortis, annees, self.tmi, recettes
+        )
+
+
+# --------------------------------------------------------------------------------
+# CLASSE RÉEL FONCIER
+# --------------------------------------------------------------------------------
+@dataclass
+class ReelFoncier(CalculsMemoises):
+    prix_bien: float
+    apport: float
+    frais_dossier: float
+    frais_agence: float
+    montant_travaux: float
+    frais_garantie: float
+    frais_tiers: float
+
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+
+    charges_copro: float
+    taxe_fonciere: float
+    frais_entretien: float
+    frais_compta: float
+    frais_bancaires: float
+    gestion_locative: float
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+    tmi: float
+
+    frais_notaire_pct: float = 8.0
+    horizon: int = 10
+    differe_partiel: bool = False
+    montant_emprunt: float = field(init=False)
+    frais_notaire: float = field(init=False)
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+        cout = cout_acquisition(
+            self.prix_bien, self.frais_notaire_pct, self.frais_agence, self.frais_dossier,
+            self.frais_garantie, self.frais_tiers, self.montant_travaux, self.apport
+        )
+        self.frais_notaire = cout.frais_notaire
+        self.montant_emprunt = cout.montant_emprunt
+
+    @memoise
+    def mensualite_emprunt(self):
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def tableau_amortissement_emprunt(self):
+        ech = emprunt.echeancier_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+        return _dataframe({
+            'Mois': ech.mois,
+            'Année': ech.annee,
+            'Intérêts': ech.interets,
+            'Principal': ech.principal,
+            'Assurance': ech.assurance,
+            'Capital restant dû': ech.capital_restant
+        })
+
+    @memoise
+    def echeancier_annuel(self):
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        annuel = self.echeancier_annuel()
+        interets = annuel.sur_horizon('interets', self.horizon)
+        assurances = annuel.sur_horizon('assurance', self.horizon)
+        annuites = annuel.annuites_sur_horizon(self.horizon)
+
+        revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+        charges = (
+            self.charges_copro + self.taxe_fonciere + self.frais_entretien +
+            self.frais_compta + self.frais_bancaires + self.gestion_locative
+        )
+        charges_recup = self.charges_copro * 0.8
+
+        resultats_fonciers = revenus - charges - interets - assurances
+        resultats_nets = np.empty(resultats_fonciers.shape)
+        imputables_rg = np.zeros(resultats_fonciers.shape)
+        reportables = np.zeros(resultats_fonciers.shape)
+        deficit_reportable_foncier = np.zeros(resultats_fonciers.shape[:-1])
+
+        # Le report dépend de l'imputation sur le revenu global de l'année précédente
+        for i in range(self.horizon):
+            resultat_net = resultats_fonciers[..., i] + deficit_reportable_foncier
+            resultats_nets[..., i] = resultat_net
+            imputables_rg[..., i] = np.where(resultat_net < 0, np.maximum(resultat_net, -10700), 0.0)
+            deficit_reportable_foncier = np.where(resultat_net < 0, resultat_net - imputables_rg[..., i], 0.0)
+            reportables[..., i] = deficit_reportable_foncier
+
+        ir = np.where(resultats_nets < 0, 0.0, resultats_nets * (self.tmi / 100))
+        cashflow = (revenus - charges - ir - annuites + charges_recup) / 12
+
+        return _dataframe({
+            'Année': annees,
+            'Revenus': revenus,
+            'Charges réelles': charges,
+            'Charges récupérables': charges_recup,
+            'Intérêts': interets,
+            'Assurance': assurances,
+            'Résultat foncier': resultats_fonciers,
+            'Résultat fiscal net': resultats_nets,
+            'Déficit imputé sur revenu global': np.where(imputables_rg < 0, -imputables_rg, 0.0),
+            'Déficit reportable foncier': np.where(reportables < 0, reportables, 0.0),
+            'Impôt (IR)': np.round(ir, 2),
+            'Cashflow mensuel (€)': np.round(cashflow, 2)
+        })
+
+    def plus_value(self, prix_cession=None, annee=None):
+        """Plus-value des particuliers à la cession (voir `_cession`)."""
+        prix, annees = _cession(self, prix_cession, annee)
+        return plus_value.plus_value_particulier(
+            prix,
+            self.prix_bien, self.frais_notaire + self.frais_agence, self.montant_travaux, annees
+        )
+
+
+# --------------------------------------------------------------------------------
+# CLASSE HOLDING À L'IS
+# --------------------------------------------------------------------------------
+@dataclass
+class HoldingIS(CalculsMemoises):
+    prix_bien: float
+    part_terrain: float
+    apport: float
+    frais_dossier: float
+    frais_agence: float
+    montant_travaux: float
+    frais_garantie: float
+    frais_tiers: float
+    mobilier: float
+
+    duree_annees: int
+    taux_interet: float
+    taux_assurance: float
+    differe_mois: int
+
+    charges_copro: float
+    assurance: float
+    assurance_gli: float
+    taxe_fonciere: float
+    frais_entretien: float
+    frais_compta: float
+    frais_bancaires: float
+    gestion_locative: float
+    loyer_mensuel_hc: float
+    vacance_locative_mois: int
+
+    duree_amort_bati: int
+    duree_amort_travaux: int
+    duree_amort_mobilier: int
+    duree_amort_frais: int
+
+    frais_notaire_pct: float = 8.0
+    horizon: int = 10
+    differe_partiel: bool = False
+    montant_emprunt: float = field(init=False)
+    frais_notaire: float = field(init=False)
+
+    def __post_init__(self):
+        verifier_horizon(self.horizon)
+        cout = cout_acquisition(
+            self.prix_bien, self.frais_notaire_pct, self.frais_agence, self.frais_dossier,
+            self.frais_garantie, self.frais_tiers, self.montant_travaux, self.apport
+        )
+        self.frais_notaire = cout.frais_notaire
+        self.montant_emprunt = cout.montant_emprunt
+
+    @memoise
+    def mensualite_emprunt(self):
+        return emprunt.mensualite_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def tableau_amortissement_emprunt(self):
+        ech = emprunt.echeancier_emprunt(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+        return _dataframe({
+            'Mois': ech.mois,
+            'Année': ech.annee,
+            'Intérêts': ech.interets,
+            'Principal': ech.principal,
+            'Assurance': ech.assurance,
+            'Capital restant dû': ech.capital_restant
+        })
+
+    @memoise
+    def amortissements(self):
+        annees = np.arange(1, self.horizon + 1)
+        valeur_bati = self.prix_bien * (1 - self.part_terrain / 100)
+        frais_annexes = self.frais_dossier + self.frais_agence + self.frais_garantie + self.frais_tiers
+        bati = np.where(annees <= self.duree_amort_bati, valeur_bati / self.duree_amort_bati, 0.0)
+        mobilier = np.where(annees <= self.duree_amort_mobilier, self.mobilier / self.duree_amort_mobilier, 0.0)
+        travaux = np.where(annees <= self.duree_amort_travaux, self.montant_travaux / self.duree_amort_travaux, 0.0)
+        frais = np.where(annees <= self.duree_amort_frais, frais_annexes / self.duree_amort_frais, 0.0)
+        return _dataframe({
+            'Année': annees,
+            'Amortissement Bâti': bati,
+            'Amortissement Mobilier': mobilier,
+            'Amortissement Travaux': travaux,
+            'Amortissement Frais': frais,
+            'Total Amortissement': bati + mobilier + travaux + frais
+        })
+
+    @memoise
+    def echeancier_annuel(self):
+        return emprunt.echeancier_annuel(
+            self.montant_emprunt, self.taux_interet, self.taux_assurance,
+            self.duree_annees, self.differe_mois, self.differe_partiel
+        )
+
+    @memoise
+    def resultat_fiscal_annuel(self):
+        annees = np.arange(1, self.horizon + 1)
+        amort = np.asarray(self.amortissements()['Total Amortissement'])
+        annuel = self.echeancier_annuel()
+        interets = annuel.sur_horizon('interets', self.horizon)
+        assurances = annuel.sur_horizon('assurance', self.horizon)
+        annuites = annuel.annuites_sur_horizon(self.horizon)
+
+        revenus = self.loyer_mensuel_hc * (12 - self.vacance_locative_mois)
+        charges_reelles = (
+            self.charges_copro + self.assurance + self.assurance_gli +
+            self.taxe_fonciere + self.frais_entretien + self.frais_compta +
+            self.frais_bancaires + self.gestion_locative
+        )
+        charges_recup = self.charges_copro * 0.8
+        charges_fiscales = charges_reelles - charges_recup
+
+        resultats_bruts = revenus - charges_fiscales - interets - assurances - amort
+        report = deficits.imputer_deficits(resultats_bruts)
+        resultat_net = report.resultat_net
+
+        is_impot = np.where(
+            resultat_net < 0, 0.0,
+            np.where(resultat_net <= 42500, resultat_net * 0.15, 42500 * 0.15 + (resultat_net - 42500) * 0.25)
+        )
+        cashflow_mensuel = (revenus - charges_reelles - is_impot - annuites + charges_recup) / 12
+
+        return _dataframe({
+            'Année': annees,
+            'Revenus': revenus,
+            'Charges réelles': charges_reelles,
+            'Charges récupérables': charges_recup,
+            'Intérêts': interets,
+            'Assurance': assurances,
+            'Amortissements': amort,
+            'Résultat fiscal brut': resultats_bruts,
+            'Résultat fiscal net': resultat_net,
+            'Déficit reportable': np.where(report.reportable > 0, -report.reportable, 0.0),
+            'IS': is_impot,
+            'Cashflow mensuel (€)': np.round(cashflow_mensuel, 2)
+        })
+
+    def plus_value(self, prix_cession=None, annee=None):
+        """Plus-value à l'IS à la cession (voir `_cession`).
+
+        Calculée sur la valeur nette comptable et ajoutée au résultat fiscal
+        net de l'année.
+        """
+        prix, annees = _cession(self, prix_cession, annee)
+        valeur_nette, _ = _valeur_nette_comptable(self, annees)
+        resultat_net = _en_fin_annee(self.resultat_fiscal_annuel()['Résultat fiscal net'], annees)
+        return plus_value.plus_value_societe(
+            prix, valeur_nette, resultat_net
+        )
+
+
+# --------------------------------------------------------------------------------
+# REGISTRE DES RÉGIMES (libellés du menu Streamlit)
+# --------------------------------------------------------------------------------
+REGIMES = {
+    "LMNP réel": LMNPReel,
+    "LMNP Micro-Bic": MicroBIC,
+    "LMP réel": LMPReel,
+    "SCI à l'IS": SCIaIS,
+    "SCI à l'IR": SCIaIR,
+    "SARL de famille": SARLDeFamille,
+    "Holding à l'IS": HoldingIS,
+    "Location nue": LocationNue,
+    "Micro foncier": MicroFoncier,
+    "Réel foncier": ReelFoncier,
+}
+
+# Colonnes de `resultat_fiscal_annuel` qui portent l'imposition (impôt et
+# prélèvements sociaux) et le cashflow mensuel, propres à chaque régime
+COLONNES_IMPOTS = {
+    LMNPReel: ('Impôt',),
+    MicroBIC: ('IR (TMI)', 'Prélèvements sociaux (17.2%)'),
+    LMPReel: ('IR (TMI)', 'Cotisations sociales (SSI)'),
+    SCIaIS: ('IS',),
+    SCIaIR: ('Impôt sur le revenu (IR)',),
+    SARLDeFamille: ('IR (TMI)',),
+    HoldingIS: ('IS',),
+    LocationNue: ('IR',),
+    MicroFoncier: ('IR (TMI)', 'Prélèvements sociaux (17.2%)'),
+    ReelFoncier: ('Impôt (IR)',),
+}
+
+
+def indicateurs_annuels(simulation):
+    """Années, imposition totale et cashflow mensuel d'une simulation, quel que soit le régime."""
+    resultats = simulation.resultat_fiscal_annuel()
+    colonne_cashflow = next(c for c in resultats if c.startswith('Cashflow mensuel'))
+    return {
+        'annee': np.asarray(resultats['Année']),
+        'impots': sum(np.asarray(resultats[c], dtype=float) for c in COLONNES_IMPOTS[type(simulation)]),
+        'cashflow_mensuel': np.asarray(resultats[colonne_cashflow], dtype=float),
+    }
+
+
+def _par_scenario(valeur):
+    # Les paramètres d'un lot ont la forme (..., 1) : on retire l'axe des années
+    valeur = np.asarray(valeur, dtype=float)
+    return valeur[..., 0] if valeur.ndim else valeur
+
+
+def flux_rendement(simulation, valeur_revente=None):
+    """(apport, cashflows annuels, revente nette) d'une simulation, en lot ou non.
+
+    La revente à l'horizon (`valeur_revente`, par défaut le prix d'achat)
+    est diminuée du capital restant dû. ValueError pour un régime qui ne
+    connaît ni l'apport ni le prix du bien (Micro-BIC).
+    """
+    if not hasattr(simulation, 'apport') or not hasattr(simulation, 'echeancier_annuel'):
+        raise ValueError(f"Rendement indisponible pour {type(simulation).__name__} : apport ou prix du bien inconnu")
+    cashflow_annuel = indicateurs_annuels(simulation)['cashflow_mensuel'] * 12
+    capital_restant = simulation.echeancier_annuel().sur_horizon('capital_restant', simulation.horizon)[..., -1]
+    revente = _par_scenario(simulation.prix_bien if valeur_revente is None else valeur_revente)
+    return _par_scenario(simulation.apport), cashflow_annuel, revente - capital_restant
+
+
+def rendement_simulation(simulation, taux_actualisation=0.05, valeur_revente=None):
+    """TRI, VAN, cash-on-cash et multiple des capitaux d'une simulation (en lot ou non)."""
+    return finance.rendement(*flux_rendement(simulation, valeur_revente), taux_actualisation)
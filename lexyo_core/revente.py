@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from . import emprunt, finance
+from .regimes import flux_rendement
+
+
+# --------------------------------------------------------------------------------
+# VENDRE OU CONSERVER : REVENTE À CHAQUE ANNÉE DE L'HORIZON
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class MatriceRevente:
+    """Revente en fin d'année 1 à horizon : une colonne par année de cession.
+
+    Les dimensions de tête sont celles des scénarios de croissance du prix
+    (et du lot de simulations, le cas échéant). `prix_cession` est le prix
+    de vente brut, avant `frais_cession`.
+    """
+    annees: np.ndarray
+    croissance_prix: np.ndarray
+    prix_cession: np.ndarray
+    frais_cession: np.ndarray
+    capital_restant: np.ndarray
+    indemnites: np.ndarray
+    impot_plus_value: np.ndarray
+    produit_net: np.ndarray
+    tri: np.ndarray
+    van: np.ndarray
+
+    @property
+    def annee_optimale(self):
+        """Année de cession qui maximise le TRI, par scénario (0 si aucun TRI n'est défini)."""
+        tri = np.where(np.isnan(self.tri), -np.inf, self.tri)
+        return np.where(np.isfinite(tri.max(axis=-1)), self.annees[np.argmax(tri, axis=-1)], 0)
+
+    @property
+    def tri_optimal(self):
+        tri = np.where(np.isnan(self.tri), -np.inf, self.tri).max(axis=-1)
+        return np.where(np.isfinite(tri), tri, np.nan)
+
+
+def matrice_revente(simulation, croissance_prix=0.0, frais_cession_pct=0.0, taux_actualisation=0.05):
+    """Produit net, TRI et VAN d'une revente à chaque année de l'horizon, en un calcul.
+
+    Le prix évolue de `croissance_prix` % par an (un tableau donne autant de
+    scénarios). Le produit net retire du prix les frais de cession, le
+    capital restant dû, les indemnités de remboursement anticipé et l'impôt
+    sur la plus-value du régime. Le TRI d'une sortie en année a porte sur
+    l'apport, les cashflows des années 1 à a et le produit net en année a ;
+    toutes les combinaisons années × scénarios sont évaluées ensemble.
+    """
+    if not hasattr(simulation, 'plus_value'):
+        raise ValueError(f"Revente indisponible pour {type(simulation).__name__} : prix du bien inconnu")
+    apport, cashflows, _ = flux_rendement(simulation)
+    horizon = simulation.horizon
+    annees = np.arange(1, horizon + 1)
+
+    croissance = np.asarray(croissance_prix, dtype=float)
+    prix_cession = np.asarray(simulation.prix_bien, dtype=float) * (1 + croissance[..., np.newaxis] / 100) ** annees
+    frais_cession = prix_cession * frais_cession_pct / 100
+    capital_restant = simulation.echeancier_annuel().sur_horizon('capital_restant', horizon)
+    indemnites = emprunt.indemnites_remboursement_anticipe(capital_restant, simulation.taux_interet)
+    # Les frais de cession viennent en déduction du prix pour la plus-value
+    impot = simulation.plus_value(prix_cession - frais_cession, annees).imposition
+    produit_net = prix_cession - frais_cession - capital_restant - indemnites - impot
+
+    # Flux de chaque sortie : (..., année de cession, année du flux), nuls après la cession
+    forme = np.broadcast_shapes(produit_net.shape, np.shape(cashflows))
+    sortie = annees[:, np.newaxis] >= annees
+    flux = np.zeros(forme[:-1] + (horizon, horizon + 1))
+    flux[..., 0] = -np.asarray(apport)[..., np.newaxis]
+    flux[..., 1:] = np.where(sortie, np.asarray(cashflows)[..., np.newaxis, :], 0.0)
+    flux[..., annees - 1, annees] += np.broadcast_to(produit_net, forme)
+
+    return MatriceRevente(
+        annees=annees,
+        croissance_prix=croissance,
+        prix_cession=np.broadcast_to(prix_cession, forme),
+        frais_cession=np.broadcast_to(frais_cession, forme),
+        capital_restant=np.broadcast_to(capital_restant, forme),
+        indemnites=np.broadcast_to(indemnites, forme),
+        impot_plus_value=np.broadcast_to(impot, forme),
+        produit_net=np.broadcast_to(produit_net, forme),
+        tri=finance.tri(flux),
+        van=finance.van(flux, taux_actualisation),
+    )
@@ -0,0 +1,94 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from .regimes import indicateurs_annuels, rendement_simulation
+
+# Champs qui fixent la forme du calcul (nombre d'années, durée de la boucle
+# de report) : ils restent scalaires et ne peuvent pas servir d'axe
+CHAMPS_NON_VARIABLES = ("horizon", "duree_report_deficit")
+
+INDICATEURS = {
+    "cashflow_mensuel": "Cashflow mensuel (€)",
+    "impots": "Impôts de l'année (€)",
+    "tri": "TRI (%)",
+}
+
+
+# --------------------------------------------------------------------------------
+# GRILLE DE SENSIBILITÉ À DEUX PARAMÈTRES
+# --------------------------------------------------------------------------------
+@dataclass(frozen=True)
+class GrilleSensibilite:
+    """Indicateur évalué sur une grille : une ligne par valeur de y, une colonne par valeur de x."""
+    axe_x: str
+    valeurs_x: np.ndarray
+    axe_y: str
+    valeurs_y: np.ndarray
+    indicateur: str
+    valeurs: np.ndarray
+
+    def en_lignes(self):
+        """Format long (une ligne par point), prêt pour une carte de chaleur."""
+        return [
+            {self.axe_x: float(x), self.axe_y: float(y), "valeur": float(v)}
+            for y, ligne in zip(self.valeurs_y, self.valeurs)
+            for x, v in zip(self.valeurs_x, ligne)
+        ]
+
+
+def axes_possibles(classe):
+    """Champs numériques d'un régime utilisables comme axe de la grille."""
+    return [
+        champ.name for champ in fields(classe)
+        if champ.init and champ.type in (int, float) and champ.name not in CHAMPS_NON_VARIABLES
+    ]
+
+
+def _valeurs_axe(classe, nom, valeurs):
+    if nom not in axes_possibles(classe):
+        raise ValueError(f"{nom} ne peut pas servir d'axe pour {classe.__name__}")
+    valeurs = np.asarray(valeurs, dtype=float)
+    if next(champ.type for champ in fields(classe) if champ.name == nom) is int:
+        return np.round(valeurs).astype(int)
+    return valeurs
+
+
+def evaluer_indicateur(classe, parametres, indicateur="cashflow_mensuel", annee=1, valeur_revente=None):
+    """Indicateur d'une simulation ; en lot (paramètres en tableaux (..., 1)), un tableau (...)."""
+    if indicateur not in INDICATEURS:
+        raise ValueError(f"Indicateur inconnu : {indicateur!r}")
+    simulation = classe(**parametres)
+    if indicateur == "tri":
+        return rendement_simulation(simulation, valeur_revente=valeur_revente).tri * 100
+    serie = indicateurs_annuels(simulation)[indicateur]
+    if not 1 <= annee <= serie.shape[-1]:
+        raise ValueError(f"Année hors de l'horizon : {annee}")
+    return serie[..., annee - 1]
+
+
+def grille_sensibilite(classe, parametres, axe_x, valeurs_x, axe_y, valeurs_y,
+                       indicateur="cashflow_mensuel", annee=1, valeur_revente=None):
+    """Évalue un indicateur du régime sur toute la grille (valeurs_y × valeurs_x) en un appel.
+
+    Les deux paramètres balayés sont passés au régime en tableaux
+    (len(y), len(x), 1) et toute la projection, échéancier compris, est
+    calculée en une passe vectorisée. `annee` choisit l'année du cashflow
+    mensuel ou des impôts ; le TRI porte sur tout l'horizon, avec revente au
+    prix d'achat (ou `valeur_revente`) diminuée du capital restant dû.
+    """
+    if axe_x == axe_y:
+        raise ValueError("Les deux axes de la grille doivent être distincts")
+    valeurs_x = _valeurs_axe(classe, axe_x, valeurs_x)
+    valeurs_y = _valeurs_axe(classe, axe_y, valeurs_y)
+
+    parametres = dict(parametres)
+    parametres[axe_x] = valeurs_x[np.newaxis, :, np.newaxis]
+    parametres[axe_y] = valeurs_y[:, np.newaxis, np.newaxis]
+    valeurs = evaluer_indicateur(classe, parametres, indicateur, annee, valeur_revente)
+    forme = (len(valeurs_y), len(valeurs_x))
+
+    return GrilleSensibilite(
+        axe_x=axe_x, valeurs_x=valeurs_x, axe_y=axe_y, valeurs_y=valeurs_y,
+        indicateur=indicateur, valeurs=np.broadcast_to(valeurs, forme).copy(),
+    )
@@ -0,0 +1,313 @@
+import numpy as np
+
+from . import finance
+from .regimes import HORIZON_MAX
+
+# Champs optionnels des entrées, utilisés pour les indicateurs de rendement
+DEFAUTS_RENDEMENT = {"horizon": 10, "taux_actualisation": 0.05, "valeur_revente": None}
+INDICATEURS_RENDEMENT = ("tri", "van", "cash_on_cash", "multiple")
+
+
+def rendement_lot(apport, emprunte, cashflow, horizon, taux_actualisation, valeur_revente):
+    """TRI, VAN, cash-on-cash et multiple d'un lot d'entrées (tableaux 1-D).
+
+    Le cashflow de la première année est reconduit sur `horizon` années ;
+    la revente (NaN : aucune) rembourse le capital emprunté, qui n'est pas
+    amorti dans ce modèle (intérêts seuls). Les horizons peuvent différer
+    d'une entrée à l'autre : les années au-delà de l'horizon sont à zéro.
+    """
+    horizon = np.asarray(horizon, dtype=np.int64)
+    n = len(horizon)
+    annees = np.arange(1, max(horizon.max(initial=1), 1) + 1)
+    cashflows = np.where(annees <= horizon[:, np.newaxis], np.asarray(cashflow, dtype=float)[:, np.newaxis], 0.0)
+    valeur_finale = np.where(np.isnan(valeur_revente), 0.0, valeur_revente - emprunte)
+
+    flux = np.zeros((n, len(annees) + 1))
+    flux[:, 0] = -apport
+    flux[:, 1:] = cashflows
+    flux[np.arange(n), horizon] += valeur_finale
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cash_on_cash = np.where(apport > 0, cashflow / apport, np.nan)
+        multiple = np.where(apport > 0, (cashflow * horizon + valeur_finale) / apport, np.nan)
+    return {
+        "tri": finance.tri(flux),
+        "van": finance.van(flux, taux_actualisation),
+        "cash_on_cash": cash_on_cash,
+        "multiple": multiple,
+    }
+
+
+# --------------------------------------------------------------------------------
+# SIMULATION PAR LOTS (VECTORISÉE)
+# --------------------------------------------------------------------------------
+CHAMPS_SIMULATION = (
+    "prix_bien", "montant_apport", "frais_notaire", "travaux", "mobilier",
+    "charges_copro", "assurance_pno", "assurance_gli", "taxe_fonciere",
+    "frais_entretien", "frais_gestion", "frais_bancaire", "comptabilite",
+    "loyer_mensuel_hc", "amortissement_bien_duree", "amortissement_notaire_duree",
+    "amortissement_mobilier_duree", "amortissement_travaux_duree",
+    "taux_interet", "taux_assurance", "revenu_annuel_global", "nombre_parts",
+)
+
+REGIMES_AMORTIS = ("LMNP réel", "LMP réel", "SCI à l'IS", "SARL de famille", "Holding à l'IS")
+REGIMES_MICRO = {"Micro BIC": 0.5, "Micro foncier": 0.7}
+REGIMES_BIC = ("LMNP réel", "LMP réel", "SARL de famille")
+REGIMES_FONCIER = ("Location nue réel", "SCI à l'IR")
+REGIMES_IS = ("SCI à l'IS", "Holding à l'IS")
+
+TRANCHES_TMI = ((0, 11294, 0.0), (11295, 28797, 0.11), (28798, 82341, 0.30),
+                (82342, 177106, 0.41), (177107, float('inf'), 0.45))
+
+
+def colonnes_simulation(entrees):
+    """Colonnes NumPy (une valeur par entrée) à partir d'objets `SimulationInputs`.
+
+    Les durées d'amortissement et la valeur de revente absentes (`None`)
+    deviennent NaN ; les champs de rendement manquants prennent leur défaut.
+    """
+    colonnes = {
+        champ: np.array([getattr(e, champ) for e in entrees], dtype=float)
+        for champ in CHAMPS_SIMULATION
+    }
+    for champ, defaut in DEFAUTS_RENDEMENT.items():
+        colonnes[champ] = np.array([getattr(e, champ, defaut) for e in entrees], dtype=float)
+    colonnes["regime"] = np.array([e.regime for e in entrees], dtype=object)
+    return colonnes
+
+
+def _tmi_lot(revenu_imposable, parts):
+    quotient = revenu_imposable / parts
+    conditions = [(bas <= quotient) & (quotient <= haut) for bas, haut, _ in TRANCHES_TMI]
+    return np.select(conditions, [taux for _, _, taux in TRANCHES_TMI], default=0.30)
+
+
+def _impot_ir_lot(revenu_net, c):
+    tmi = _tmi_lot(c["revenu_annuel_global"] + revenu_net, c["nombre_parts"])
+    return np.where(revenu_net < 0, 0.0, revenu_net * (tmi + 0.172))
+
+
+def _impot_is_lot(benefice):
+    return np.where(benefice <= 42500, benefice * 0.15, 42500 * 0.15 + (benefice - 42500) * 0.25)
+
+
+def _amortissement_lot(prix, duree):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(duree > 0, prix / duree, 0.0)
+
+
+def _simuler_regime(regime, c):
+    """Impôt, cashflow et masque d'erreur pour un groupe d'entrées du même régime."""
+    loyer_annuel = c["loyer_mensuel_hc"] * 12
+    charges = (c["charges_copro"] + c["assurance_pno"] + c["assurance_gli"] + c["taxe_fonciere"]
+               + c["frais_entretien"] + c["frais_gestion"] + c["frais_bancaire"] + c["comptabilite"])
+    emprunte = c["prix_bien"] - c["montant_apport"]
+    revenu_net = loyer_annuel - charges - emprunte * c["taux_interet"] - emprunte * c["taux_assurance"]
+
+    total_amortissements = 0.0
+    if regime in REGIMES_AMORTIS:
+        total_amortissements = (
+            _amortissement_lot(c["prix_bien"] * 0.8, c["amortissement_bien_duree"])
+            + _amortissement_lot(c["frais_notaire"], c["amortissement_notaire_duree"])
+            + _amortissement_lot(c["mobilier"], c["amortissement_mobilier_duree"])
+            + _amortissement_lot(c["travaux"], c["amortissement_travaux_duree"])
+        )
+
+    # Le quotient familial n'est nécessaire que là où la TMI intervient
+    sans_parts = c["nombre_parts"] == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if regime in REGIMES_MICRO:
+            impot = _impot_ir_lot(loyer_annuel * REGIMES_MICRO[regime], c)
+            erreur = sans_parts
+        elif regime in REGIMES_BIC:
+            revenu_net_bic = revenu_net - total_amortissements
+            impot = np.where(revenu_net_bic < 0, 0.0, _impot_ir_lot(revenu_net_bic, c))
+            erreur = sans_parts & (revenu_net_bic >= 0)
+        elif regime in REGIMES_FONCIER:
+            impot = _impot_ir_lot(np.maximum(revenu_net, -10700), c)
+            erreur = sans_parts
+        else:
+            benefice = revenu_net - total_amortissements
+            impot = np.where(benefice < 0, 0.0, _impot_is_lot(benefice))
+            erreur = np.zeros(len(impot), dtype=bool)
+    return impot, revenu_net - impot, erreur
+
+
+def simuler_lot(colonnes):
+    """Simulation vectorisée de l'API sur des colonnes (voir `colonnes_simulation`).
+
+    Les entrées sont regroupées par régime et chaque groupe est calculé en
+    une passe NumPy, puis le rendement de tout le lot en un seul calcul de
+    TRI. Renvoie `impot`, `cashflow` et les INDICATEURS_RENDEMENT (NaN en
+    cas d'erreur) et `erreurs`, une liste alignée sur les entrées (None si
+    le calcul a abouti). Les champs de rendement absents des colonnes
+    prennent leur valeur par défaut.
+    """
+    regimes = np.asarray(colonnes["regime"], dtype=object)
+    n = len(regimes)
+    impot = np.full(n, np.nan)
+    cashflow = np.full(n, np.nan)
+    erreurs = [None] * n
+
+    for regime in dict.fromkeys(regimes):
+        indices = np.flatnonzero(regimes == regime)
+        if regime not in REGIMES_AMORTIS + REGIMES_FONCIER + tuple(REGIMES_MICRO):
+            for i in indices:
+                erreurs[i] = "Régime inconnu"
+            continue
+        groupe = {champ: np.asarray(colonnes[champ], dtype=float)[indices] for champ in CHAMPS_SIMULATION}
+        impot_groupe, cashflow_groupe, erreur = _simuler_regime(regime, groupe)
+        impot[indices] = np.where(erreur, np.nan, impot_groupe)
+        cashflow[indices] = np.where(erreur, np.nan, cashflow_groupe)
+        for i in indices[erreur]:
+            erreurs[i] = "nombre_parts doit être non nul"
+
+    rendement = {
+        champ: np.broadcast_to(np.asarray(
+            colonnes.get(champ, np.nan if defaut is None else defaut), dtype=float
+        ), (n,))
+        for champ, defaut in DEFAUTS_RENDEMENT.items()
+    }
+    # Le rendement construit une matrice (entrées × horizon le plus long) :
+    # l'horizon est borné avant tout calcul
+    with np.errstate(invalid="ignore"):
+        controles = (
+            (~((rendement["horizon"] >= 1) & (rendement["horizon"] <= HORIZON_MAX)),
+             f"horizon doit être compris entre 1 et {HORIZON_MAX}"),
+            (~(rendement["taux_actualisation"] > -1), "taux_actualisation doit être supérieur à -1"),
+            (rendement["valeur_revente"] < 0, "valeur_revente doit être positive ou nulle"),
+        )
+    rendement_invalide = np.zeros(n, dtype=bool)
+    for invalide, message in controles:
+        for i in np.flatnonzero(invalide):
+            if erreurs[i] is None:
+                erreurs[i] = message
+        rendement_invalide |= invalide
+    cashflow[rendement_invalide] = impot[rendement_invalide] = np.nan
+
+    apport = np.asarray(colonnes["montant_apport"], dtype=float)
+    indicateurs = rendement_lot(
+        apport, np.asarray(colonnes["prix_bien"], dtype=float) - apport, cashflow,
+        np.where(rendement_invalide, 1, rendement["horizon"]),
+        np.where(rendement_invalide, 0.0, rendement["taux_actualisation"]), rendement["valeur_revente"],
+    )
+    return {"impot": impot, "cashflow": cashflow, **indicateurs, "erreurs": erreurs}
+
+
+# --------------------------------------------------------------------------------
+# SIMULATION SIMPLIFIÉE (API)
+# --------------------------------------------------------------------------------
+def simulate(inputs):
+    """Impôt et cashflow de la première année, et rendement sur l'horizon, pour un jeu d'entrées de l'API.
+
+    `inputs` est n'importe quel objet exposant les champs de `SimulationInputs`
+    (modèle pydantic de l'API, dataclass, namespace...) ; les champs de
+    DEFAUTS_RENDEMENT sont facultatifs. Le calcul est celui de `simuler_lot`
+    sur un lot d'une entrée ; une entrée en erreur lève ValueError.
+    """
+    calcul = simuler_lot(colonnes_simulation([inputs]))
+    if calcul["erreurs"][0] is not None:
+        raise ValueError(calcul["erreurs"][0])
+    # NaN (pas de TRI, pas d'apport) → None, sérialisable en JSON
+    return {
+        nom: float(calcul[nom][0]) if np.isfinite(calcul[nom][0]) else None
+        for nom in ("impot", "cashflow") + INDICATEURS_RENDEMENT
+    }
+
+
+# --------------------------------------------------------------------------------
+# LOTS EN COLONNES (VALIDATION CHAMP PAR CHAMP)
+# --------------------------------------------------------------------------------
+def _en_reels(valeurs):
+    """Colonne en float64 (None → NaN) et masque des valeurs non numériques."""
+    try:
+        tableau = np.asarray(valeurs, dtype=float)
+        invalide = np.zeros(len(tableau), dtype=bool)
+    except (TypeError, ValueError):
+        # Chemin lent, uniquement pour une colonne qui contient des valeurs invalides
+        tableau = np.full(len(valeurs), np.nan)
+        invalide = np.zeros(len(valeurs), dtype=bool)
+        for i, valeur in enumerate(valeurs):
+            try:
+                tableau[i] = np.nan if valeur is None else float(valeur)
+            except (TypeError, ValueError):
+                invalide[i] = True
+    if tableau.ndim != 1:
+        raise ValueError("Chaque colonne doit être une liste de valeurs scalaires")
+    return tableau, invalide
+
+
+def valider_colonnes(colonnes, types, defauts=None):
+    """Valide un lot en colonnes champ par champ, sans construire d'objet par entrée.
+
+    `types` associe chaque champ à "reel", "reel_optionnel", "entier",
+    "entier_optionnel" ou "texte". Un champ de `defauts` peut manquer : sa
+    colonne prend alors la valeur par défaut. Renvoie les colonnes
+    converties (NaN pour une valeur optionnelle absente) et les erreurs par
+    entrée (None si l'entrée est valide). Une colonne obligatoire manquante,
+    inconnue ou de longueur différente rend tout le lot invalide (ValueError).
+    """
+    defauts = defauts or {}
+    # Un champ mal orthographié prendrait sinon sa valeur par défaut sans bruit
+    inconnues = [champ for champ in colonnes if champ not in types]
+    if inconnues:
+        raise ValueError(f"Colonnes inconnues : {', '.join(inconnues)}")
+    manquantes = [champ for champ in types if champ not in colonnes and champ not in defauts]
+    if manquantes:
+        raise ValueError(f"Colonnes manquantes : {', '.join(manquantes)}")
+    tailles = {len(valeurs) for valeurs in colonnes.values()}
+    if len(tailles) > 1:
+        raise ValueError("Colonnes de longueurs différentes")
+    n = tailles.pop() if tailles else 0
+    colonnes = {**{champ: [defaut] * n for champ, defaut in defauts.items()}, **colonnes}
+
+    erreurs = [None] * n
+    converties = {}
+    for champ, genre in types.items():
+        if genre == "texte":
+            tableau = np.asarray(colonnes[champ], dtype=object)
+            invalide = np.fromiter((not isinstance(v, str) for v in tableau), dtype=bool, count=n)
+            message = "Chaîne de caractères attendue"
+        elif genre == "reel":
+            tableau, invalide = _en_reels(colonnes[champ])
+            invalide |= np.isnan(tableau)
+            message = "Nombre attendu"
+        elif genre == "reel_optionnel":
+            tableau, invalide = _en_reels(colonnes[champ])
+            message = "Nombre ou null attendu"
+        elif genre == "entier":
+            tableau, invalide = _en_reels(colonnes[champ])
+            with np.errstate(invalid="ignore"):
+                invalide |= np.isnan(tableau) | (tableau != np.floor(tableau))
+            message = "Entier attendu"
+        elif genre == "entier_optionnel":
+            tableau, invalide = _en_reels(colonnes[champ])
+            with np.errstate(invalid="ignore"):
+                invalide |= ~np.isnan(tableau) & (tableau != np.floor(tableau))
+            message = "Entier ou null attendu"
+        else:
+            raise ValueError(f"Type de colonne inconnu : {genre}")
+
+        for i in np.flatnonzero(invalide):
+            erreurs[i] = (erreurs[i] or []) + [{"loc": [champ], "msg": message}]
+        converties[champ] = tableau
+
+    return converties, erreurs
+
+
+def simuler_colonnes(colonnes, types, defauts=None):
+    """Valide puis simule un lot en colonnes ; résultats alignés sur les entrées.
+
+    Les entrées invalides portent leurs erreurs de validation et des
+    résultats NaN, les autres sont calculées par `simuler_lot`.
+    """
+    converties, erreurs = valider_colonnes(colonnes, types, defauts)
+    valides = np.array([e is None for e in erreurs], dtype=bool)
+    calcul = simuler_lot({champ: tableau[valides] for champ, tableau in converties.items()})
+
+    resultats = {}
+    for nom in ("impot", "cashflow") + INDICATEURS_RENDEMENT:
+        resultats[nom] = np.full(len(erreurs), np.nan)
+        resultats[nom][valides] = calcul[nom]
+    for i, erreur in zip(np.flatnonzero(valides), calcul["erreurs"]):
+        erreurs[i] = erreur
+    return {**resultats, "erreurs": erreurs}
@@ -0,0 +1,120 @@
+import numpy as np
+
+
+# --------------------------------------------------------------------------------
+# STATISTIQUES EN FLUX (MÉMOIRE BORNÉE)
+# --------------------------------------------------------------------------------
+class StatistiquesFlux:
+    """Moyenne, écart-type, part de négatifs et quantiles accumulés lot par lot.
+
+    Chaque lot est un tableau (tirages, colonnes) ; les colonnes (par exemple
+    les années) sont suivies séparément. Les quantiles viennent d'un
+    histogramme de `nb_classes` classes dont l'étendue double dès qu'une
+    valeur en sort : la mémoire ne dépend pas du nombre de tirages et
+    l'erreur reste inférieure à la largeur d'une classe (au plus 1/1024 de
+    l'étendue observée avec 2048 classes).
+
+    Les valeurs non finies (TRI indéfini...) sont écartées avant tout calcul
+    et comptées à part dans `non_finis` ; `n` compte les valeurs retenues,
+    colonne par colonne.
+    """
+
+    def __init__(self, colonnes=1, nb_classes=2048):
+        if nb_classes % 2:
+            raise ValueError("nb_classes doit être pair")
+        self.colonnes = colonnes
+        self.nb_classes = nb_classes
+        self.n = np.zeros(colonnes, dtype=np.int64)
+        self.non_finis = np.zeros(colonnes, dtype=np.int64)
+        self.moyenne = np.zeros(colonnes)
+        self._m2 = np.zeros(colonnes)
+        self.negatifs = np.zeros(colonnes, dtype=np.int64)
+        self.minimum = np.full(colonnes, np.inf)
+        self.maximum = np.full(colonnes, -np.inf)
+        self.comptes = np.zeros((colonnes, nb_classes), dtype=np.int64)
+        self.bas = None
+        self.largeur = None
+
+    def ajouter(self, valeurs):
+        valeurs = np.asarray(valeurs, dtype=float).reshape(-1, self.colonnes)
+        finis = np.isfinite(valeurs)
+        self.non_finis += (~finis).sum(axis=0)
+        n = finis.sum(axis=0)
+        if not n.any():
+            return
+
+        # Moyenne et variance : fusion de Chan des moments du lot et du cumul,
+        # sur les seules valeurs finies de chaque colonne
+        moyenne_lot = np.where(finis, valeurs, 0.0).sum(axis=0) / np.maximum(n, 1)
+        m2_lot = np.where(finis, valeurs - moyenne_lot, 0.0) ** 2
+        total = self.n + n
+        delta = moyenne_lot - self.moyenne
+        self.moyenne = self.moyenne + delta * n / np.maximum(total, 1)
+        self._m2 = self._m2 + m2_lot.sum(axis=0) + delta ** 2 * self.n * n / np.maximum(total, 1)
+        self.n = total
+
+        self.negatifs += (finis & (valeurs < 0)).sum(axis=0)
+        self.minimum = np.minimum(self.minimum, np.where(finis, valeurs, np.inf).min(axis=0))
+        self.maximum = np.maximum(self.maximum, np.where(finis, valeurs, -np.inf).max(axis=0))
+        self._histogramme(valeurs, finis)
+
+    def _histogramme(self, valeurs, finis):
+        bas, haut = valeurs[finis].min(), valeurs[finis].max()
+        if self.bas is None:
+            self.bas = bas
+            self.largeur = max(haut - bas, abs(bas) * 1e-9, 1e-9) / self.nb_classes * (1 + 1e-9)
+        while bas < self.bas:
+            self._elargir(vers_le_bas=True)
+        while haut >= self.bas + self.largeur * self.nb_classes:
+            self._elargir(vers_le_bas=False)
+
+        classes = ((np.where(finis, valeurs, self.bas) - self.bas) / self.largeur).astype(np.int64)
+        classes = np.minimum(classes, self.nb_classes - 1) + np.arange(self.colonnes) * self.nb_classes
+        self.comptes += np.bincount(
+            classes[finis], minlength=self.colonnes * self.nb_classes
+        ).reshape(self.colonnes, self.nb_classes)
+
+    def _elargir(self, vers_le_bas):
+        # Largeur doublée : deux classes voisines fusionnent, l'ancienne étendue
+        # occupe une moitié de la nouvelle
+        fusion = self.comptes.reshape(self.colonnes, self.nb_classes // 2, 2).sum(axis=2)
+        self.comptes = np.zeros_like(self.comptes)
+        if vers_le_bas:
+            self.bas -= self.largeur * self.nb_classes
+            self.comptes[:, self.nb_classes // 2:] = fusion
+        else:
+            self.comptes[:, :self.nb_classes // 2] = fusion
+        self.largeur *= 2
+
+    @property
+    def ecart_type(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 0, np.sqrt(self._m2 / self.n), np.nan)
+
+    @property
+    def part_negatifs(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.n > 0, self.negatifs / self.n, np.nan)
+
+    def quantiles(self, niveaux):
+        """Quantiles (niveaux dans [0, 1]) par colonne : tableau (len(niveaux), colonnes)."""
+        niveaux = np.atleast_1d(np.asarray(niveaux, dtype=float))
+        resultats = np.full((len(niveaux), self.colonnes), np.nan)
+        cumul = np.cumsum(self.comptes, axis=1)
+        for c in np.flatnonzero(self.n):
+            cible = niveaux * self.n[c]
+            classe = np.minimum(np.searchsorted(cumul[c], cible), self.nb_classes - 1)
+            avant = np.where(classe > 0, cumul[c][classe - 1], 0)
+            fraction = (cible - avant) / np.maximum(self.comptes[c][classe], 1)
+            resultats[:, c] = self.bas + (classe + fraction) * self.largeur
+        return np.clip(resultats, self.minimum, self.maximum)
+
+    def histogramme(self, colonne=0, nb_classes=50):
+        """(bornes, comptes) regroupés en `nb_classes` classes sur l'étendue observée."""
+        # Centres ramenés dans l'étendue observée : les classes extrêmes ne sont pas perdues
+        centres = np.clip(self.bas + (np.arange(self.nb_classes) + 0.5) * self.largeur,
+                          self.minimum[colonne], self.maximum[colonne])
+        return np.histogram(
+            centres, bins=nb_classes, weights=self.comptes[colonne],
+            range=(self.minimum[colonne], self.maximum[colonne]),
+        )[::-1]
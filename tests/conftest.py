@@ -0,0 +1,32 @@
+import pytest
+
+from lexyo_core.comparaison import parametres_regime
+from lexyo_core.regimes import REGIMES, cout_acquisition
+
+# Saisie commune du formulaire de comparaison, valable pour les dix régimes
+SAISIE = dict(
+    prix_bien=200000, part_terrain=15, apport=20000, frais_dossier=1000, frais_agence=5000,
+    montant_travaux=10000, frais_garantie=2000, frais_tiers=500, mobilier=5000,
+    duree_annees=20, taux_interet=3.5, taux_assurance=0.3, differe_mois=0, differe_partiel=False,
+    charges_copro=1200, assurance_pno=200, assurance_gli=300, taxe_fonciere=1000,
+    frais_entretien=500, frais_compta=600, frais_bancaires=100, gestion_locative=800,
+    taxe_habitation=0, loyer_mensuel_hc=900, vacance_locative_mois=1, tmi=30,
+    duree_amort_bati=30, duree_amort_travaux=10, duree_amort_mobilier=7, duree_amort_frais=5,
+    horizon=10,
+)
+
+
+def construire(libelle, **changements):
+    """Instance du régime `libelle` pour SAISIE modifiée par `changements`."""
+    saisie = {**SAISIE, **changements}
+    cout = cout_acquisition(
+        saisie["prix_bien"], 8.0, saisie["frais_agence"], saisie["frais_dossier"],
+        saisie["frais_garantie"], saisie["frais_tiers"], saisie["montant_travaux"], saisie["apport"],
+    )
+    classe = REGIMES[libelle]
+    return classe(**parametres_regime(classe, saisie, float(cout.montant_emprunt)))
+
+
+@pytest.fixture(params=list(REGIMES))
+def libelle(request):
+    return request.param
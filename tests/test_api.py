@@ -0,0 +1,252 @@
+import json
+import math
+import sqlite3
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import Lexyo1
+from lexyo_core.cache import CacheSQLite
+from lexyo_core.execution import Executeur, FileSaturee
+
+from test_simulation import ENTREE, REGIMES
+
+
+@pytest.fixture
+def client():
+    Lexyo1.cache_reponses.vider()
+    with TestClient(Lexyo1.app) as client:
+        yield client
+    Lexyo1.cache_reponses.vider()
+
+
+def test_simulate(client):
+    reponse = client.post("/simulate", json={"regime": "Micro BIC", **ENTREE})
+    assert reponse.status_code == 200
+    assert reponse.json()["impot"] == pytest.approx(9000 * 0.472)
+
+
+def test_simulate_regime_inconnu_422(client):
+    reponse = client.post("/simulate", json={"regime": "Inconnu", **ENTREE})
+    assert reponse.status_code == 422
+    assert reponse.json()["detail"] == "Régime inconnu"
+
+
+def test_simulate_entree_invalide_422(client):
+    assert client.post("/simulate", json={"regime": "Micro BIC"}).status_code == 422
+
+
+@pytest.mark.parametrize("changements", [
+    {"horizon": 41}, {"horizon": 0}, {"taux_actualisation": -1.0}, {"valeur_revente": -1.0},
+])
+def test_simulate_rendement_hors_bornes_422(client, changements):
+    reponse = client.post("/simulate", json={"regime": "Micro BIC", **ENTREE, **changements})
+    assert reponse.status_code == 422
+    assert reponse.json()["detail"][0]["loc"][-1] == next(iter(changements))
+
+
+def test_simulate_horizon_maximal(client):
+    assert client.post("/simulate", json={"regime": "Micro BIC", **ENTREE, "horizon": 40}).status_code == 200
+
+
+def test_simulate_cache_disque(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(Lexyo1, "cache_disque", CacheSQLite(str(tmp_path / "cache.sqlite")))
+    premiere = client.post("/simulate", json={"regime": "Micro BIC", **ENTREE}).json()
+    Lexyo1.cache_reponses.vider()
+    assert client.post("/simulate", json={"regime": "Micro BIC", **ENTREE}).json() == premiere
+    assert Lexyo1.cache_disque.succes == 1
+    Lexyo1.cache_disque.fermer()
+
+
+class ExecuteurSature:
+    def sature(self):
+        return True
+
+    async def soumettre(self, fonction, *args):
+        raise FileSaturee("File de calcul saturée")
+
+    def fermer(self):
+        pass
+
+
+def test_file_saturee_429(client, monkeypatch):
+    monkeypatch.setattr(Lexyo1, "executeur", ExecuteurSature())
+    reponse = client.post("/simulate", json={"regime": "Micro BIC", **ENTREE})
+    assert reponse.status_code == 429
+    assert reponse.headers["Retry-After"] == "1"
+    assert client.post("/simulate/stream", content=b"{}\n").status_code == 429
+
+
+# --------------------------------------------------------------------------------
+# FLUX NDJSON
+# --------------------------------------------------------------------------------
+def _lignes_ndjson(n):
+    return [{"regime": REGIMES[i % len(REGIMES)], **ENTREE, "loyer_mensuel_hc": 1000.0 + 100 * i} for i in range(n)]
+
+
+def test_stream_ordre_et_erreurs_par_ligne(client, monkeypatch):
+    # Morceaux de 3 entrées : le lot en traverse plusieurs
+    monkeypatch.setattr(Lexyo1, "TAILLE_MORCEAU", 3)
+    lignes = _lignes_ndjson(7)
+    brutes = [json.dumps(ligne) for ligne in lignes]
+    brutes[1] = "{pas du json"
+    brutes[3] = "[1, 2]"
+    brutes[4] = json.dumps({**lignes[4], "prix_bien": "abc"})
+    brutes[5] = json.dumps({**lignes[5], "regime": "Inconnu"})
+    # Ligne vide ignorée, dernière ligne sans saut de ligne final
+    corps = "\n".join(brutes[:2] + [""] + brutes[2:])
+
+    reponse = client.post("/simulate/stream", content=corps.encode("utf-8"))
+    assert reponse.status_code == 200
+    assert reponse.headers["content-type"].startswith("application/x-ndjson")
+    assert reponse.text.endswith("\n")
+    sorties = [json.loads(ligne) for ligne in reponse.text.splitlines()]
+    assert len(sorties) == len(lignes)
+
+    # Un résultat par entrée, à la même position
+    assert sorties[1] == {"erreur": "JSON invalide"}
+    assert sorties[3] == {"erreur": "Objet JSON attendu"}
+    assert sorties[4]["erreur"][0]["loc"] == ["prix_bien"]
+    assert sorties[5] == {"erreur": "Régime inconnu"}
+    for i in (0, 2, 6):
+        assert sorties[i] == client.post("/simulate", json=lignes[i]).json()
+
+
+class ExecuteurSatureEnCours:
+    """Accepte le premier morceau du flux puis refuse les suivants."""
+
+    def __init__(self, executeur):
+        self.executeur = executeur
+        self.morceaux = 0
+
+    def sature(self):
+        return False
+
+    async def soumettre(self, fonction, *args):
+        self.morceaux += 1
+        if self.morceaux > 1:
+            raise FileSaturee("File de calcul saturée")
+        return await self.executeur.soumettre(fonction, *args)
+
+    def fermer(self):
+        pass
+
+
+def test_stream_file_saturee_en_cours(client, monkeypatch):
+    monkeypatch.setattr(Lexyo1, "TAILLE_MORCEAU", 2)
+    monkeypatch.setattr(Lexyo1, "executeur", ExecuteurSatureEnCours(Lexyo1.executeur))
+    corps = "".join(json.dumps(ligne) + "\n" for ligne in _lignes_ndjson(5))
+    reponse = client.post("/simulate/stream", content=corps.encode("utf-8"))
+    # Statut déjà envoyé : les morceaux refusés sont signalés ligne par ligne
+    assert reponse.status_code == 200
+    sorties = [json.loads(ligne) for ligne in reponse.text.splitlines()]
+    assert [("erreur" in sortie) for sortie in sorties] == [False, False, True, True, True]
+    assert sorties[2] == {"erreur": "File de calcul saturée"}
+
+
+def test_arret_ferme_executeur_et_cache(tmp_path, monkeypatch):
+    executeur = Executeur(workers=1)
+    cache_disque = CacheSQLite(str(tmp_path / "cache.sqlite"))
+    monkeypatch.setattr(Lexyo1, "executeur", executeur)
+    monkeypatch.setattr(Lexyo1, "cache_disque", cache_disque)
+    with TestClient(Lexyo1.app) as client:
+        assert client.post("/simulate", json={"regime": "Micro BIC", **ENTREE}).status_code == 200
+        assert executeur._pool is not None
+    assert executeur._pool is None
+    with pytest.raises(sqlite3.ProgrammingError):
+        cache_disque._connexion.execute("SELECT 1")
+
+
+def test_delai_depasse_504(client, monkeypatch):
+    executeur = Executeur(workers=1, delai=0.05)
+    monkeypatch.setattr(Lexyo1, "executeur", executeur)
+    monkeypatch.setattr(Lexyo1, "simulate", lambda inputs: time.sleep(0.5))
+    reponse = client.post("/simulate", json={"regime": "Micro BIC", **ENTREE})
+    assert reponse.status_code == 504
+    executeur.fermer()
+
+
+# --------------------------------------------------------------------------------
+# LOTS EN COLONNES
+# --------------------------------------------------------------------------------
+def _colonnes(n=len(REGIMES)):
+    colonnes = {"regime": [REGIMES[i % len(REGIMES)] for i in range(n)],
+                **{champ: [valeur] * n for champ, valeur in ENTREE.items()}}
+    colonnes["loyer_mensuel_hc"] = [1000.0 + 100 * i for i in range(n)]
+    return colonnes
+
+
+def _encoder(colonnes, format_):
+    if format_ == Lexyo1.FORMAT_MSGPACK:
+        return pytest.importorskip("msgpack").packb(colonnes)
+    if format_ == Lexyo1.FORMAT_ARROW:
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table(colonnes)
+        puits = pa.BufferOutputStream()
+        with pa.ipc.new_stream(puits, table.schema) as flux:
+            flux.write_table(table)
+        return puits.getvalue().to_pybytes()
+    return json.dumps(colonnes).encode("utf-8")
+
+
+def _decoder(corps, format_):
+    if format_ == Lexyo1.FORMAT_MSGPACK:
+        return pytest.importorskip("msgpack").unpackb(corps)
+    if format_ == Lexyo1.FORMAT_ARROW:
+        pa = pytest.importorskip("pyarrow")
+        return pa.ipc.open_stream(corps).read_all().to_pydict()
+    return json.loads(corps)
+
+
+def _poster_colonnes(client, colonnes, format_):
+    return client.post("/simulate/columns", content=_encoder(colonnes, format_), headers={"content-type": format_})
+
+
+@pytest.mark.parametrize("format_", Lexyo1.FORMATS_COLONNES)
+def test_colonnes_aller_retour(client, format_):
+    colonnes = _colonnes()
+    reponse = _poster_colonnes(client, colonnes, format_)
+    assert reponse.status_code == 200
+    assert reponse.headers["content-type"].startswith(format_)
+    resultats = _decoder(reponse.content, format_)
+    assert set(resultats) == {*Lexyo1.COLONNES_RESULTAT, "erreur"}
+    assert resultats["erreur"] == [None] * len(REGIMES)
+    # Même résultat que l'entrée envoyée seule à /simulate
+    for i in (0, 4, len(REGIMES) - 1):
+        seul = client.post("/simulate", json={champ: valeurs[i] for champ, valeurs in colonnes.items()}).json()
+        for nom in Lexyo1.COLONNES_RESULTAT:
+            if seul[nom] is None:
+                assert resultats[nom][i] is None or math.isnan(resultats[nom][i])
+            else:
+                assert resultats[nom][i] == pytest.approx(seul[nom], rel=1e-12)
+
+
+@pytest.mark.parametrize("format_", Lexyo1.FORMATS_COLONNES)
+def test_colonnes_erreurs_gardent_leur_indice(client, format_):
+    colonnes = _colonnes(4)
+    colonnes["regime"][2] = "Inconnu"
+    colonnes["horizon"] = [10, 41, 10, 10]
+    resultats = _decoder(_poster_colonnes(client, colonnes, format_).content, format_)
+    erreurs = resultats["erreur"]
+    assert erreurs[0] is None and erreurs[3] is None
+    assert "horizon doit être compris entre 1 et 40" in erreurs[1]
+    assert erreurs[2] == "Régime inconnu"
+    assert resultats["impot"][0] is not None and resultats["impot"][2] is None
+
+
+@pytest.mark.parametrize("changement, detail", [
+    (lambda colonnes: colonnes["prix_bien"].pop(), "Colonnes de longueurs différentes"),
+    (lambda colonnes: colonnes.update(prix_bein=[1.0] * len(REGIMES)), "Colonnes inconnues : prix_bein"),
+])
+def test_colonnes_lot_invalide_422(client, changement, detail):
+    colonnes = _colonnes()
+    changement(colonnes)
+    reponse = client.post("/simulate/columns", json=colonnes)
+    assert reponse.status_code == 422
+    assert reponse.json()["detail"] == detail
+
+
+def test_colonnes_format_inconnu_415(client):
+    reponse = client.post("/simulate/columns", content=b"a,b", headers={"content-type": "text/csv"})
+    assert reponse.status_code == 415
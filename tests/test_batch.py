@@ -0,0 +1,89 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from lexyo_core.batch import _simuler_ligne, executer_lot, simuler_morceau
+from lexyo_core.regimes import REGIMES
+
+from conftest import construire
+
+
+def _ligne(libelle, **changements):
+    simulation = construire(libelle, **changements)
+    ligne = {nom: getattr(simulation, nom) for nom, champ in type(simulation).__dataclass_fields__.items()
+             if champ.init}
+    return {**ligne, "regime": libelle}
+
+
+def _portefeuille(n, graine=0):
+    rnd = random.Random(graine)
+    lignes = []
+    for _ in range(n):
+        ligne = _ligne(
+            rnd.choice(list(REGIMES)), loyer_mensuel_hc=rnd.choice([500, 900, 1400]),
+            duree_annees=rnd.choice([1, 15, 20]), differe_mois=rnd.choice([0, 6, 18]),
+            differe_partiel=rnd.random() < 0.5, horizon=rnd.choice([10, 12]),
+        )
+        if rnd.random() < 0.2:
+            ligne["valeur_revente"] = rnd.choice([150000.0, float("nan")])
+        if rnd.random() < 0.05:
+            ligne.update(duree_amort_bati=0, duree_amort_mobilier=0, duree_amort_travaux=0)
+        lignes.append(ligne)
+    return lignes + [{"regime": "Inconnu"}, {"regime": "LMNP réel"}]
+
+
+def test_lot_identique_au_calcul_ligne_par_ligne():
+    lignes = _portefeuille(200)
+    projections, synthese = simuler_morceau(lignes, 5, 10)
+
+    attendu = [_simuler_ligne(5 + i, ligne, 10, 0.05) for i, ligne in enumerate(lignes)]
+    blocs = [bloc for bloc, _ in attendu if bloc is not None]
+    for nom, colonne in projections.items():
+        np.testing.assert_array_equal(colonne, np.concatenate([bloc[nom] for bloc in blocs]))
+    assert synthese == [ligne for _, (ligne,) in attendu]
+
+
+def test_erreurs_rapportees_a_leur_ligne():
+    lignes = [_ligne("LMNP réel"), _ligne("LMNP réel", duree_annees=1, differe_mois=18),
+              {"regime": "Inconnu"}, _ligne("LMNP réel", loyer_mensuel_hc=1200)]
+    projections, synthese = simuler_morceau(lignes, 0, 10)
+    assert [ligne["erreur"] for ligne in synthese] == [
+        None, "Durée ou différé incohérents", "Régime inconnu : 'Inconnu'", None,
+    ]
+    assert sorted(set(projections["ligne"])) == [0, 3]
+    assert synthese[3]["cashflow_mensuel_an1"] > synthese[0]["cashflow_mensuel_an1"]
+
+
+def test_entier_non_entier_rejete():
+    lignes = [_ligne("LMNP réel", duree_annees=19.7), _ligne("LMNP réel", duree_annees=20.0),
+              {**_ligne("LMNP réel"), "differe_mois": "6.5"}, _ligne("LMNP réel")]
+    projections, synthese = simuler_morceau(lignes, 0, 10)
+    # 19,7 n'est pas tronqué en 19 : la ligne est en erreur, les autres sont simulées
+    assert [ligne["erreur"] for ligne in synthese] == [
+        "Entier attendu : 19.7", None, "Entier attendu : '6.5'", None,
+    ]
+    assert sorted(set(projections["ligne"])) == [1, 3]
+    assert synthese[1]["cashflow_mensuel_an1"] == synthese[3]["cashflow_mensuel_an1"]
+
+
+def test_morceau_sans_ligne_valide():
+    projections, synthese = simuler_morceau([{"regime": "Inconnu"}], 0, 10)
+    assert all(len(colonne) == 0 for colonne in projections.values())
+    assert synthese[0]["erreur"] == "Régime inconnu : 'Inconnu'"
+
+
+def test_executer_lot(tmp_path):
+    pytest.importorskip("pyarrow")
+    entree = tmp_path / "portefeuille.csv"
+    pd.DataFrame(_portefeuille(30, graine=1)).to_csv(entree, index=False)
+    sortie = tmp_path / "projections.parquet"
+
+    traitees, erreurs = executer_lot(str(entree), str(sortie), taille_morceau=8, workers=1)
+
+    synthese = pd.read_parquet(tmp_path / "projections_synthese.parquet")
+    assert traitees == len(synthese) == 32
+    assert erreurs == synthese["erreur"].notna().sum() >= 2
+    assert synthese["ligne"].tolist() == list(range(32))
+    assert pd.read_parquet(sortie)["ligne"].is_monotonic_increasing
@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+
+from lexyo_core import emprunt
+from lexyo_core.cache import CacheLRU, CacheSQLite, empreinte_canonique
+
+
+def test_eviction_de_la_moins_recente():
+    cache = CacheLRU(taille_max=2)
+    cache.ecrire("a", 1)
+    cache.ecrire("b", 2)
+    assert cache.lire("a") == (True, 1)
+    cache.ecrire("c", 3)
+    assert cache.lire("b") == (False, None)
+    assert cache.lire("a") == (True, 1) and cache.lire("c") == (True, 3)
+    assert cache.statistiques()["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_expiration(monkeypatch):
+    horloge = [100.0]
+    monkeypatch.setattr("lexyo_core.cache.time.monotonic", lambda: horloge[0])
+    cache = CacheLRU(ttl=10)
+    cache.ecrire("a", 1)
+    horloge[0] = 109.0
+    assert cache.lire("a") == (True, 1)
+    horloge[0] = 111.0
+    assert cache.lire("a") == (False, None)
+    assert cache.statistiques()["expirations"] == 1
+
+
+def test_obtenir_calcule_une_fois():
+    cache = CacheLRU()
+    appels = []
+    for _ in range(3):
+        assert cache.obtenir("cle", lambda: appels.append(1) or 42) == 42
+    assert len(appels) == 1
+    statistiques = cache.statistiques()
+    assert (statistiques["succes"], statistiques["echecs"]) == (2, 1)
+    assert statistiques["taux_succes"] == pytest.approx(2 / 3)
+
+
+def test_taille_invalide():
+    with pytest.raises(ValueError):
+        CacheLRU(taille_max=0)
+
+
+def test_acces_concurrents():
+    cache = CacheLRU(taille_max=50)
+
+    def travail(decalage):
+        for i in range(500):
+            cache.obtenir((decalage + i) % 80, lambda: i)
+
+    fils = [threading.Thread(target=travail, args=(k * 7,)) for k in range(8)]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    statistiques = cache.statistiques()
+    assert len(cache) == 50
+    assert statistiques["succes"] + statistiques["echecs"] == 8 * 500
+
+
+def test_echeanciers_partages_en_lecture_seule():
+    emprunt.cache_echeanciers.vider()
+    premier = emprunt.echeancier_annuel(200000, 3.5, 0.3, 20, 0)
+    # Clé canonique : 200000 et 200000.0 désignent le même emprunt
+    assert emprunt.echeancier_annuel(200000.0, 3.5, 0.3, 20, 0) is premier
+    assert emprunt.cache_echeanciers.statistiques()["succes"] == 1
+    with pytest.raises(ValueError):
+        premier.interets[0] = 0.0
+
+
+def test_empreinte_canonique():
+    assert empreinte_canonique({"a": 1, "b": [1, 2]}) == empreinte_canonique({"b": [1, 2], "a": 1})
+    assert empreinte_canonique({"a": 1}) != empreinte_canonique({"a": 2})
+    assert empreinte_canonique({"régime": "Location nue"}) != empreinte_canonique({"regime": "Location nue"})
+
+
+def test_sqlite_persiste_entre_deux_ouvertures(tmp_path):
+    chemin = str(tmp_path / "cache.sqlite")
+    cache = CacheSQLite(chemin)
+    cache.ecrire("cle", {"impot": 1.5, "tri": None})
+    cache.fermer()
+
+    cache = CacheSQLite(chemin)
+    assert cache.lire("cle") == (True, {"impot": 1.5, "tri": None})
+    assert cache.lire("autre") == (False, None)
+    assert cache.statistiques()["taille"] == 1
+    cache.vider()
+    assert cache.statistiques()["taille"] == 0
+    cache.fermer()
+
+
+def test_sqlite_expiration(tmp_path, monkeypatch):
+    horloge = [1000.0]
+    monkeypatch.setattr("lexyo_core.cache.time.time", lambda: horloge[0])
+    cache = CacheSQLite(str(tmp_path / "cache.sqlite"), ttl=60)
+    cache.ecrire("cle", 1)
+    horloge[0] = 1061.0
+    assert cache.lire("cle") == (False, None)
+    assert cache.statistiques()["expirations"] == 1
+    cache.fermer()
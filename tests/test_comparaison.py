@@ -0,0 +1,31 @@
+from lexyo_core.comparaison import comparer_regimes
+
+from conftest import SAISIE
+
+
+def _eligibles(**changements):
+    return {ligne["Régime"]: ligne["Éligible"] for ligne in comparer_regimes({**SAISIE, **changements})}
+
+
+def test_tous_eligibles_sous_les_plafonds():
+    assert all(_eligibles().values())
+
+
+def test_plafond_micro_foncier():
+    # 1 500 €/mois sur 11 mois : 16 500 € de recettes, au-delà des 15 000 €
+    eligibles = _eligibles(loyer_mensuel_hc=1500)
+    assert not eligibles["Micro foncier"]
+    assert eligibles["LMNP Micro-Bic"]
+
+
+def test_plafond_micro_bic():
+    eligibles = _eligibles(loyer_mensuel_hc=8000)
+    assert not eligibles["LMNP Micro-Bic"]
+    assert not eligibles["Micro foncier"]
+    assert eligibles["LMNP réel"]
+
+
+def test_regimes_non_eligibles_classes_en_dernier():
+    lignes = comparer_regimes({**SAISIE, "loyer_mensuel_hc": 1500})
+    assert [ligne["Rang"] for ligne in lignes] == list(range(1, 11))
+    assert lignes[-1]["Régime"] == "Micro foncier"
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from lexyo_core.deficits import imputer_deficits
+
+
+def test_report_sans_limite():
+    report = imputer_deficits([-100.0, 30.0, 50.0, 40.0])
+    np.testing.assert_allclose(report.impute, [0, 30, 50, 20])
+    np.testing.assert_allclose(report.imposable, [0, 0, 0, 20])
+    np.testing.assert_allclose(report.disponible, [0, 100, 70, 20])
+    np.testing.assert_allclose(report.reportable, [100, 70, 20, 0])
+    np.testing.assert_allclose(report.expire, 0)
+
+
+def test_imputation_fifo_et_peremption():
+    # Déficits de 100 (an 1) puis 50 (an 2), imputables deux ans : les 20 € de
+    # bénéfice de l'an 3 réduisent le déficit le plus ancien, dont 80 € périment
+    report = imputer_deficits([-100.0, -50.0, 20.0, 0.0, 200.0], duree_report=2)
+    np.testing.assert_allclose(report.impute, [0, 0, 20, 0, 0])
+    np.testing.assert_allclose(report.expire, [0, 0, 0, 80, 50])
+    np.testing.assert_allclose(report.reportable, [100, 150, 130, 50, 0])
+    np.testing.assert_allclose(report.imposable, [0, 0, 0, 0, 200])
+
+
+def test_scenarios_independants():
+    resultats = np.array([[-100.0, 30.0, 50.0, 40.0], [10.0, -20.0, 5.0, 30.0]])
+    report = imputer_deficits(resultats, duree_report=10)
+    for ligne, resultat in enumerate(resultats):
+        seul = imputer_deficits(resultat, duree_report=10)
+        np.testing.assert_allclose(report.imposable[ligne], seul.imposable)
+        np.testing.assert_allclose(report.reportable[ligne], seul.reportable)
+
+
+@pytest.mark.parametrize("duree_report", [None, 1, 3])
+def test_conservation_des_deficits(duree_report):
+    resultats = np.random.default_rng(0).normal(0, 1000, size=(50, 15))
+    report = imputer_deficits(resultats, duree_report)
+    # Tout déficit créé est imputé, périmé ou encore reportable en fin de période
+    np.testing.assert_allclose(
+        np.maximum(-resultats, 0).sum(axis=-1),
+        report.impute.sum(axis=-1) + report.expire.sum(axis=-1) + report.reportable[:, -1],
+    )
+    assert np.all(report.imposable >= 0)
+    # Sans état : un second appel donne le même résultat et l'entrée est intacte
+    np.testing.assert_array_equal(imputer_deficits(resultats, duree_report).imposable, report.imposable)
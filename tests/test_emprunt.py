@@ -0,0 +1,208 @@
+import numpy as np
+import pytest
+
+from lexyo_core import emprunt
+from lexyo_core.cache import CacheLRU
+from lexyo_core.regimes import indicateurs_annuels
+
+from conftest import construire
+
+PRETS = [
+    # montant, taux, assurance, durée, différé, partiel
+    (200000, 3.5, 0.3, 20, 0, False),
+    (150000, 0.0, 0.2, 15, 0, False),
+    (180000, 4.0, 0.1, 25, 12, False),
+    (180000, 4.0, 0.1, 25, 18, True),
+]
+
+
+def _echeancier_reference(montant, taux, assurance, duree, differe, partiel):
+    """Échéancier mois par mois, en boucle : (intérêts, principal, capital restant) par mois."""
+    tm = taux / 100 / 12
+    capital, mensualite = float(montant), None
+    lignes = []
+    for mois in range(1, duree * 12 + 1):
+        interets = capital * tm
+        if mois <= differe:
+            principal = 0.0
+            if not partiel:
+                capital += interets
+        else:
+            if mensualite is None:
+                n = duree * 12 - differe
+                mensualite = capital * tm / (1 - (1 + tm) ** -n) if tm else capital / n
+            principal = mensualite - interets
+            capital -= principal
+        lignes.append((interets, principal, capital))
+    interets, principal, capital = map(np.array, zip(*lignes))
+    return interets, principal, capital, mensualite + montant * assurance / 100 / 12
+
+
+@pytest.mark.parametrize("pret", PRETS)
+def test_echeancier_mensuel_identique_a_la_boucle(pret):
+    echeancier = emprunt.echeancier_emprunt(*pret)
+    interets, principal, capital, mensualite = _echeancier_reference(*pret)
+    duree = pret[3]
+    np.testing.assert_array_equal(echeancier.mois, np.arange(1, duree * 12 + 1))
+    np.testing.assert_array_equal(echeancier.annee, np.repeat(np.arange(1, duree + 1), 12))
+    np.testing.assert_allclose(echeancier.interets, interets, atol=1e-6)
+    np.testing.assert_allclose(echeancier.principal, principal, atol=1e-6)
+    np.testing.assert_allclose(echeancier.capital_restant, np.maximum(capital, 0.0), atol=1e-6)
+    np.testing.assert_allclose(echeancier.assurance, pret[0] * pret[2] / 100 / 12)
+    assert echeancier.mensualite == pytest.approx(mensualite)
+    assert echeancier.capital_restant[-1] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_echeancier_mensuel_en_cache_et_en_lecture_seule():
+    echeancier = emprunt.echeancier_emprunt(*PRETS[0])
+    assert emprunt.echeancier_emprunt(*PRETS[0]) is echeancier
+    with pytest.raises(ValueError):
+        echeancier.interets[0] = 0.0
+
+
+def test_echeancier_duree_incoherente():
+    with pytest.raises(ValueError, match="Durée ou différé incohérents"):
+        emprunt.echeancier_emprunt(100000, 3.0, 0.2, 1, 12)
+
+
+@pytest.mark.parametrize("pret", PRETS)
+def test_totaux_annuels_egaux_aux_sommes_mensuelles(pret):
+    mensuel = emprunt.echeancier_lot(*pret, par="mois")
+    annuel = emprunt.echeancier_lot(*pret, par="annee")
+    for colonne in ("interets", "principal", "assurance", "interets_capitalises"):
+        sommes = getattr(mensuel, colonne).reshape(-1, 12).sum(axis=1)
+        np.testing.assert_allclose(getattr(annuel, colonne)[0], sommes, atol=1e-6)
+    np.testing.assert_allclose(annuel.capital_restant[0], mensuel.capital_restant[0, 11::12], atol=1e-6)
+
+
+@pytest.mark.parametrize("pret", PRETS)
+def test_echeancier_annuel_egal_a_l_echeancier_mensuel(pret, monkeypatch):
+    # Cache vide et appels au moteur relevés : aucun échéancier mensuel n'est construit
+    monkeypatch.setattr(emprunt, "cache_echeanciers", CacheLRU(taille_max=16))
+    appels = []
+    moteur = emprunt.echeancier_lot
+
+    def echeancier_lot(*args, par="mois"):
+        appels.append(par)
+        return moteur(*args, par=par)
+
+    monkeypatch.setattr(emprunt, "echeancier_lot", echeancier_lot)
+    annuel = emprunt.echeancier_annuel(*pret)
+    assert appels == ["annee"]
+
+    mensuel = emprunt.echeancier_emprunt(*pret)
+    interets, _, _, _ = _echeancier_reference(*pret)
+    montant, differe, partiel = pret[0], pret[4], pret[5]
+    capitalises = np.where((np.arange(1, len(interets) + 1) <= differe) & (not partiel), interets, 0.0)
+    for colonne, valeurs in (("interets", mensuel.interets), ("principal", mensuel.principal),
+                             ("assurance", mensuel.assurance), ("interets_capitalises", capitalises)):
+        np.testing.assert_allclose(getattr(annuel, colonne), np.bincount(mensuel.annee - 1, valeurs), atol=1e-6)
+    np.testing.assert_allclose(annuel.capital_restant, mensuel.capital_restant[11::12], atol=1e-6)
+    np.testing.assert_array_equal(annuel.annee, np.arange(1, pret[3] + 1))
+    assert annuel.actif.all()
+    assert annuel.mensualite == pytest.approx(mensuel.mensualite)
+    assert annuel.principal.sum() == pytest.approx(montant + annuel.interets_capitalises.sum())
+
+
+def test_echeancier_annuel_sur_horizon():
+    annuel = emprunt.echeancier_annuel(*PRETS[1])
+    interets = annuel.sur_horizon("interets", 20)
+    np.testing.assert_array_equal(interets[:15], annuel.interets)
+    np.testing.assert_array_equal(interets[15:], 0.0)
+    np.testing.assert_array_equal(annuel.sur_horizon("interets", 5), annuel.interets[:5])
+
+
+@pytest.mark.parametrize("pret", PRETS)
+def test_principal_rembourse_tout_le_capital(pret):
+    annuel = emprunt.echeancier_annuel(*pret)
+    montant = pret[0]
+    assert annuel.principal.sum() == pytest.approx(montant + annuel.interets_capitalises.sum())
+    assert annuel.capital_restant[-1] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_mensualite_sans_differe():
+    # 100 000 € sur 10 ans à 3 % : 965,61 € hors assurance
+    assert emprunt.mensualite_emprunt(100000, 3.0, 0.0, 10, 0) == pytest.approx(965.61, abs=0.01)
+
+
+@pytest.mark.parametrize("partiel", [False, True])
+def test_annuites_pendant_le_differe(partiel):
+    montant, taux, assurance = 180000, 4.0, 0.3
+    annuel = emprunt.echeancier_annuel(montant, taux, assurance, 20, 12, partiel)
+    annuites = annuel.annuites_sur_horizon(5)
+    assurance_annuelle = montant * assurance / 100
+    # Différé total : seule l'assurance est payée ; partiel : intérêts en plus
+    attendu = assurance_annuelle + (montant * taux / 100 if partiel else 0.0)
+    assert annuites[0] == pytest.approx(attendu)
+    np.testing.assert_allclose(annuites[1:], annuel.mensualite * 12)
+
+
+def test_annuites_nulles_apres_le_pret():
+    annuel = emprunt.echeancier_annuel(100000, 3.0, 0.2, 10, 0)
+    annuites = annuel.annuites_sur_horizon(15)
+    np.testing.assert_allclose(annuites[:10], annuel.mensualite * 12)
+    np.testing.assert_array_equal(annuites[10:], 0.0)
+
+
+def test_lot_identique_aux_emprunts_seuls():
+    montants = np.array([[100000.0], [200000.0]])
+    lot = emprunt.echeancier_annuel(montants, 3.5, 0.3, 20, 12, True)
+    for i, montant in enumerate(montants[:, 0]):
+        seul = emprunt.echeancier_annuel(montant, 3.5, 0.3, 20, 12, True)
+        np.testing.assert_allclose(lot.annuites_sur_horizon(10)[i], seul.annuites_sur_horizon(10))
+
+
+@pytest.mark.parametrize("par", ["mois", "annee"])
+def test_lot_heterogene_identique_aux_emprunts_seuls(par):
+    # Durées différentes : les périodes après la fin d'un prêt plus court sont à zéro
+    lot = emprunt.echeancier_lot(*map(np.array, zip(*PRETS)), par=par)
+    assert len(lot) == len(PRETS)
+    assert lot.interets.shape == (len(PRETS), 25 * (12 if par == "mois" else 1))
+    for i, pret in enumerate(PRETS):
+        seul = emprunt.echeancier_emprunt(*pret) if par == "mois" else emprunt.echeancier_annuel(*pret)
+        n = len(seul.interets)
+        for colonne in ("interets", "principal", "assurance", "capital_restant"):
+            np.testing.assert_allclose(getattr(lot, colonne)[i, :n], getattr(seul, colonne), atol=1e-6)
+            np.testing.assert_array_equal(getattr(lot, colonne)[i, n:], 0.0)
+        np.testing.assert_array_equal(lot.actif[i], np.arange(lot.actif.shape[1]) < n)
+        assert lot.mensualite[i] == pytest.approx(seul.mensualite)
+
+
+def test_lot_depuis_une_table():
+    pd = pytest.importorskip("pandas")
+    table = {colonne: [pret[k] for pret in PRETS] for k, colonne in enumerate(emprunt.COLONNES_EMPRUNT)}
+    partiel = [pret[5] for pret in PRETS]
+    attendu = emprunt.echeancier_lot(*map(np.array, zip(*PRETS)), par="annee")
+    for genre in (dict, pd.DataFrame):
+        # Sans colonne differe_partiel : différés totaux
+        sans = emprunt.echeancier_lot_table(genre(table), par="annee")
+        np.testing.assert_array_equal(sans.interets[:3], attendu.interets[:3])
+        assert not np.allclose(sans.interets[3], attendu.interets[3])
+        avec = emprunt.echeancier_lot_table(genre({**table, "differe_partiel": partiel}), par="annee")
+        for colonne in ("interets", "principal", "capital_restant", "interets_capitalises"):
+            np.testing.assert_array_equal(getattr(avec, colonne), getattr(attendu, colonne))
+
+
+@pytest.mark.parametrize("changements, message", [
+    ({"par": "semaine"}, "par doit valoir"),
+    ({"differe_mois": np.array([0, 240])}, "Durée ou différé incohérents"),
+])
+def test_lot_invalide(changements, message):
+    parametres = {"montant_emprunt": np.array([100000.0, 200000.0]), "taux_interet": 3.0, "taux_assurance": 0.2,
+                  "duree_annees": np.array([10, 20]), "differe_mois": 0, **changements}
+    with pytest.raises(ValueError, match=message):
+        emprunt.echeancier_lot(**parametres)
+
+
+def test_cashflow_des_regimes_pendant_un_differe_total(libelle):
+    simulation = construire(libelle, differe_mois=12)
+    annuel = emprunt.echeancier_annuel(
+        simulation.montant_emprunt, simulation.taux_interet, simulation.taux_assurance,
+        simulation.duree_annees, 12, False
+    )
+    sans_emprunt = construire(libelle, differe_mois=12, taux_interet=0.0, taux_assurance=0.0)
+    avec, sans = indicateurs_annuels(simulation), indicateurs_annuels(sans_emprunt)
+    ecart = sans["cashflow_mensuel"][0] - avec["cashflow_mensuel"][0]
+    # En année 1, l'emprunt ne coûte que l'assurance, l'effet sur l'impôt mis à part
+    impots = sans["impots"][0] - avec["impots"][0]
+    assert ecart * 12 == pytest.approx(annuel.assurance[0] - impots, abs=0.1)
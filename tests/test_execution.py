@@ -0,0 +1,47 @@
+import asyncio
+import threading
+
+import pytest
+
+from lexyo_core.execution import DelaiDepasse, Executeur, FileSaturee
+
+
+def test_resultat_et_place_rendue():
+    executeur = Executeur(workers=1, taille_file=0)
+    assert asyncio.run(executeur.soumettre(sum, [1, 2, 3])) == 6
+    assert executeur.en_cours == 0
+    executeur.fermer()
+
+
+def test_file_saturee():
+    executeur = Executeur(workers=1, taille_file=1)
+    liberation = threading.Event()
+
+    async def scenario():
+        occupes = [asyncio.ensure_future(executeur.soumettre(liberation.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert executeur.sature()
+        with pytest.raises(FileSaturee):
+            await executeur.soumettre(sum, [])
+        liberation.set()
+        await asyncio.gather(*occupes)
+
+    asyncio.run(scenario())
+    assert executeur.en_cours == 0
+    executeur.fermer()
+
+
+def test_delai_depasse():
+    executeur = Executeur(workers=1, delai=0.05)
+    liberation = threading.Event()
+    with pytest.raises(DelaiDepasse):
+        asyncio.run(executeur.soumettre(liberation.wait))
+    # La place reste prise jusqu'à la fin effective du calcul
+    assert executeur.en_cours == 1
+    liberation.set()
+    executeur.fermer()
+
+
+def test_type_de_pool_inconnu():
+    with pytest.raises(ValueError):
+        Executeur(type_pool="gpu")
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from lexyo_core.finance import flux_investissement, rendement, tri, van
+
+
+def test_van_valeurs_connues():
+    assert van([-100.0, 110.0], 0.10) == pytest.approx(0.0)
+    # 500 × (1/1,05 + 1/1,05² + 1/1,05³) − 1 000
+    assert van([-1000.0, 500.0, 500.0, 500.0], 0.05) == pytest.approx(361.6240, abs=1e-4)
+    assert van([-1000.0, 500.0, 500.0, 500.0], 0.0) == pytest.approx(500.0)
+
+
+@pytest.mark.parametrize("flux, attendu", [
+    ([-100.0, 110.0], 0.10),
+    ([-1000.0, 0.0, 1210.0], 0.10),
+    ([-1000.0, 500.0, 500.0, 500.0], 0.233752),
+    ([-1000.0, 100.0, 100.0, 100.0], -0.424417),
+])
+def test_tri_valeurs_connues(flux, attendu):
+    taux = tri(flux)
+    assert taux == pytest.approx(attendu, abs=1e-6)
+    assert van(flux, taux) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_tri_sans_changement_de_signe():
+    assert np.isnan(tri([100.0, 10.0, 10.0]))
+
+
+def test_tri_vectorise():
+    flux = np.array([[-100.0, 110.0, 0.0], [-1000.0, 0.0, 1210.0], [100.0, 10.0, 10.0]])
+    taux = tri(flux)
+    np.testing.assert_allclose(taux[:2], [0.10, 0.10], atol=1e-9)
+    assert np.isnan(taux[2])
+
+
+def test_rendement():
+    resultat = rendement(10000.0, [500.0, 500.0, 500.0], 12000.0, taux_actualisation=0.05)
+    np.testing.assert_array_equal(flux_investissement(10000.0, [500.0, 500.0, 500.0], 12000.0),
+                                  [-10000.0, 500.0, 500.0, 12500.0])
+    assert resultat.cash_on_cash == pytest.approx(0.05)
+    assert resultat.multiple == pytest.approx(1.35)
+    assert resultat.van == pytest.approx(van([-10000.0, 500.0, 500.0, 12500.0], 0.05))
+    assert van([-10000.0, 500.0, 500.0, 12500.0], resultat.tri) == pytest.approx(0.0, abs=1e-6)
+
+
+def test_rendement_sans_apport():
+    resultat = rendement(0.0, [500.0, 500.0], 1000.0)
+    assert np.isnan(resultat.cash_on_cash) and np.isnan(resultat.multiple) and np.isnan(resultat.tri)
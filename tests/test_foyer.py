@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import Lexyo1
+from lexyo_core.foyer import Foyer, bareme_ir
+
+from conftest import construire
+from test_api import ExecuteurSature
+
+
+@pytest.mark.parametrize("revenu, parts, impot, tmi", [
+    (11294, 1, 0.0, 0.0),
+    (28797, 1, (28797 - 11294) * 0.11, 0.11),
+    (50000, 1, (28797 - 11294) * 0.11 + (50000 - 28797) * 0.30, 0.30),
+    (100000, 2.5, 2.5 * ((28797 - 11294) * 0.11 + (40000 - 28797) * 0.30), 0.30),
+])
+def test_bareme(revenu, parts, impot, tmi):
+    calcule, taux = bareme_ir(np.array([revenu], dtype=float), parts)
+    assert calcule[0] == pytest.approx(impot)
+    assert taux[0] == tmi
+
+
+def test_modifier_un_bien_ne_recalcule_que_ce_bien():
+    foyer = Foyer(60000, 2)
+    for libelle in ("LMNP réel", "Location nue", "SCI à l'IS"):
+        foyer.ajouter(libelle, construire(libelle))
+    foyer.synthese()
+    assert foyer.recalculs == 3
+    foyer.modifier("Location nue", loyer_mensuel_hc=1500)
+    foyer.synthese()
+    assert foyer.recalculs == 4
+    foyer.retirer("SCI à l'IS")
+    foyer.synthese()
+    assert foyer.recalculs == 4
+
+
+def test_horizon_different_refuse():
+    foyer = Foyer(60000, 2)
+    foyer.ajouter("a", construire("LMNP réel"))
+    with pytest.raises(ValueError):
+        foyer.ajouter("b", construire("LMNP réel", horizon=12))
+
+
+def _bien(libelle, **changements):
+    simulation = construire(libelle, **changements)
+    parametres = {nom: getattr(simulation, nom) for nom in simulation.__dataclass_fields__
+                  if simulation.__dataclass_fields__[nom].init}
+    return {"regime": libelle, **{nom: float(v) if isinstance(v, np.generic) else v for nom, v in parametres.items()}}
+
+
+@pytest.fixture
+def client():
+    Lexyo1.cache_biens.vider()
+    with TestClient(Lexyo1.app) as client:
+        yield client
+
+
+def test_foyer_api_cache_par_bien(client, monkeypatch):
+    biens = [_bien("LMNP réel"), _bien("Location nue")]
+    corps = {"revenu_annuel_global": 60000, "nombre_parts": 2, "biens": biens}
+    assert client.post("/foyer", json=corps).json()["biens_recalcules"] == 2
+    biens[1]["loyer_mensuel_hc"] = 1500
+    assert client.post("/foyer", json=corps).json()["biens_recalcules"] == 1
+
+    # Tout est en cache : la réponse ne passe pas par la file de calcul, même saturée
+    monkeypatch.setattr(Lexyo1, "executeur", ExecuteurSature())
+    reponse = client.post("/foyer", json=corps)
+    assert reponse.status_code == 200
+    assert reponse.json()["biens_recalcules"] == 0
+
+
+@pytest.mark.parametrize("biens, parts", [
+    ([{"regime": "Inconnu"}], 1),
+    ([], 1),
+    ([{**_bien("LMNP réel"), "prix_bien": [1]}], 1),
+    ([{**_bien("LMNP réel"), "duree_amort_bati": 0}], 1),
+    ([_bien("LMNP réel")], 0),
+])
+def test_foyer_api_erreurs_422(client, biens, parts):
+    reponse = client.post("/foyer", json={"revenu_annuel_global": 60000, "nombre_parts": parts, "biens": biens})
+    assert reponse.status_code == 422
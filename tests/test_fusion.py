@@ -0,0 +1,46 @@
+import ast
+from pathlib import Path
+
+import pytest
+
+from lexyo_core.regimes import REGIMES
+
+from conftest import construire
+
+st = pytest.importorskip("streamlit")
+
+
+def _fonction_fusion(nom, espace):
+    """Définit dans `espace` la fonction `nom` de Fusion.py, décorateurs compris.
+
+    Importer Fusion exécuterait toute la page (connexion, formulaires) : seule
+    la définition de la fonction est compilée.
+    """
+    module = ast.parse(Path(__file__).resolve().parents[1].joinpath("Fusion.py").read_text(encoding="utf-8"))
+    definition = next(noeud for noeud in module.body if isinstance(noeud, ast.FunctionDef) and noeud.name == nom)
+    exec(compile(ast.Module(body=[definition], type_ignores=[]), "Fusion.py", "exec"), espace)
+    return espace[nom]
+
+
+def test_simuler_en_cache_pour_des_entrees_identiques():
+    constructions = []
+
+    def lmnp_reel(*args, **options):
+        constructions.append(options)
+        return REGIMES["LMNP réel"](*args, **options)
+
+    simuler = _fonction_fusion("simuler", {"st": st, "REGIMES": {"LMNP réel": lmnp_reel}})
+    simuler.clear()
+    simulation = construire("LMNP réel")
+    parametres = {nom: getattr(simulation, nom) for nom, champ in type(simulation).__dataclass_fields__.items()
+                  if champ.init}
+
+    premiere = simuler("LMNP réel", **parametres)
+    seconde = simuler("LMNP réel", **parametres)
+    assert len(constructions) == 1
+    assert seconde.resultat_fiscal_annuel().equals(premiere.resultat_fiscal_annuel())
+
+    # Une saisie modifiée relance la simulation
+    simuler("LMNP réel", **{**parametres, "loyer_mensuel_hc": parametres["loyer_mensuel_hc"] + 100})
+    assert len(constructions) == 2
+    simuler.clear()
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from lexyo_core import identifiants
+from lexyo_core.identifiants import Identifiants, hacher_mot_de_passe
+
+
+@pytest.fixture
+def derivations(monkeypatch):
+    # Itérations réduites et décompte des dérivations PBKDF2
+    monkeypatch.setattr(identifiants, "ITERATIONS", 1000)
+    appels = []
+    deriver = identifiants._deriver
+
+    def compter(mot_de_passe, sel, iterations):
+        appels.append((mot_de_passe, sel))
+        return deriver(mot_de_passe, sel, iterations)
+
+    monkeypatch.setattr(identifiants, "_deriver", compter)
+    return appels
+
+
+def _ecrire(chemin, lignes, decalage=0):
+    chemin.write_text("username,password\n" + "".join(f"{nom},{valeur}\n" for nom, valeur in lignes),
+                      encoding="utf-8")
+    # Date de modification distincte même sur un système de fichiers peu précis
+    os.utime(chemin, ns=(10 ** 18 + decalage, 10 ** 18 + decalage))
+
+
+@pytest.fixture
+def fichier(tmp_path, derivations):
+    chemin = tmp_path / "credentials.csv"
+    _ecrire(chemin, [("alice", hacher_mot_de_passe("secret", iterations=1000)), ("bob", "ancien")])
+    return chemin
+
+
+def test_mots_de_passe(fichier):
+    magasin = Identifiants(str(fichier))
+    assert magasin.verifier("alice", "secret")
+    assert not magasin.verifier("alice", "Secret")
+    assert magasin.verifier("bob", "ancien")
+    assert not magasin.verifier("bob", "")
+    assert len(magasin) == 2
+
+
+def test_utilisateur_inconnu_passe_par_le_leurre(fichier, derivations):
+    magasin = Identifiants(str(fichier))
+    derivations.clear()
+    assert not magasin.verifier("carol", "secret")
+    # Une dérivation, avec le sel du leurre : même coût qu'un compte existant
+    assert derivations == [("secret", magasin._leurre[1])]
+
+
+def test_mot_de_passe_en_clair_hache_a_la_premiere_verification(fichier, derivations):
+    magasin = Identifiants(str(fichier))
+    derivations.clear()
+    magasin.actualiser()
+    assert derivations == []
+    magasin.verifier("bob", "ancien")
+    magasin.verifier("bob", "ancien")
+    # Empreinte de la ligne dérivée une fois, puis une dérivation par vérification
+    assert [mot for mot, _ in derivations] == ["ancien", "ancien", "ancien"]
+
+
+def test_rechargement_quand_le_fichier_change(fichier, derivations):
+    magasin = Identifiants(str(fichier))
+    assert magasin.verifier("bob", "ancien")
+    _ecrire(fichier, [("alice", hacher_mot_de_passe("nouveau", iterations=1000)), ("bob", "ancien")], 1)
+    derivations.clear()
+    magasin.actualiser()
+    # Ligne de bob inchangée : son empreinte est reprise sans nouvelle dérivation
+    assert derivations == []
+    assert magasin.verifier("alice", "nouveau") and not magasin.verifier("alice", "secret")
+    assert magasin.verifier("bob", "ancien")
+
+    _ecrire(fichier, [("bob", "change")], 2)
+    assert not magasin.verifier("bob", "ancien") and magasin.verifier("bob", "change")
+    assert not magasin.verifier("alice", "nouveau")
+    assert len(magasin) == 1
+
+
+def test_fichier_manquant(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Identifiants(str(tmp_path / "absent.csv")).actualiser()
@@ -0,0 +1,14 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+def test_import_sans_dependances_de_l_interface():
+    # Le cœur ne charge ni pandas, ni Streamlit, ni matplotlib à l'import
+    code = (
+        "import sys, lexyo_core; "
+        "print(' '.join(m for m in ('pandas', 'streamlit', 'matplotlib', 'altair') if m in sys.modules))"
+    )
+    sortie = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                            cwd=Path(__file__).resolve().parent.parent)
+    assert sortie.stdout.strip() == ""
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from lexyo_core.regimes import indicateurs_annuels
+
+from conftest import construire
+
+
+def test_resultats_memoises_partages(libelle):
+    simulation = construire(libelle)
+    assert simulation.resultat_fiscal_annuel() is simulation.resultat_fiscal_annuel()
+
+
+def test_modifier_un_champ_equivaut_a_reconstruire(libelle):
+    simulation = construire(libelle)
+    indicateurs_annuels(simulation)
+
+    simulation.loyer_mensuel_hc = 1400
+    simulation.tmi = 41
+    if hasattr(simulation, "prix_bien"):
+        simulation.prix_bien = 400000
+        attendu = construire(libelle, loyer_mensuel_hc=1400, tmi=41, prix_bien=400000)
+        assert simulation.montant_emprunt == attendu.montant_emprunt
+    else:
+        attendu = construire(libelle, loyer_mensuel_hc=1400, tmi=41)
+
+    for nom, serie in indicateurs_annuels(attendu).items():
+        np.testing.assert_allclose(indicateurs_annuels(simulation)[nom], serie)
+    pd.testing.assert_frame_equal(simulation.resultat_fiscal_annuel(), attendu.resultat_fiscal_annuel())
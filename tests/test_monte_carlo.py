@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from lexyo_core.monte_carlo import HypothesesMonteCarlo, Loi, simuler_monte_carlo
+from lexyo_core.regimes import LMNPReel, indicateurs_annuels
+from lexyo_core.statistiques import StatistiquesFlux
+
+from conftest import construire
+
+SIMULATION = construire("LMNP réel")
+PARAMETRES = {nom: getattr(SIMULATION, nom) for nom, champ in LMNPReel.__dataclass_fields__.items() if champ.init}
+HYPOTHESES = HypothesesMonteCarlo(
+    ecart_loyer=Loi("normale", 0.0, 0.1, minimum=-0.5),
+    vacance_mois=Loi("triangulaire", 0.0, 0.5, 3.0),
+    taux_interet=Loi("uniforme", 2.5, 4.5),
+    indexation_loyer=Loi("normale", 1.5, 1.0),
+    inflation_charges=Loi("normale", 2.0, 1.0),
+)
+
+
+def test_statistiques_en_flux():
+    valeurs = np.random.default_rng(1).normal(100.0, 30.0, size=(20_000, 3))
+    statistiques = StatistiquesFlux(colonnes=3)
+    for debut in range(0, len(valeurs), 3_000):
+        statistiques.ajouter(valeurs[debut:debut + 3_000])
+    np.testing.assert_allclose(statistiques.moyenne, valeurs.mean(axis=0))
+    np.testing.assert_allclose(statistiques.ecart_type, valeurs.std(axis=0))
+    np.testing.assert_allclose(statistiques.part_negatifs, (valeurs < 0).mean(axis=0))
+    etendue = valeurs.max() - valeurs.min()
+    np.testing.assert_allclose(statistiques.quantiles([0.05, 0.5, 0.95]),
+                               np.quantile(valeurs, [0.05, 0.5, 0.95], axis=0), atol=etendue / 500)
+
+
+def test_statistiques_valeurs_non_finies():
+    valeurs = np.random.default_rng(2).normal(100.0, 30.0, size=(5_000, 3))
+    valeurs[::7, 0] = np.nan
+    valeurs[3::11, 1] = -np.inf
+    valeurs[:, 2] = np.nan
+    # Premier lot sans aucune valeur finie : l'étendue de l'histogramme n'est pas fixée par lui
+    valeurs[:1000] = np.nan
+    statistiques = StatistiquesFlux(colonnes=3)
+    for debut in range(0, len(valeurs), 1_000):
+        statistiques.ajouter(valeurs[debut:debut + 1_000])
+
+    finis = np.isfinite(valeurs)
+    np.testing.assert_array_equal(statistiques.n, finis.sum(axis=0))
+    np.testing.assert_array_equal(statistiques.non_finis, (~finis).sum(axis=0))
+    for c in (0, 1):
+        retenues = valeurs[finis[:, c], c]
+        assert statistiques.moyenne[c] == pytest.approx(retenues.mean())
+        assert statistiques.ecart_type[c] == pytest.approx(retenues.std())
+        assert statistiques.part_negatifs[c] == pytest.approx((retenues < 0).mean())
+        assert (statistiques.minimum[c], statistiques.maximum[c]) == (retenues.min(), retenues.max())
+        np.testing.assert_allclose(statistiques.quantiles([0.05, 0.5, 0.95])[:, c],
+                                   np.quantile(retenues, [0.05, 0.5, 0.95]), atol=np.ptp(retenues) / 500)
+        bornes, comptes = statistiques.histogramme(c, nb_classes=20)
+        assert comptes.sum() == len(retenues) and np.isfinite(bornes).all()
+    # Colonne sans valeur finie : statistiques indéfinies, sans erreur
+    assert np.isnan(statistiques.ecart_type[2]) and np.isnan(statistiques.part_negatifs[2])
+    assert np.isnan(statistiques.quantiles([0.5])[0, 2])
+
+
+def test_hypotheses_fixes_redonnent_la_simulation():
+    resultat = simuler_monte_carlo(LMNPReel, PARAMETRES, HypothesesMonteCarlo(), chemins=100, taille_lot=30)
+    attendu = indicateurs_annuels(SIMULATION)["cashflow_mensuel"]
+    np.testing.assert_allclose(resultat.cashflow_moyen, attendu)
+    np.testing.assert_allclose(resultat.cashflow_quantiles, np.tile(attendu, (3, 1)), atol=1e-6)
+
+
+def test_tirage_reproductible():
+    premier = simuler_monte_carlo(LMNPReel, PARAMETRES, HYPOTHESES, chemins=2_000, taille_lot=500, graine=7)
+    second = simuler_monte_carlo(LMNPReel, PARAMETRES, HYPOTHESES, chemins=2_000, taille_lot=500, graine=7)
+    np.testing.assert_array_equal(premier.cashflow_quantiles, second.cashflow_quantiles)
+    assert premier.proba_cumul_negatif == second.proba_cumul_negatif
+    assert premier.cashflow_quantiles.shape == (3, SIMULATION.horizon)
+    assert np.all(np.diff(premier.cashflow_quantiles, axis=0) >= 0)
+    assert np.all((premier.proba_cashflow_negatif >= 0) & (premier.proba_cashflow_negatif <= 1))
+
+
+def test_loi_inconnue():
+    with pytest.raises(ValueError, match="Loi inconnue"):
+        simuler_monte_carlo(LMNPReel, PARAMETRES, HypothesesMonteCarlo(taux_interet=Loi("poisson", 3.0)),
+                            chemins=10)
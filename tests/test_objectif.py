@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from lexyo_core import objectif
+from lexyo_core.regimes import LMNPReel
+
+from conftest import construire
+
+PARAMETRES = {nom: getattr(construire("LMNP réel"), nom) for nom, champ in LMNPReel.__dataclass_fields__.items()
+              if champ.init}
+
+
+def _indicateur_simule(monkeypatch, variable, fonction):
+    # Remplace le moteur par une fonction connue de la variable ajustée
+    def evaluer(classe, lot, indicateur, annee, valeur_revente):
+        return fonction(np.asarray(lot[variable], dtype=float)[:, 0])
+    monkeypatch.setattr(objectif, "evaluer_indicateur", evaluer)
+
+
+def test_loyer_pour_un_cashflow_nul():
+    solution = objectif.resoudre_objectif(LMNPReel, PARAMETRES, "loyer_mensuel_hc", 0, 5000, 0.0)
+    verification = objectif.evaluer_indicateur(LMNPReel, {**PARAMETRES, "loyer_mensuel_hc": solution.valeur})
+    assert abs(float(verification)) < 0.01
+    assert solution.evaluations <= 10
+
+
+@pytest.mark.parametrize("trou", [(45.0, 48.0), (49.0, 49.5), (49.9, 50.1)])
+def test_valeurs_non_finies_dans_l_intervalle(monkeypatch, trou):
+    _indicateur_simule(monkeypatch, "loyer_mensuel_hc",
+                       lambda x: np.where((x > trou[0]) & (x < trou[1]), np.nan, x - 50))
+    solution = objectif.resoudre_objectif(LMNPReel, PARAMETRES, "loyer_mensuel_hc", 0, 100, 0.0)
+    assert solution.valeur == pytest.approx(50.0, abs=1e-6)
+
+
+def test_indicateur_jamais_defini(monkeypatch):
+    _indicateur_simule(monkeypatch, "loyer_mensuel_hc", lambda x: np.full_like(x, np.nan))
+    with pytest.raises(ValueError, match="non atteinte"):
+        objectif.resoudre_objectif(LMNPReel, PARAMETRES, "loyer_mensuel_hc", 0, 100, 0.0)
+
+
+def test_entier_premiere_valeur_non_finie(monkeypatch):
+    # Durées 10 à 13 : NaN, -5, -3, +2 → la cible est franchie à 13, pas à 11
+    ecarts = {10: np.nan, 11: -5.0, 12: -3.0, 13: 2.0}
+    _indicateur_simule(monkeypatch, "duree_annees", lambda x: np.array([ecarts[int(v)] for v in x]))
+    solution = objectif.resoudre_objectif(LMNPReel, PARAMETRES, "duree_annees", 10, 13, 0.0)
+    assert solution.valeur == 13
+
+
+def test_entier_valeurs_refusees_par_le_moteur():
+    # Différé de 36 mois : les durées de 1 à 3 ans sont refusées par l'échéancier
+    parametres = {**PARAMETRES, "differe_mois": 36}
+    solution = objectif.resoudre_objectif(LMNPReel, parametres, "duree_annees", 1, 30, -1500.0, annee=5)
+    attendue = objectif.resoudre_objectif(LMNPReel, parametres, "duree_annees", 4, 30, -1500.0, annee=5)
+    assert solution.valeur == attendue.valeur
+    assert solution.valeur_atteinte == attendue.valeur_atteinte
+
+
+def test_entier_toutes_valeurs_refusees():
+    with pytest.raises(ValueError, match="Durée ou différé incohérents"):
+        objectif.resoudre_objectif(LMNPReel, {**PARAMETRES, "differe_mois": 36}, "duree_annees", 1, 3, 0.0)
+
+
+def test_entier_jamais_defini(monkeypatch):
+    _indicateur_simule(monkeypatch, "duree_annees", lambda x: np.full_like(x, np.nan))
+    with pytest.raises(ValueError, match="non atteinte"):
+        objectif.resoudre_objectif(LMNPReel, PARAMETRES, "duree_annees", 10, 13, 0.0)
+
+
+def test_cible_hors_bornes():
+    with pytest.raises(ValueError, match="non atteinte"):
+        objectif.resoudre_objectif(LMNPReel, PARAMETRES, "loyer_mensuel_hc", 0, 100, 10000.0)
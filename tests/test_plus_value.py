@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from lexyo_core.plus_value import (
+    ABATTEMENT_IR, ABATTEMENT_LONG_TERME, ABATTEMENT_PS, plus_value_particulier,
+    plus_value_professionnelle, plus_value_societe, surtaxe_plus_value,
+)
+
+
+@pytest.mark.parametrize("annees, ir, ps", [
+    (0, 0.0, 0.0),
+    (5, 0.0, 0.0),
+    (6, 0.06, 0.0165),
+    (10, 0.30, 0.0825),
+    (21, 0.96, 0.264),
+    (22, 1.0, 0.28),
+    (23, 1.0, 0.37),
+    (29, 1.0, 0.91),
+    (30, 1.0, 1.0),
+    (40, 1.0, 1.0),
+])
+def test_tables_particuliers(annees, ir, ps):
+    assert ABATTEMENT_IR[annees] == pytest.approx(ir)
+    assert ABATTEMENT_PS[annees] == pytest.approx(ps)
+
+
+def test_table_long_terme():
+    np.testing.assert_allclose(ABATTEMENT_LONG_TERME[[0, 5, 6, 10, 15, 20]], [0, 0, 0.1, 0.5, 1.0, 1.0])
+
+
+@pytest.mark.parametrize("assiette, surtaxe", [
+    (50_000, 0.0),
+    (55_000, 0.02 * 55_000 - 5_000 / 20),
+    (60_000, 1_200.0),
+    (100_000, 2_000.0),
+    (105_000, 0.03 * 105_000 - 5_000 / 10),
+    (300_000, 18_000.0),
+])
+def test_surtaxe(assiette, surtaxe):
+    assert surtaxe_plus_value(assiette) == pytest.approx(surtaxe)
+
+
+def test_particulier_forfaits_et_abattements():
+    # Après dix ans : forfaits de 7 500 € (frais) et 15 000 € (travaux)
+    pv = plus_value_particulier(200_000, 100_000, 0, 0, 10)
+    assert pv.plus_value == pytest.approx(77_500)
+    assert pv.impot == pytest.approx(77_500 * 0.70 * 0.19)
+    assert pv.prelevements_sociaux == pytest.approx(77_500 * (1 - 0.0825) * 0.172)
+    assert pv.surtaxe == pytest.approx(0.02 * 54_250 - (60_000 - 54_250) / 20)
+
+    # Avant six ans, pas de forfait travaux ni d'abattement ; les frais de cession réduisent la plus-value
+    pv = plus_value_particulier(200_000, 100_000, 0, 0, 3, frais_cession=5_000)
+    assert pv.plus_value == pytest.approx(87_500)
+    assert pv.assiette_impot == pytest.approx(87_500)
+
+    assert plus_value_particulier(200_000, 100_000, 0, 0, 30).imposition == pytest.approx(0.0, abs=1e-6)
+
+
+def test_particulier_par_annee_de_detention():
+    annees = np.arange(1, 31)
+    pv = plus_value_particulier(200_000, 100_000, 0, 0, annees)
+    assert pv.imposition.shape == annees.shape
+    assert np.all(np.diff(pv.assiette_impot[5:]) <= 0)
+
+
+def test_professionnelle():
+    # 40 000 € de plus-value dont 25 000 € d'amortissements (court terme)
+    pv = plus_value_professionnelle(140_000, 100_000, 25_000, 8, tmi=30, recettes=150_000)
+    long_terme = 15_000 * (1 - 0.30)
+    assert pv.impot == pytest.approx(25_000 * 0.30 + long_terme * 0.128)
+    assert pv.prelevements_sociaux == pytest.approx((25_000 + long_terme) * 0.172)
+    # Exonération totale sous 90 000 € de recettes, moitié à 108 000 €
+    assert plus_value_professionnelle(140_000, 100_000, 25_000, 8, 30, 50_000).imposition == 0
+    moitie = plus_value_professionnelle(140_000, 100_000, 25_000, 8, 30, 108_000)
+    assert moitie.imposition == pytest.approx(pv.imposition / 2)
+
+
+def test_societe():
+    pv = plus_value_societe(150_000, 100_000, resultat_net=30_000)
+    assert pv.impot == pytest.approx(12_500 * 0.15 + 37_500 * 0.25)
+    assert plus_value_societe(80_000, 100_000, resultat_net=30_000).impot == pytest.approx(-20_000 * 0.15)
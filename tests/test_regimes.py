@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from lexyo_core.regimes import HORIZON_MAX
+
+from conftest import construire
+
+
+@pytest.mark.parametrize("libelle, colonne_cashflow, colonnes_impots", [
+    ("Micro foncier", "Cashflow mensuel", ("IR (TMI)", "Prélèvements sociaux (17.2%)")),
+    ("Réel foncier", "Cashflow mensuel (€)", ("Impôt (IR)",)),
+])
+def test_cashflow_foncier_deduit_une_seule_fois_l_emprunt(libelle, colonne_cashflow, colonnes_impots):
+    simulation = construire(libelle)
+    resultats = simulation.resultat_fiscal_annuel()
+    annuites = simulation.echeancier_annuel().annuites_sur_horizon(simulation.horizon)
+    charges = (simulation.charges_copro + simulation.taxe_fonciere + simulation.frais_entretien +
+               simulation.frais_bancaires + simulation.gestion_locative)
+    if libelle == "Réel foncier":
+        charges += simulation.frais_compta
+    impots = sum(np.asarray(resultats[colonne]) for colonne in colonnes_impots)
+    revenus = simulation.loyer_mensuel_hc * (12 - simulation.vacance_locative_mois)
+
+    attendu = (revenus - charges + simulation.charges_copro * 0.8 - impots - annuites) / 12
+    np.testing.assert_allclose(resultats[colonne_cashflow], attendu, atol=0.01)
+
+
+def test_horizon_jusqu_a_quarante_ans(libelle):
+    simulation = construire(libelle, horizon=HORIZON_MAX)
+    assert len(simulation.resultat_fiscal_annuel()["Année"]) == 40
+    with pytest.raises(ValueError, match="horizon doit être compris entre 1 et 40"):
+        construire(libelle, horizon=HORIZON_MAX + 1)
+    with pytest.raises(ValueError, match="horizon"):
+        construire(libelle, horizon=0)
+
+
+def test_horizon_modifie_apres_construction():
+    simulation = construire("LMNP réel")
+    with pytest.raises(ValueError, match="horizon"):
+        simulation.horizon = 41
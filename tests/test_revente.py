@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from lexyo_core import finance
+from lexyo_core.regimes import flux_rendement
+from lexyo_core.revente import matrice_revente
+
+from conftest import construire
+
+
+def test_produit_net_et_prix_brut():
+    simulation = construire("LMNP réel")
+    matrice = matrice_revente(simulation, croissance_prix=[0.0, 2.0], frais_cession_pct=5.0)
+
+    assert matrice.tri.shape == (2, simulation.horizon)
+    np.testing.assert_allclose(matrice.prix_cession[1], simulation.prix_bien * 1.02 ** matrice.annees)
+    np.testing.assert_allclose(matrice.frais_cession, matrice.prix_cession * 0.05)
+    np.testing.assert_allclose(
+        matrice.produit_net,
+        matrice.prix_cession - matrice.frais_cession - matrice.capital_restant
+        - matrice.indemnites - matrice.impot_plus_value,
+    )
+    # L'impôt porte sur le prix diminué des frais de cession
+    np.testing.assert_allclose(
+        matrice.impot_plus_value[1],
+        simulation.plus_value(matrice.prix_cession[1] * 0.95, matrice.annees).imposition,
+    )
+
+
+def test_tri_d_une_sortie():
+    simulation = construire("Location nue")
+    matrice = matrice_revente(simulation, 1.0, taux_actualisation=0.05)
+    apport, cashflows, _ = flux_rendement(simulation)
+    annee = 6
+    flux = finance.flux_investissement(apport, cashflows[:annee], matrice.produit_net[annee - 1])
+    assert matrice.tri[annee - 1] == pytest.approx(finance.tri(flux), abs=1e-8)
+    assert matrice.van[annee - 1] == pytest.approx(finance.van(flux, 0.05))
+    assert matrice.tri_optimal == pytest.approx(np.nanmax(matrice.tri))
+    assert matrice.tri[matrice.annee_optimale - 1] == matrice.tri_optimal
+
+
+def test_regime_sans_prix_du_bien():
+    with pytest.raises(ValueError, match="Revente indisponible"):
+        matrice_revente(construire("LMNP Micro-Bic"))
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from lexyo_core.regimes import REGIMES, indicateurs_annuels, rendement_simulation
+from lexyo_core.sensibilite import CHAMPS_NON_VARIABLES, axes_possibles, grille_sensibilite
+
+from conftest import SAISIE, construire
+
+PRIX = [150000, 200000, 250000]
+TAUX = [2.5, 3.5, 4.5, 5.5]
+LOYERS = [700, 900, 1100]
+VACANCES = [0, 1, 2, 3]
+
+
+def _parametres(libelle):
+    simulation = construire(libelle)
+    return {nom: getattr(simulation, nom) for nom, champ in type(simulation).__dataclass_fields__.items()
+            if champ.init}
+
+
+def test_axes_possibles(libelle):
+    axes = axes_possibles(REGIMES[libelle])
+    assert {"taux_interet", "loyer_mensuel_hc", "vacance_locative_mois"} <= set(axes)
+    assert not set(CHAMPS_NON_VARIABLES) & set(axes)
+
+
+@pytest.mark.parametrize("indicateur", ["cashflow_mensuel", "impots", "tri"])
+def test_forme_et_cellule_centrale(libelle, indicateur):
+    classe = REGIMES[libelle]
+    if indicateur == "tri" and not hasattr(construire(libelle), "apport"):
+        with pytest.raises(ValueError, match="Rendement indisponible"):
+            grille_sensibilite(classe, _parametres(libelle), "loyer_mensuel_hc", LOYERS,
+                               "vacance_locative_mois", VACANCES, indicateur)
+        return
+    grille = grille_sensibilite(classe, _parametres(libelle), "loyer_mensuel_hc", LOYERS,
+                                "vacance_locative_mois", VACANCES, indicateur, annee=2)
+    assert grille.valeurs.shape == (len(VACANCES), len(LOYERS))
+    assert len(grille.en_lignes()) == len(VACANCES) * len(LOYERS)
+
+    # Saisie de référence (loyer 900, un mois de vacance) : simulation ordinaire
+    simulation = construire(libelle)
+    if indicateur == "tri":
+        attendu = rendement_simulation(simulation).tri * 100
+    else:
+        attendu = indicateurs_annuels(simulation)[indicateur][1]
+    assert grille.valeurs[1, 1] == pytest.approx(attendu, rel=1e-12)
+
+
+def test_cashflow_prix_et_taux(libelle):
+    classe = REGIMES[libelle]
+    if "prix_bien" not in axes_possibles(classe):
+        # Emprunt saisi directement : le prix ne change pas la simulation
+        with pytest.raises(ValueError, match="prix_bien ne peut pas servir d'axe"):
+            grille_sensibilite(classe, _parametres(libelle), "prix_bien", PRIX, "taux_interet", TAUX)
+        return
+    grille = grille_sensibilite(classe, _parametres(libelle), "prix_bien", PRIX, "taux_interet", TAUX)
+    assert grille.valeurs[1, 1] == pytest.approx(indicateurs_annuels(construire(libelle))["cashflow_mensuel"][0])
+    # Bien plus cher (plus emprunté) ou taux plus élevé : cashflow plus faible
+    assert (np.diff(grille.valeurs, axis=1) < 0).all()
+    assert (np.diff(grille.valeurs, axis=0) < 0).all()
+
+
+def test_cashflow_loyer_et_vacance(libelle):
+    grille = grille_sensibilite(REGIMES[libelle], _parametres(libelle), "loyer_mensuel_hc", LOYERS,
+                                "vacance_locative_mois", VACANCES)
+    assert grille.valeurs[1, 1] == pytest.approx(indicateurs_annuels(construire(libelle))["cashflow_mensuel"][0])
+    # Loyer plus élevé : cashflow plus fort ; vacance plus longue : plus faible
+    assert (np.diff(grille.valeurs, axis=1) > 0).all()
+    assert (np.diff(grille.valeurs, axis=0) < 0).all()
+
+
+def test_valeurs_entieres_arrondies():
+    grille = grille_sensibilite(REGIMES["LMNP réel"], _parametres("LMNP réel"), "loyer_mensuel_hc", LOYERS,
+                                "vacance_locative_mois", [0.4, 1.6])
+    assert grille.valeurs_y.tolist() == [0, 2]
+
+
+@pytest.mark.parametrize("axes, message", [
+    (("taux_interet", "taux_interet"), "distincts"),
+    (("horizon", "taux_interet"), "horizon ne peut pas servir d'axe"),
+])
+def test_axes_invalides(axes, message):
+    with pytest.raises(ValueError, match=message):
+        grille_sensibilite(REGIMES["LMNP réel"], _parametres("LMNP réel"), axes[0], [1, 2], axes[1], [1, 2])
+
+
+def test_saisie_de_reference():
+    # Les cellules centrales ci-dessus supposent ces valeurs de la saisie commune
+    assert (SAISIE["prix_bien"], SAISIE["taux_interet"]) == (PRIX[1], TAUX[1])
+    assert (SAISIE["loyer_mensuel_hc"], SAISIE["vacance_locative_mois"]) == (LOYERS[1], VACANCES[1])
@@ -0,0 +1,150 @@
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from lexyo_core.simulation import (
+    DEFAUTS_RENDEMENT, colonnes_simulation, simulate, simuler_colonnes, simuler_lot, valider_colonnes,
+)
+
+ENTREE = dict(
+    prix_bien=200000, montant_apport=20000, frais_notaire=16000, frais_agence=0, travaux=10000, mobilier=5000,
+    frais_dossier=0, caution=0, frais_tiers=0, charges_copro=1200, assurance_pno=200, assurance_gli=300,
+    taxe_fonciere=1000, frais_entretien=500, frais_gestion=800, frais_bancaire=100, comptabilite=600,
+    loyer_mensuel_hc=1500, loyer_mensuel_cc=1600, amortissement_bien_duree=30, amortissement_notaire_duree=5,
+    amortissement_mobilier_duree=7, amortissement_travaux_duree=None, taux_interet=0.035, taux_assurance=0.003,
+    revenu_annuel_global=40000, nombre_parts=1.0,
+)
+# Schéma en colonnes de SimulationInputs (regime, champs d'ENTREE, rendement)
+TYPES_COLONNES = {
+    "regime": "texte",
+    **{champ: "entier_optionnel" if champ.endswith("_duree") else "reel" for champ in ENTREE},
+    "horizon": "entier", "taux_actualisation": "reel", "valeur_revente": "reel_optionnel",
+}
+REGIMES = ["Micro BIC", "Micro foncier", "LMNP réel", "LMP réel", "SARL de famille",
+           "Location nue réel", "SCI à l'IR", "SCI à l'IS", "Holding à l'IS"]
+
+
+def entree(**changements):
+    return SimpleNamespace(**{"regime": "LMNP réel", **ENTREE, **changements})
+
+
+# Loyers 18 000 €, charges 4 700 €, intérêts et assurance 6 840 € : revenu net 6 460 €,
+# TMI 30 % + 17,2 % de prélèvements sur les revenus imposés
+@pytest.mark.parametrize("regime, impot", [
+    ("Micro BIC", 9000 * 0.472),
+    ("Micro foncier", 12600 * 0.472),
+    ("Location nue réel", 6460 * 0.472),
+    ("SCI à l'IR", 6460 * 0.472),
+    # Amortissements (9 248 €) supérieurs au revenu net : pas d'impôt
+    ("LMNP réel", 0.0),
+    ("SCI à l'IS", 0.0),
+])
+def test_valeurs_de_reference(regime, impot):
+    resultat = simulate(entree(regime=regime))
+    assert resultat["impot"] == pytest.approx(impot)
+    assert resultat["cashflow"] == pytest.approx(6460 - impot)
+
+
+def _entree_aleatoire(rnd):
+    return entree(
+        regime=rnd.choice(REGIMES),
+        prix_bien=rnd.uniform(50000, 600000), montant_apport=rnd.uniform(0, 50000),
+        loyer_mensuel_hc=rnd.uniform(300, 4000), taux_interet=rnd.uniform(0.0, 0.06),
+        revenu_annuel_global=rnd.uniform(0, 250000), nombre_parts=rnd.choice([1.0, 1.5, 2.0, 3.0]),
+        amortissement_bien_duree=rnd.choice([None, 20, 30]), horizon=rnd.randint(1, 30),
+        valeur_revente=rnd.choice([None, 250000.0]),
+    )
+
+
+def test_simulate_identique_a_sa_ligne_dans_un_lot():
+    rnd = random.Random(0)
+    entrees = [_entree_aleatoire(rnd) for _ in range(300)]
+    lot = simuler_lot(colonnes_simulation(entrees))
+    for i, e in enumerate(entrees):
+        seul = simulate(e)
+        for nom, valeur in seul.items():
+            attendu = lot[nom][i]
+            if valeur is None:
+                assert not np.isfinite(attendu)
+            else:
+                assert valeur == pytest.approx(attendu, rel=1e-12, abs=1e-9)
+
+
+@pytest.mark.parametrize("changements, message", [
+    ({"regime": "Inconnu"}, "Régime inconnu"),
+    ({"regime": "Micro BIC", "nombre_parts": 0}, "nombre_parts"),
+    ({"horizon": 0}, "horizon doit être compris entre 1 et 40"),
+    ({"horizon": 41}, "horizon doit être compris entre 1 et 40"),
+    ({"horizon": 10 ** 6}, "horizon doit être compris entre 1 et 40"),
+    ({"taux_actualisation": -1.0}, "taux_actualisation"),
+    ({"valeur_revente": -1.0}, "valeur_revente"),
+])
+def test_erreurs(changements, message):
+    with pytest.raises(ValueError, match=message):
+        simulate(entree(**changements))
+
+
+def test_horizon_maximal_accepte():
+    assert simulate(entree(horizon=40))["tri"] is not None
+
+
+def test_horizon_invalide_n_affecte_que_sa_ligne():
+    lot = simuler_lot(colonnes_simulation([entree(), entree(horizon=10 ** 6), entree(horizon=40)]))
+    assert lot["erreurs"] == [None, "horizon doit être compris entre 1 et 40", None]
+    assert np.isnan(lot["tri"][1]) and np.isfinite(lot["tri"][[0, 2]]).all()
+
+
+def _colonnes(entrees, champs=("regime", *ENTREE)):
+    return {champ: [getattr(e, champ, DEFAUTS_RENDEMENT.get(champ)) for e in entrees] for champ in champs}
+
+
+def test_colonnes_identiques_aux_lignes():
+    rnd = random.Random(1)
+    entrees = [_entree_aleatoire(rnd) for _ in range(50)]
+    resultats = simuler_colonnes(_colonnes(entrees, TYPES_COLONNES), TYPES_COLONNES, DEFAUTS_RENDEMENT)
+    lot = simuler_lot(colonnes_simulation(entrees))
+    assert resultats["erreurs"] == lot["erreurs"]
+    for nom in ("impot", "cashflow", "tri", "van"):
+        np.testing.assert_allclose(resultats[nom], lot[nom], rtol=1e-12)
+
+
+def test_colonnes_valeurs_par_defaut():
+    converties, erreurs = valider_colonnes(_colonnes([entree()] * 2), TYPES_COLONNES, DEFAUTS_RENDEMENT)
+    assert erreurs == [None, None]
+    assert converties["horizon"].tolist() == [10, 10]
+    assert np.isnan(converties["valeur_revente"]).all()
+
+
+@pytest.mark.parametrize("changement, message", [
+    (lambda colonnes: colonnes["prix_bien"].pop(), "Colonnes de longueurs différentes"),
+    (lambda colonnes: colonnes.pop("prix_bien"), "Colonnes manquantes : prix_bien"),
+    (lambda colonnes: colonnes.update(prix_bein=[1, 2, 3]), "Colonnes inconnues : prix_bein"),
+    # Colonne inconnue d'une autre longueur : signalée comme inconnue
+    (lambda colonnes: colonnes.update(prix_bein=[1]), "Colonnes inconnues : prix_bein"),
+])
+def test_colonnes_lot_invalide(changement, message):
+    colonnes = _colonnes([entree()] * 3)
+    changement(colonnes)
+    with pytest.raises(ValueError, match=message):
+        simuler_colonnes(colonnes, TYPES_COLONNES, DEFAUTS_RENDEMENT)
+
+
+def test_colonnes_erreurs_gardent_leur_indice():
+    colonnes = _colonnes([entree()] * 5)
+    colonnes["prix_bien"][1] = "abc"
+    colonnes["amortissement_bien_duree"][1] = 20.5
+    colonnes["regime"][3] = "Inconnu"
+    resultats = simuler_colonnes(colonnes, TYPES_COLONNES, DEFAUTS_RENDEMENT)
+    assert resultats["erreurs"] == [
+        None,
+        [{"loc": ["prix_bien"], "msg": "Nombre attendu"},
+         {"loc": ["amortissement_bien_duree"], "msg": "Entier ou null attendu"}],
+        None,
+        "Régime inconnu",
+        None,
+    ]
+    assert np.isnan(resultats["impot"][[1, 3]]).all()
+    assert np.isfinite(resultats["impot"][[0, 2, 4]]).all()
+    assert resultats["impot"][4] == pytest.approx(simulate(entree())["impot"])